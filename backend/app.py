@@ -19,6 +19,7 @@ from flask_cors import CORS
 from dotenv import load_dotenv
 from datetime import timedelta
 from werkzeug.security import generate_password_hash
+from werkzeug.local import LocalProxy
 
 # Ensure backend package is importable
 BACKEND_ROOT = os.path.dirname(os.path.abspath(__file__))
@@ -30,12 +31,19 @@ from extensions import db
 from models.user import User, UserRole
 from utils.helpers import make_response_data
 from utils.it_monitor import log_api_error
+from utils.event_writer import init_event_writer
+from utils.error_aggregator import init_api_error_aggregator
+from utils.alert_rules import init_alert_rules
+from utils.event_stream import init_stream_broker, STREAM_SCOPE
+from utils.user_cache import init_user_cache, load_user
+from utils.token_versions import init_token_versions, get_token_versions, VERSION_CLAIM
+from utils.token_revocation import init_revocation_list, get_revocation_list
 from resources import api_bp
 from resources.dashboard import dashboard_bp
 from resources.__init__ import CurrentStockResource
 from resources.purchases import purchases_bp
-from resources.ceo_dashboard import CEODashboardResource
-from resources.auth import LoginResource, RefreshResource, MeResource, ChangePasswordResource
+from resources.stream import is_stream_request
+from resources.auth import LoginResource, LogoutResource, RefreshResource, MeResource, ChangePasswordResource
 from flask_restful import Api
 
 # Load environment variables
@@ -73,6 +81,8 @@ def ensure_database_initialized(app):
                     app.logger.info(f"Seeded default admin user: {default_email}")
 
                 app.logger.info("Database initialization completed")
+                # Load revoked tokens now so requests never wait for the first read
+                get_revocation_list(app).refresh()
                 break
             except OperationalError as oe:
                 app.logger.warning(f"Database OperationalError on attempt {attempt}: {oe}")
@@ -117,6 +127,12 @@ def create_app(config_class=Config):
     # Initialize Extensions with app
     db.init_app(app)
     jwt.init_app(app)
+    init_api_error_aggregator(app, init_event_writer(app))
+    init_alert_rules(app)
+    init_stream_broker(app)
+    init_user_cache(app)
+    init_token_versions(app)
+    init_revocation_list(app)
 
     # JWT user lookup loader
     @jwt.user_lookup_loader
@@ -124,12 +140,15 @@ def create_app(config_class=Config):
         identity = jwt_data.get("sub")
         if not identity:
             return None
-        try:
-            user = User.query.get(identity)
-            return user
-        except Exception as e:
-            app.logger.error(f"Error in user_lookup_callback: {str(e)}")
-            return None
+        # None makes flask_jwt_extended reject the token, so deleted users, deactivated
+        # users and tokens older than a role change fail every @jwt_required() route
+        if VERSION_CLAIM in jwt_data:
+            # Checked against the in-memory token version map; the user itself is
+            # loaded on first use, so endpoints that only check role claims never query
+            if not get_token_versions().is_current(identity, jwt_data[VERSION_CLAIM]):
+                return None
+            return LocalProxy(lambda: load_user(identity))
+        return load_user(identity)
 
     migrate.init_app(app, db)
     
@@ -209,6 +228,16 @@ def create_app(config_class=Config):
             'status_code': 401
         }), 401
 
+    # Revoked tokens are checked in memory (utils/token_revocation.py)
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(jwt_header, jwt_payload):
+        return get_revocation_list().is_revoked(jwt_payload)
+
+    # Stream tokens travel in URLs, so they open /api/stream and nothing else
+    @jwt.token_verification_loader
+    def stream_tokens_only_open_streams(jwt_header, jwt_data):
+        return jwt_data.get('scope') != STREAM_SCOPE or is_stream_request()
+
     @jwt.revoked_token_loader
     def revoked_token_callback(jwt_header, jwt_data):
         return jsonify({
@@ -234,18 +263,21 @@ def create_app(config_class=Config):
     
     # Import and register resources
     from resources.other_expenses import OtherExpensesResource, OtherExpenseResource, OtherExpensesPDFResource
-    from resources.salaries import SalariesResource, SalaryResource, SalaryPaymentToggleStatusResource
+    from resources.salaries import SalariesResource, SalaryResource, SalaryPaymentToggleStatusResource, SalaryMonthlyPayrollResource
     from resources.expenses import CarExpensesResource
     from resources.user import UserListResource
     from resources.profile_image import ProfileImageUploadResource
     from resources.inventory import InventoryListResource, InventoryResource, ClearInventoryResource
     from resources.stock import StockMovementListResource
-    from resources.it_events import ITEventsResource, ITEventResource, ITAcknowledgeAlertsResource
+    from resources.it_events import (
+        ITEventsResource, ITEventResource, ITAcknowledgeAlertsResource, ITEventWriterMetricsResource,
+        ITEventArchiveResource
+    )
     from resources.it_alerts import ITAlertsResource, ITIncidentsResource
     from resources.sales import SaleListResource, SaleByEmailResource, SaleResource, SaleSummaryResource, DailySalesReportResource, ClearSalesResource, CustomerDebtResource, CustomerDebtReportResource
     from resources.purchases import DailyPurchasesReportResource, PurchaseByEmailResource
     from resources.ai_assistance import AIAssistanceResource
-    from resources.receipts import ReceiptResource
+    from resources.receipts import ReceiptResource, ReceiptSearchResource
     from resources.seller_fruits import SellerFruitListResource, SellerFruitResource
     from resources.seller_fruits_bulk import SellerFruitBulkResource
     from resources.stock_tracking import (
@@ -257,6 +289,7 @@ def create_app(config_class=Config):
 
     # Add all API resources with consistent /api prefix
     api.add_resource(LoginResource, '/api/auth/login')
+    api.add_resource(LogoutResource, '/api/auth/logout')
     api.add_resource(RefreshResource, '/api/auth/refresh')
     api.add_resource(MeResource, '/api/auth/me')
     api.add_resource(ChangePasswordResource, '/api/auth/change-password')
@@ -264,14 +297,16 @@ def create_app(config_class=Config):
     api.add_resource(OtherExpensesResource, '/api/other_expenses', '/api/expenses/other')
     api.add_resource(OtherExpenseResource, '/api/other_expenses/<int:expense_id>')
     api.add_resource(OtherExpensesPDFResource, '/api/other-expenses/pdf')
-    api.add_resource(CEODashboardResource, '/api/ceo/dashboard')
     api.add_resource(SalariesResource, '/api/salaries')
     api.add_resource(SalaryResource, '/api/salaries/<int:salary_id>')
+    api.add_resource(SalaryMonthlyPayrollResource, '/api/salaries/monthly')
     api.add_resource(SalaryPaymentToggleStatusResource, '/api/salary-payments/<int:payment_id>/toggle-status')
     api.add_resource(CarExpensesResource, '/api/car-expenses', '/api/car-expenses/<int:expense_id>')
     api.add_resource(UserListResource, '/api/users')
     api.add_resource(ProfileImageUploadResource, '/api/profile-image')
     api.add_resource(ITEventsResource, '/api/it/events')
+    api.add_resource(ITEventWriterMetricsResource, '/api/it/events/writer-metrics')
+    api.add_resource(ITEventArchiveResource, '/api/it/events/archive')
     api.add_resource(ITEventResource, '/api/it/events/<string:event_id>')
     api.add_resource(ITAcknowledgeAlertsResource, '/api/it/alerts/acknowledge')
     api.add_resource(ITAlertsResource, '/api/it/alerts')
@@ -288,6 +323,7 @@ def create_app(config_class=Config):
     api.add_resource(PurchaseByEmailResource, '/api/purchases/by-email')
     api.add_resource(AIAssistanceResource, '/api/ai-assistance')
     api.add_resource(ReceiptResource, '/api/receipts', '/api/receipts/<string:receipt_num>')
+    api.add_resource(ReceiptSearchResource, '/api/receipts/search')
     api.add_resource(SellerFruitListResource, '/api/seller-fruits')
     api.add_resource(SellerFruitResource, '/api/seller-fruits/<int:fruit_id>')
     api.add_resource(SellerFruitBulkResource, '/api/seller-fruits/bulk')
@@ -388,7 +424,7 @@ def create_app(config_class=Config):
                     'status_code': 401
                 }), 401
             
-            current_user = User.query.get(identity)
+            current_user = load_user(identity)
             if not current_user:
                 return jsonify({
                     'success': False,
@@ -549,7 +585,7 @@ def create_app(config_class=Config):
                     'status_code': 401
                 }), 401
             
-            current_user = User.query.get(identity)
+            current_user = load_user(identity)
             if not current_user:
                 return jsonify({
                     'success': False,
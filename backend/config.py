@@ -34,16 +34,19 @@ class Config:
     SQLALCHEMY_DATABASE_URI = _db_url
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        "pool_pre_ping": True,
-        "pool_recycle": 300,
-        "pool_size": 5,
-        "max_overflow": 10,
-        "connect_args": {
-            "connect_timeout": 10,
-            "options": "-c statement_timeout=30000"  # 30 second query timeout
-        }
-    }
+    SQLALCHEMY_ENGINE_OPTIONS = {"pool_pre_ping": True}
+    # Pool sizing and connect_args are psycopg2/QueuePool specific; SQLite (local dev, tests)
+    # rejects them, so only apply them when running against PostgreSQL.
+    if _db_url.startswith(("postgres://", "postgresql")):
+        SQLALCHEMY_ENGINE_OPTIONS.update({
+            "pool_recycle": 300,
+            "pool_size": 5,
+            "max_overflow": 10,
+            "connect_args": {
+                "connect_timeout": 10,
+                "options": "-c statement_timeout=30000"  # 30 second query timeout
+            }
+        })
     
     # Session settings for better timeout handling
     SQLALCHEMY_SESSION_OPTIONS = {
@@ -72,7 +75,49 @@ class Config:
             "http://localhost:5173",  # Vite default
         ]
 
-    # IT Alert Rules
+    # IT events are written in batches by a background thread (utils/event_writer.py).
+    # IT_EVENT_QUEUE_POLICY is 'drop' (discard when the queue is full) or 'block'
+    # (wait IT_EVENT_QUEUE_BLOCK_SECONDS for room, then discard).
+    IT_EVENT_QUEUE_SIZE = int(os.environ.get('IT_EVENT_QUEUE_SIZE', 10000))
+    IT_EVENT_BATCH_SIZE = int(os.environ.get('IT_EVENT_BATCH_SIZE', 500))
+    IT_EVENT_FLUSH_INTERVAL = float(os.environ.get('IT_EVENT_FLUSH_INTERVAL', 1.0))
+    IT_EVENT_QUEUE_POLICY = os.environ.get('IT_EVENT_QUEUE_POLICY', 'drop')
+    IT_EVENT_QUEUE_BLOCK_SECONDS = float(os.environ.get('IT_EVENT_QUEUE_BLOCK_SECONDS', 0.05))
+    # Identical API errors (route, status, user) within this many seconds are written
+    # as one event with an occurrence count (utils/error_aggregator.py).
+    IT_API_ERROR_WINDOW_SECONDS = int(os.environ.get('IT_API_ERROR_WINDOW_SECONDS', 60))
+
+    # /api/stream (utils/event_stream.py): keep-alive comment interval, client reconnect
+    # delay, and how often each worker picks up rows committed by other workers.
+    STREAM_HEARTBEAT_SECONDS = float(os.environ.get('STREAM_HEARTBEAT_SECONDS', 15))
+    STREAM_RETRY_MS = int(os.environ.get('STREAM_RETRY_MS', 5000))
+    STREAM_POLL_SECONDS = float(os.environ.get('STREAM_POLL_SECONDS', 2.0))
+    # Lifetime of the URL-borne tokens EventSource clients open the stream with
+    STREAM_TOKEN_SECONDS = int(os.environ.get('STREAM_TOKEN_SECONDS', 60))
+
+    # Shared user cache behind get_current_user (utils/user_cache.py)
+    USER_CACHE_TTL_SECONDS = float(os.environ.get('USER_CACHE_TTL_SECONDS', 30))
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 1024))
+    # PBKDF2 cost for new password hashes (utils/passwords.py); the same on every
+    # worker and never below 600,000. Logins upgrade weaker stored hashes.
+    # scripts/benchmark_login.py suggests a value for the production hardware.
+    PASSWORD_HASH_ITERATIONS = int(os.environ.get('PASSWORD_HASH_ITERATIONS', 600000))
+    # How stale a worker's view of token versions may get (utils/token_versions.py)
+    TOKEN_VERSION_REFRESH_SECONDS = float(os.environ.get('TOKEN_VERSION_REFRESH_SECONDS', 5))
+    # How often each worker re-reads revoked tokens (utils/token_revocation.py)
+    TOKEN_REVOCATION_REFRESH_SECONDS = float(os.environ.get('TOKEN_REVOCATION_REFRESH_SECONDS', 5))
+
+    # IT event retention (utils/it_event_partitions.py, scripts/archive_it_events.py).
+    # Months older than IT_EVENT_RETENTION_MONTHS are exported to gzip JSONL files in
+    # IT_EVENT_ARCHIVE_DIR and dropped; /api/it/events only looks back
+    # IT_EVENT_DEFAULT_LOOKBACK_DAYS unless a start date is given.
+    IT_EVENT_RETENTION_MONTHS = int(os.environ.get('IT_EVENT_RETENTION_MONTHS', 3))
+    IT_EVENT_ARCHIVE_DIR = os.environ.get('IT_EVENT_ARCHIVE_DIR') or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'instance', 'it_event_archive')
+    IT_EVENT_DEFAULT_LOOKBACK_DAYS = int(os.environ.get('IT_EVENT_DEFAULT_LOOKBACK_DAYS', 30))
+
+    # IT Alert Rules. Conditions are compiled at startup by utils/alert_rules.py
+    # (see its docstring for the grammar); a condition that does not parse stops the app.
     ALERT_RULES = {
         'failed_login_burst': {
             'condition': '>=5 failed_login from same IP within 15m',
@@ -0,0 +1,66 @@
+"""Add message inbox indexes and unread counters
+
+Revision ID: 203e791b3e6c
+Revises: 5617446344ec
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '203e791b3e6c'
+down_revision = '5617446344ec'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('message', schema=None) as batch_op:
+        batch_op.create_index('ix_message_recipient_id_created_at_id', ['recipient_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_message_recipient_role_created_at_id', ['recipient_role', 'created_at', 'id'], unique=False)
+
+    counter = op.create_table(
+        'message_counter',
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('unread', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('key')
+    )
+
+    # Count the existing unread messages (see utils/message_counters.py for the keys)
+    message = sa.table(
+        'message',
+        sa.column('id', sa.Integer),
+        sa.column('recipient_id', sa.Integer),
+        sa.column('recipient_role', sa.String),
+        sa.column('is_read', sa.Boolean)
+    )
+    rows = op.get_bind().execute(
+        sa.select(message.c.recipient_id, message.c.recipient_role, sa.func.count(message.c.id))
+        .where(message.c.is_read.isnot(True))
+        .group_by(message.c.recipient_id, message.c.recipient_role)
+    ).fetchall()
+    counts = {}
+    for recipient_id, recipient_role, count in rows:
+        # Enum columns store the member name; keys use the value
+        role = recipient_role.lower() if recipient_role else None
+        keys = []
+        if recipient_id is not None:
+            keys.append(f'user:{recipient_id}')
+        if role:
+            keys.append(f'role:{role}')
+        if recipient_id is not None and role:
+            keys.append(f'user:{recipient_id}:role:{role}')
+        for key in keys:
+            counts[key] = counts.get(key, 0) + count
+    if counts:
+        op.bulk_insert(counter, [{'key': key, 'unread': count} for key, count in counts.items()])
+
+
+def downgrade():
+    op.drop_table('message_counter')
+
+    with op.batch_alter_table('message', schema=None) as batch_op:
+        batch_op.drop_index('ix_message_recipient_role_created_at_id')
+        batch_op.drop_index('ix_message_recipient_id_created_at_id')
@@ -0,0 +1,42 @@
+"""Add revoked token table
+
+Revision ID: 5617446344ec
+Revises: c343911a8a7d
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5617446344ec'
+down_revision = 'c343911a8a7d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'revoked_token',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('jti', sa.String(length=64), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('token_version', sa.Integer(), nullable=True),
+        sa.Column('reason', sa.String(length=50), nullable=True),
+        sa.Column('revoked_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('jti')
+    )
+    with op.batch_alter_table('revoked_token', schema=None) as batch_op:
+        batch_op.create_index('ix_revoked_token_revoked_at', ['revoked_at'], unique=False)
+        batch_op.create_index('ix_revoked_token_expires_at', ['expires_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('revoked_token', schema=None) as batch_op:
+        batch_op.drop_index('ix_revoked_token_expires_at')
+        batch_op.drop_index('ix_revoked_token_revoked_at')
+
+    op.drop_table('revoked_token')
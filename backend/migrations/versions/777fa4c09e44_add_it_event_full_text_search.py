@@ -0,0 +1,65 @@
+"""Add full-text search over IT event summaries and logs
+
+Revision ID: 777fa4c09e44
+Revises: 7c5795635e2d
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '777fa4c09e44'
+down_revision = '7c5795635e2d'
+branch_labels = None
+depends_on = None
+
+FTS_TRIGGERS = ('it_event_fts_ai', 'it_event_fts_ad', 'it_event_fts_au')
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        # Generated on every partition; summary outranks server logs, which outrank stack traces
+        op.execute(
+            "ALTER TABLE it_event ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(summary, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(server_logs, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(stack_trace, '')), 'C')) STORED"
+        )
+        op.execute("CREATE INDEX ix_it_event_search_vector ON it_event USING GIN (search_vector)")
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE it_event_fts USING fts5("
+            "summary, server_logs, stack_trace, content='it_event', tokenize='porter unicode61')"
+        )
+        op.execute(
+            "CREATE TRIGGER it_event_fts_ai AFTER INSERT ON it_event BEGIN "
+            "INSERT INTO it_event_fts(rowid, summary, server_logs, stack_trace) "
+            "VALUES (new.rowid, new.summary, new.server_logs, new.stack_trace); END"
+        )
+        op.execute(
+            "CREATE TRIGGER it_event_fts_ad AFTER DELETE ON it_event BEGIN "
+            "INSERT INTO it_event_fts(it_event_fts, rowid, summary, server_logs, stack_trace) "
+            "VALUES ('delete', old.rowid, old.summary, old.server_logs, old.stack_trace); END"
+        )
+        op.execute(
+            "CREATE TRIGGER it_event_fts_au AFTER UPDATE ON it_event BEGIN "
+            "INSERT INTO it_event_fts(it_event_fts, rowid, summary, server_logs, stack_trace) "
+            "VALUES ('delete', old.rowid, old.summary, old.server_logs, old.stack_trace); "
+            "INSERT INTO it_event_fts(rowid, summary, server_logs, stack_trace) "
+            "VALUES (new.rowid, new.summary, new.server_logs, new.stack_trace); END"
+        )
+        op.execute("INSERT INTO it_event_fts(it_event_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_it_event_search_vector")
+        op.execute("ALTER TABLE it_event DROP COLUMN IF EXISTS search_vector")
+    elif dialect == 'sqlite':
+        for name in FTS_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute("DROP TABLE IF EXISTS it_event_fts")
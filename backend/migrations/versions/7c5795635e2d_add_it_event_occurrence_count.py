@@ -0,0 +1,30 @@
+"""Add occurrence count and first/last seen to IT events
+
+Revision ID: 7c5795635e2d
+Revises: 83d6fc8f2192
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c5795635e2d'
+down_revision = '83d6fc8f2192'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('it_event', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('occurrence_count', sa.Integer(), nullable=False, server_default='1'))
+        batch_op.add_column(sa.Column('first_seen_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('last_seen_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('it_event', schema=None) as batch_op:
+        batch_op.drop_column('last_seen_at')
+        batch_op.drop_column('first_seen_at')
+        batch_op.drop_column('occurrence_count')
@@ -0,0 +1,30 @@
+"""Add stock movement filter indexes
+
+Revision ID: 8196cc188428
+Revises: ad9074039c2a
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8196cc188428'
+down_revision = 'ad9074039c2a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('stock_movement', schema=None) as batch_op:
+        batch_op.create_index('ix_stock_movement_inventory_id_date', ['inventory_id', 'date'], unique=False)
+        batch_op.create_index('ix_stock_movement_movement_type_date', ['movement_type', 'date'], unique=False)
+        batch_op.create_index('ix_stock_movement_date', ['date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('stock_movement', schema=None) as batch_op:
+        batch_op.drop_index('ix_stock_movement_date')
+        batch_op.drop_index('ix_stock_movement_movement_type_date')
+        batch_op.drop_index('ix_stock_movement_inventory_id_date')
@@ -0,0 +1,43 @@
+"""Add IT event and alert console indexes
+
+Revision ID: 83d6fc8f2192
+Revises: cb62e0bc675a
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '83d6fc8f2192'
+down_revision = 'cb62e0bc675a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # On the partitioned PostgreSQL table each index is created on every partition
+    with op.batch_alter_table('it_event', schema=None) as batch_op:
+        batch_op.create_index('ix_it_event_timestamp_id', ['timestamp', 'id'], unique=False)
+        batch_op.create_index('ix_it_event_event_type_timestamp_id', ['event_type', 'timestamp', 'id'], unique=False)
+        batch_op.create_index('ix_it_event_severity_timestamp_id', ['severity', 'timestamp', 'id'], unique=False)
+        batch_op.create_index('ix_it_event_user_email_timestamp_id', ['user_email', 'timestamp', 'id'], unique=False)
+
+    with op.batch_alter_table('it_alert', schema=None) as batch_op:
+        batch_op.create_index('ix_it_alert_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_it_alert_acknowledged_created_at_id', ['acknowledged', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_it_alert_severity_created_at_id', ['severity', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('it_alert', schema=None) as batch_op:
+        batch_op.drop_index('ix_it_alert_severity_created_at_id')
+        batch_op.drop_index('ix_it_alert_acknowledged_created_at_id')
+        batch_op.drop_index('ix_it_alert_created_at_id')
+
+    with op.batch_alter_table('it_event', schema=None) as batch_op:
+        batch_op.drop_index('ix_it_event_user_email_timestamp_id')
+        batch_op.drop_index('ix_it_event_severity_timestamp_id')
+        batch_op.drop_index('ix_it_event_event_type_timestamp_id')
+        batch_op.drop_index('ix_it_event_timestamp_id')
@@ -0,0 +1,32 @@
+"""Add purchase filter indexes
+
+Revision ID: ad9074039c2a
+Revises: 9abc239df951
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ad9074039c2a'
+down_revision = '9abc239df951'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('purchase', schema=None) as batch_op:
+        batch_op.create_index('ix_purchase_purchase_date', ['purchase_date'], unique=False)
+        batch_op.create_index('ix_purchase_fruit_type_purchase_date', ['fruit_type', 'purchase_date'],
+                              unique=False, postgresql_include=['cost'])
+        batch_op.create_index('ix_purchase_purchaser_id_purchase_date', ['purchaser_id', 'purchase_date'],
+                              unique=False, postgresql_include=['cost'])
+
+
+def downgrade():
+    with op.batch_alter_table('purchase', schema=None) as batch_op:
+        batch_op.drop_index('ix_purchase_purchaser_id_purchase_date')
+        batch_op.drop_index('ix_purchase_fruit_type_purchase_date')
+        batch_op.drop_index('ix_purchase_purchase_date')
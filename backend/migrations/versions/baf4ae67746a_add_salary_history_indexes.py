@@ -0,0 +1,28 @@
+"""Add salary history indexes
+
+Revision ID: baf4ae67746a
+Revises: 203e791b3e6c
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'baf4ae67746a'
+down_revision = '203e791b3e6c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('salaries', schema=None) as batch_op:
+        batch_op.create_index('ix_salaries_date_id', ['date', 'id'], unique=False)
+        batch_op.create_index('ix_salaries_user_id_date_id', ['user_id', 'date', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('salaries', schema=None) as batch_op:
+        batch_op.drop_index('ix_salaries_user_id_date_id')
+        batch_op.drop_index('ix_salaries_date_id')
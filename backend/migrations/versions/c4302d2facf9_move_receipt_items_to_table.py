@@ -0,0 +1,158 @@
+"""Copy receipt items from the JSON column into receipt_items
+
+receipts.items is kept (no longer mapped) for one release so nothing is lost
+if a row could not be read; a later migration drops it.
+
+Revision ID: c4302d2facf9
+Revises: fa88e3a20f09
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+import json
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4302d2facf9'
+down_revision = 'fa88e3a20f09'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+FRUIT_LENGTH = 100
+DESCRIPTION_LENGTH = 255
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+receipts = sa.table(
+    'receipts',
+    sa.column('id', sa.Integer),
+    sa.column('items', sa.Text)
+)
+
+
+def _number(value):
+    try:
+        return float(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _text(value, length, problems):
+    if value is None:
+        return None
+    text = str(value).strip()
+    if len(text) > length:
+        problems.append(f"text over {length} characters shortened")
+    return text[:length] or None
+
+
+def _item_rows(receipt_id, raw, problems):
+    """receipt_items rows for one receipt's JSON; anything not copied exactly is noted in ``problems``."""
+    try:
+        items = json.loads(raw) if raw else []
+    except ValueError:
+        problems.append("items JSON could not be parsed")
+        return []
+    if not isinstance(items, list):
+        problems.append("items JSON is not a list")
+        return []
+    rows = []
+    for position, item in enumerate(items):
+        if not isinstance(item, dict):
+            problems.append(f"item {position} is not an object")
+            item = {}
+        rows.append({
+            'receipt_id': receipt_id,
+            'position': position,
+            'fruit': _text(item.get('fruit'), FRUIT_LENGTH, problems),
+            'description': _text(item.get('description'), DESCRIPTION_LENGTH, problems),
+            'quantity': _number(item.get('quantity')),
+            'unit_price': _number(item.get('unitPrice')),
+            'total': _number(item.get('total'))
+        })
+    return rows
+
+
+def upgrade():
+    receipt_items = op.create_table(
+        'receipt_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('receipt_id', sa.Integer(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('fruit', sa.String(length=100), nullable=True),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('quantity', sa.Float(), nullable=True),
+        sa.Column('unit_price', sa.Float(), nullable=True),
+        sa.Column('total', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['receipt_id'], ['receipts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('receipt_id', 'position', name='uq_receipt_items_receipt_id_position')
+    )
+    with op.batch_alter_table('receipt_items', schema=None) as batch_op:
+        batch_op.create_index('ix_receipt_items_fruit_receipt_id', ['fruit', 'receipt_id'], unique=False)
+
+    # Backfill in batches of receipts, keyed by id so memory stays bounded
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        batch = bind.execute(
+            sa.select(receipts.c.id, receipts.c['items'])
+            .where(receipts.c.id > last_id).order_by(receipts.c.id).limit(BATCH_SIZE)
+        ).fetchall()
+        if not batch:
+            break
+        rows = []
+        for receipt_id, raw in batch:
+            problems = []
+            rows.extend(_item_rows(receipt_id, raw, problems))
+            if problems:
+                # The original JSON stays in receipts.items
+                logger.warning("Receipt %s items not copied exactly: %s", receipt_id, '; '.join(problems))
+        if rows:
+            op.bulk_insert(receipt_items, rows)
+        last_id = batch[-1][0]
+
+    with op.batch_alter_table('receipts', schema=None) as batch_op:
+        batch_op.create_index('ix_receipts_date_id', ['date', 'id'], unique=False)
+        batch_op.create_index('ix_receipts_buyer_name_date', ['buyer_name', 'date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('receipts', schema=None) as batch_op:
+        batch_op.drop_index('ix_receipts_buyer_name_date')
+        batch_op.drop_index('ix_receipts_date_id')
+
+    bind = op.get_bind()
+    receipt_items = sa.table(
+        'receipt_items',
+        sa.column('receipt_id', sa.Integer),
+        sa.column('position', sa.Integer),
+        sa.column('fruit', sa.String),
+        sa.column('description', sa.String),
+        sa.column('quantity', sa.Float),
+        sa.column('unit_price', sa.Float),
+        sa.column('total', sa.Float)
+    )
+    items_by_receipt = {}
+    for row in bind.execute(sa.select(receipt_items).order_by(receipt_items.c.receipt_id, receipt_items.c.position)):
+        items_by_receipt.setdefault(row.receipt_id, []).append({
+            'fruit': row.fruit,
+            'description': row.description,
+            'quantity': row.quantity,
+            'unitPrice': row.unit_price,
+            'total': row.total
+        })
+    # Receipts saved since the upgrade have no JSON yet; older ones keep their original
+    for receipt_id, items in items_by_receipt.items():
+        bind.execute(receipts.update().where(
+            receipts.c.id == receipt_id, receipts.c['items'].is_(None)
+        ).values(items=json.dumps(items)))
+
+    with op.batch_alter_table('receipt_items', schema=None) as batch_op:
+        batch_op.drop_index('ix_receipt_items_fruit_receipt_id')
+
+    op.drop_table('receipt_items')
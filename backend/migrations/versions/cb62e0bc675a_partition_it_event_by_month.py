@@ -0,0 +1,69 @@
+"""Partition it_event by month on PostgreSQL
+
+Revision ID: cb62e0bc675a
+Revises: ef5d357921ea
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cb62e0bc675a'
+down_revision = 'ef5d357921ea'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 2
+
+
+def _add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade():
+    bind = op.get_bind()
+    # SQLite has no declarative partitioning; retention works on date ranges there
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.execute("ALTER TABLE it_event RENAME TO it_event_unpartitioned")
+    op.execute("ALTER TABLE it_event_unpartitioned RENAME CONSTRAINT it_event_pkey TO it_event_unpartitioned_pkey")
+    op.execute('CREATE TABLE it_event (LIKE it_event_unpartitioned INCLUDING DEFAULTS) PARTITION BY RANGE ("timestamp")')
+    # The partition key has to be part of the primary key
+    op.execute('ALTER TABLE it_event ADD CONSTRAINT it_event_pkey PRIMARY KEY (id, "timestamp")')
+    op.execute('ALTER TABLE it_event ADD CONSTRAINT it_event_user_id_fkey FOREIGN KEY (user_id) REFERENCES "user" (id)')
+    op.execute("CREATE TABLE it_event_default PARTITION OF it_event DEFAULT")
+
+    today = date.today()
+    oldest = bind.execute(sa.text('SELECT min("timestamp") FROM it_event_unpartitioned')).scalar()
+    month = date(oldest.year, oldest.month, 1) if oldest else date(today.year, today.month, 1)
+    last = _add_months(date(today.year, today.month, 1), MONTHS_AHEAD)
+    while month <= last:
+        following = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE it_event_y{month.year:04d}m{month.month:02d} PARTITION OF it_event "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        month = following
+
+    op.execute("INSERT INTO it_event SELECT * FROM it_event_unpartitioned")
+    op.execute("DROP TABLE it_event_unpartitioned")
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.execute("CREATE TABLE it_event_unpartitioned (LIKE it_event INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO it_event_unpartitioned SELECT * FROM it_event")
+    # Dropping the parent drops every partition with it
+    op.execute("DROP TABLE it_event")
+    op.execute("ALTER TABLE it_event_unpartitioned RENAME TO it_event")
+    op.execute("ALTER TABLE it_event ADD CONSTRAINT it_event_pkey PRIMARY KEY (id)")
+    op.execute('ALTER TABLE it_event ADD CONSTRAINT it_event_user_id_fkey FOREIGN KEY (user_id) REFERENCES "user" (id)')
@@ -0,0 +1,41 @@
+"""Add receipt search indexes
+
+Revision ID: e19436891008
+Revises: c4302d2facf9
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e19436891008'
+down_revision = 'c4302d2facf9'
+branch_labels = None
+depends_on = None
+
+TRIGRAM_INDEXES = {
+    'ix_receipts_buyer_name_trgm': 'buyer_name',
+    'ix_receipts_buyer_contact_trgm': 'buyer_contact',
+}
+
+
+def upgrade():
+    with op.batch_alter_table('receipts', schema=None) as batch_op:
+        batch_op.create_index('ix_receipts_payment_date_id', ['payment', 'date', 'id'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # Lets ILIKE '%...%' on buyer name/contact use an index instead of a scan
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name, column in TRIGRAM_INDEXES.items():
+            op.execute(f"CREATE INDEX {name} ON receipts USING GIN ({column} gin_trgm_ops)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        for name in TRIGRAM_INDEXES:
+            op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    with op.batch_alter_table('receipts', schema=None) as batch_op:
+        batch_op.drop_index('ix_receipts_payment_date_id')
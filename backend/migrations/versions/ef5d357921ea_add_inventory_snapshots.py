@@ -0,0 +1,83 @@
+"""Add inventory snapshots and backfill opening balance movements
+
+Revision ID: ef5d357921ea
+Revises: 8196cc188428
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from datetime import date, datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ef5d357921ea'
+down_revision = '8196cc188428'
+branch_labels = None
+depends_on = None
+
+OUTBOUND_TYPES = ('out', 'sale', 'spoilage')
+
+
+def upgrade():
+    op.create_table('inventory_snapshot',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('inventory_id', sa.Integer(), nullable=False),
+    sa.Column('as_of', sa.Date(), nullable=False),
+    sa.Column('balance', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['inventory_id'], ['inventory.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('inventory_id', 'as_of', name='uq_inventory_snapshot_inventory_id_as_of')
+    )
+
+    # Balances are now derived from movements: add an opening adjustment wherever the
+    # stored quantity differs from what the existing movement history adds up to.
+    inventory = sa.table('inventory',
+        sa.column('id', sa.Integer), sa.column('quantity', sa.Float), sa.column('unit', sa.String),
+        sa.column('added_by', sa.Integer), sa.column('created_at', sa.DateTime))
+    stock_movement = sa.table('stock_movement',
+        sa.column('inventory_id', sa.Integer), sa.column('movement_type', sa.String),
+        sa.column('quantity', sa.Float), sa.column('unit', sa.String),
+        sa.column('remaining_stock', sa.Float), sa.column('date', sa.Date),
+        sa.column('notes', sa.Text), sa.column('added_by', sa.Integer),
+        sa.column('created_at', sa.DateTime))
+
+    bind = op.get_bind()
+    signed = sa.case(
+        (stock_movement.c.movement_type.in_(OUTBOUND_TYPES), -stock_movement.c.quantity),
+        else_=stock_movement.c.quantity
+    )
+    totals = {
+        row[0]: (float(row[1] or 0), row[2])
+        for row in bind.execute(
+            sa.select(stock_movement.c.inventory_id, sa.func.sum(signed), sa.func.min(stock_movement.c.date))
+            .group_by(stock_movement.c.inventory_id)
+        )
+    }
+    openings = []
+    for item in bind.execute(sa.select(inventory)):
+        moved, first_date = totals.get(item.id, (0.0, None))
+        difference = float(item.quantity or 0) - moved
+        if difference == 0:
+            continue
+        created = item.created_at.date() if item.created_at else date.today()
+        openings.append({
+            'inventory_id': item.id,
+            'movement_type': 'adjust',
+            'quantity': difference,
+            'unit': item.unit,
+            'remaining_stock': float(item.quantity or 0),
+            'date': min(created, first_date) if first_date else created,
+            'notes': 'Opening balance',
+            'added_by': item.added_by,
+            'created_at': datetime.utcnow(),
+        })
+    if openings:
+        op.bulk_insert(stock_movement, openings)
+
+
+def downgrade():
+    op.execute("DELETE FROM stock_movement WHERE movement_type = 'adjust' AND notes = 'Opening balance'")
+    op.drop_table('inventory_snapshot')
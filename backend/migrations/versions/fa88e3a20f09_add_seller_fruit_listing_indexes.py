@@ -0,0 +1,28 @@
+"""Add seller fruit listing indexes
+
+Revision ID: fa88e3a20f09
+Revises: baf4ae67746a
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fa88e3a20f09'
+down_revision = 'baf4ae67746a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('seller_fruits', schema=None) as batch_op:
+        batch_op.create_index('ix_seller_fruits_created_by_date_id', ['created_by', 'date', 'id'], unique=False)
+        batch_op.create_index('ix_seller_fruits_date_id', ['date', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('seller_fruits', schema=None) as batch_op:
+        batch_op.drop_index('ix_seller_fruits_date_id')
+        batch_op.drop_index('ix_seller_fruits_created_by_date_id')
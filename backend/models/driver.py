@@ -4,7 +4,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from extensions import db
 from datetime import datetime
-from models.user import User
+from utils.user_cache import load_user
 
 class DriverExpense(db.Model):
     __tablename__ = 'driver_expenses'
@@ -40,13 +40,7 @@ drivers_bp = Blueprint('drivers', __name__, url_prefix='/api/drivers')
 @jwt_required()
 def get_driver_expenses(driver_email):
     current_user_id = get_jwt_identity()
-    # Convert string ID back to int for SQLAlchemy query.get()
-    if current_user_id is not None:
-        try:
-            current_user_id = int(current_user_id)
-        except (TypeError, ValueError):
-            pass
-    current_user = User.query.get(current_user_id)
+    current_user = load_user(current_user_id)
     if not current_user or (current_user.email != driver_email and current_user.role.value != 'ceo'):
         return jsonify({"msg": "Unauthorized"}), 403
 
@@ -0,0 +1,30 @@
+from datetime import datetime
+from extensions import db
+
+
+class InventorySnapshot(db.Model):
+    """Stock balance of one inventory item after all movements dated on or before ``as_of``."""
+    __table_args__ = (
+        db.UniqueConstraint('inventory_id', 'as_of', name='uq_inventory_snapshot_inventory_id_as_of'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    inventory_id = db.Column(db.Integer, db.ForeignKey('inventory.id'), nullable=False)
+    as_of = db.Column(db.Date, nullable=False)
+    balance = db.Column(db.Float, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Relationships
+    inventory_item = db.relationship(
+        'Inventory',
+        backref=db.backref('snapshots', lazy=True, cascade="all, delete-orphan")
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'inventory_id': self.inventory_id,
+            'as_of': self.as_of.isoformat(),
+            'balance': self.balance,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
@@ -11,6 +11,13 @@ class AlertSeverity(Enum):
 
 
 class ITAlert(db.Model):
+    # Match the IT console filters; each ends in the (created_at, id) keyset order
+    __table_args__ = (
+        db.Index('ix_it_alert_created_at_id', 'created_at', 'id'),
+        db.Index('ix_it_alert_acknowledged_created_at_id', 'acknowledged', 'created_at', 'id'),
+        db.Index('ix_it_alert_severity_created_at_id', 'severity', 'created_at', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     event_ids = db.Column(db.JSON, nullable=False)  # List of event IDs related to this alert
     title = db.Column(db.String(255), nullable=False)
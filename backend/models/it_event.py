@@ -21,6 +21,14 @@ class Severity(Enum):
 
 
 class ITEvent(db.Model):
+    # Match the IT console filters; each ends in the (timestamp, id) keyset order
+    __table_args__ = (
+        db.Index('ix_it_event_timestamp_id', 'timestamp', 'id'),
+        db.Index('ix_it_event_event_type_timestamp_id', 'event_type', 'timestamp', 'id'),
+        db.Index('ix_it_event_severity_timestamp_id', 'severity', 'timestamp', 'id'),
+        db.Index('ix_it_event_user_email_timestamp_id', 'user_email', 'timestamp', 'id'),
+    )
+
     id = db.Column(db.String(50), primary_key=True)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     user_email = db.Column(db.String(120), nullable=True)
@@ -35,6 +43,10 @@ class ITEvent(db.Model):
     related_event_ids = db.Column(db.JSON, nullable=True)  # List of related event IDs
     server_logs = db.Column(db.Text, nullable=True)
     stack_trace = db.Column(db.Text, nullable=True)
+    # Set on folded API error events: how many identical errors the row stands for
+    occurrence_count = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    first_seen_at = db.Column(db.DateTime, nullable=True)
+    last_seen_at = db.Column(db.DateTime, nullable=True)
 
     # Relationships
     user = db.relationship('User', backref='it_events')
@@ -54,5 +66,8 @@ class ITEvent(db.Model):
             'payload': self.payload,
             'related_event_ids': self.related_event_ids,
             'server_logs': self.server_logs,
-            'stack_trace': self.stack_trace
+            'stack_trace': self.stack_trace,
+            'occurrence_count': self.occurrence_count or 1,
+            'first_seen_at': self.first_seen_at.isoformat() + 'Z' if self.first_seen_at else None,
+            'last_seen_at': self.last_seen_at.isoformat() + 'Z' if self.last_seen_at else None
         }
@@ -3,6 +3,12 @@ from extensions import db
 from models.user import UserRole
 
 class Message(db.Model):
+    # Inbox pages: messages to a user or to a role, newest first by (created_at, id)
+    __table_args__ = (
+        db.Index('ix_message_recipient_id_created_at_id', 'recipient_id', 'created_at', 'id'),
+        db.Index('ix_message_recipient_role_created_at_id', 'recipient_role', 'created_at', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     sender_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     recipient_role = db.Column(db.Enum(UserRole))
@@ -0,0 +1,11 @@
+from extensions import db
+
+
+class MessageCounter(db.Model):
+    """
+    Unread messages per recipient key, kept in step with ``message`` by
+    ``utils.message_counters``. Keys are ``user:<id>``, ``role:<role>`` and
+    ``user:<id>:role:<role>`` (messages addressed to both).
+    """
+    key = db.Column(db.String(64), primary_key=True)
+    unread = db.Column(db.Integer, nullable=False, default=0, server_default='0')
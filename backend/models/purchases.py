@@ -6,6 +6,16 @@ from models.user import User
 
 
 class Purchase(db.Model):
+    # Back the /api/purchases filters and default date ordering; cost is carried in the
+    # composite indexes on Postgres so filtered totals can be answered from the index.
+    __table_args__ = (
+        db.Index('ix_purchase_purchase_date', 'purchase_date'),
+        db.Index('ix_purchase_fruit_type_purchase_date', 'fruit_type', 'purchase_date',
+                 postgresql_include=['cost']),
+        db.Index('ix_purchase_purchaser_id_purchase_date', 'purchaser_id', 'purchase_date',
+                 postgresql_include=['cost']),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     purchaser_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     employee_name = db.Column(db.String(100), nullable=False)
@@ -18,21 +28,12 @@ class Purchase(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     amount_per_kg = db.Column(db.String(50), nullable=False, default='0')
 
-    def to_dict(self):
+    def to_dict(self, purchaser_email):
         """
         Convert purchase to dictionary for JSON serialization.
-        Uses lazy loading to get purchaser email.
+        ``purchaser_email`` comes from the caller (a join, or the user already
+        in hand) so serializing a page never lazy-loads one user per row.
         """
-        purchaser_email = None
-        try:
-            # Use db.session.get() which properly handles session
-            user = db.session.get(User, self.purchaser_id)
-            if user:
-                purchaser_email = user.email
-        except Exception:
-            # If there's any error, set email to None
-            purchaser_email = None
-        
         return {
             'id': self.id,
             'purchaser_id': self.purchaser_id,
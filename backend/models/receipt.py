@@ -1,8 +1,16 @@
 from datetime import datetime
 from extensions import db
+from models.receipt_item import ReceiptItem
 
 class Receipt(db.Model):
     __tablename__ = 'receipts'
+    # Lookups by buyer and by date range, newest first; buyer substring search uses
+    # trigram indexes created by migration on PostgreSQL only
+    __table_args__ = (
+        db.Index('ix_receipts_date_id', 'date', 'id'),
+        db.Index('ix_receipts_buyer_name_date', 'buyer_name', 'date'),
+        db.Index('ix_receipts_payment_date_id', 'payment', 'date', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     receipt_num = db.Column(db.String(50), unique=True, nullable=False)
     seller_name = db.Column(db.String(100))
@@ -12,14 +20,17 @@ class Receipt(db.Model):
     buyer_contact = db.Column(db.String(50))
     date = db.Column(db.Date, nullable=False)
     payment = db.Column(db.String(50))
-    items = db.Column(db.Text)  # JSON string
     subtotal = db.Column(db.Float)
     discount = db.Column(db.Float)
     final_total = db.Column(db.Float)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Line items live in receipt_items; loaded with one extra query per batch of receipts.
+    # The old receipts.items JSON column is left unmapped until a later migration drops it.
+    items = db.relationship('ReceiptItem', order_by='ReceiptItem.position', lazy='selectin',
+                            cascade='all, delete-orphan', passive_deletes=True)
+
     def to_dict(self):
-        import json
         return {
             'id': self.id,
             'receiptNum': self.receipt_num,
@@ -34,7 +45,7 @@ class Receipt(db.Model):
             },
             'date': self.date.isoformat() if self.date else None,
             'payment': self.payment,
-            'items': json.loads(self.items) if self.items else [],
+            'items': [item.to_dict() for item in self.items],
             'subtotal': self.subtotal,
             'discount': self.discount,
             'finalTotal': self.final_total,
@@ -0,0 +1,55 @@
+from extensions import db
+
+
+class ReceiptItem(db.Model):
+    """One line of a receipt; ``position`` keeps the order it was entered in."""
+    __tablename__ = 'receipt_items'
+    __table_args__ = (
+        db.UniqueConstraint('receipt_id', 'position', name='uq_receipt_items_receipt_id_position'),
+        # Item-level lookups: which receipts sold a fruit, and at what price
+        db.Index('ix_receipt_items_fruit_receipt_id', 'fruit', 'receipt_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    receipt_id = db.Column(db.Integer, db.ForeignKey('receipts.id', ondelete='CASCADE'), nullable=False)
+    position = db.Column(db.Integer, nullable=False)
+    fruit = db.Column(db.String(100))
+    description = db.Column(db.String(255))
+    quantity = db.Column(db.Float)
+    unit_price = db.Column(db.Float)
+    total = db.Column(db.Float)
+
+    @staticmethod
+    def _text(value, length):
+        if value is None:
+            return None
+        return str(value).strip()[:length] or None
+
+    @staticmethod
+    def _number(value):
+        try:
+            return float(value) if value not in (None, '') else None
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def from_payload(cls, position, item):
+        """Build a line from a receipt payload item (``fruit``, ``description``, ``quantity``, ``unitPrice``, ``total``)."""
+        item = item if isinstance(item, dict) else {}
+        return cls(
+            position=position,
+            fruit=cls._text(item.get('fruit'), 100),
+            description=cls._text(item.get('description'), 255),
+            quantity=cls._number(item.get('quantity')),
+            unit_price=cls._number(item.get('unitPrice')),
+            total=cls._number(item.get('total'))
+        )
+
+    def to_dict(self):
+        return {
+            'fruit': self.fruit,
+            'description': self.description,
+            'quantity': self.quantity,
+            'unitPrice': self.unit_price,
+            'total': self.total
+        }
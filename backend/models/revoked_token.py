@@ -0,0 +1,23 @@
+from datetime import datetime
+from extensions import db
+
+
+class RevokedToken(db.Model):
+    """
+    A revoked JWT (``jti`` set), or every token of ``user_id`` whose ``tv``
+    claim is below ``token_version`` (``jti`` empty). Rows are only needed
+    until ``expires_at``, when the revoked tokens would have expired anyway.
+    """
+    __table_args__ = (
+        # Workers poll for rows revoked since their last refresh
+        db.Index('ix_revoked_token_revoked_at', 'revoked_at'),
+        db.Index('ix_revoked_token_expires_at', 'expires_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(64), unique=True, nullable=True)
+    user_id = db.Column(db.Integer, nullable=True)
+    token_version = db.Column(db.Integer, nullable=True)
+    reason = db.Column(db.String(50), nullable=True)
+    revoked_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=True)  # NULL: tokens that never expire
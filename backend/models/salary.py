@@ -3,6 +3,11 @@ from datetime import datetime
 
 class Salary(db.Model):
     __tablename__ = 'salaries'
+    # Salary history pages newest first by (date, id), optionally for one user
+    __table_args__ = (
+        db.Index('ix_salaries_date_id', 'date', 'id'),
+        db.Index('ix_salaries_user_id_date_id', 'user_id', 'date', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     amount = db.Column(db.Float, nullable=False)
@@ -3,6 +3,11 @@ from extensions import db
 
 class SellerFruit(db.Model):
     __tablename__ = 'seller_fruits'
+    # Listings page newest first by (date, id): per seller, or across sellers for the CEO
+    __table_args__ = (
+        db.Index('ix_seller_fruits_created_by_date_id', 'created_by', 'date', 'id'),
+        db.Index('ix_seller_fruits_date_id', 'date', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     stock_name = db.Column(db.String(100), nullable=False)
     fruit_name = db.Column(db.String(50), nullable=False)
@@ -18,17 +23,26 @@ class SellerFruit(db.Model):
     creator = db.relationship('User', backref='seller_fruits', lazy=True)
     sales = db.relationship('Sale', back_populates='seller_fruit', lazy=True)
 
-    def to_dict(self):
+    @staticmethod
+    def serialize(values, creator_email=None):
+        """
+        The API form of a seller fruit from its column ``values`` (a mapping),
+        so rows that were bulk inserted serialize without being loaded.
+        """
         return {
-            'id': self.id,
-            'stock_name': self.stock_name,
-            'fruit_name': self.fruit_name,
-            'qty': self.qty,
-            'unit_price': self.unit_price,
-            'date': self.date.isoformat() if self.date else None,
-            'amount': self.amount,
-            'customer_name': self.customer_name,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'created_by': self.created_by,
-            'creator_email': self.creator.email if self.creator else None
+            'id': values['id'],
+            'stock_name': values['stock_name'],
+            'fruit_name': values['fruit_name'],
+            'qty': values['qty'],
+            'unit_price': values['unit_price'],
+            'date': values['date'].isoformat() if values['date'] else None,
+            'amount': values['amount'],
+            'customer_name': values['customer_name'],
+            'created_at': values['created_at'].isoformat() if values['created_at'] else None,
+            'created_by': values['created_by'],
+            'creator_email': creator_email
         }
+
+    def to_dict(self):
+        values = {column.key: getattr(self, column.key) for column in self.__table__.columns}
+        return self.serialize(values, self.creator.email if self.creator else None)
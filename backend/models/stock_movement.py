@@ -2,6 +2,13 @@ from datetime import datetime
 from extensions import db
 
 class StockMovement(db.Model):
+    # Back the /api/stock-movements filters and their (date, id) keyset ordering
+    __table_args__ = (
+        db.Index('ix_stock_movement_inventory_id_date', 'inventory_id', 'date'),
+        db.Index('ix_stock_movement_movement_type_date', 'movement_type', 'date'),
+        db.Index('ix_stock_movement_date', 'date'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     inventory_id = db.Column(db.Integer, db.ForeignKey('inventory.id'), nullable=False)
     movement_type = db.Column(db.String(10), nullable=False)  # 'in', 'out', 'sale', 'spoilage'
@@ -1,5 +1,5 @@
 from extensions import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from utils.passwords import hash_password, verify_password
 from enum import Enum
 from datetime import datetime
 
@@ -25,6 +25,8 @@ class User(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     is_first_login = db.Column(db.Boolean, default=True)  # Flag for first login password change
     profile_image = db.Column(db.String(256), nullable=True)  # Path or URL to profile image
+    # Embedded in tokens as 'tv'; bumped on role change or deactivation to invalidate them
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     # Relationships
     sales = db.relationship('Sale', back_populates='seller', lazy=True, cascade="all, delete-orphan")
@@ -34,13 +36,11 @@ class User(db.Model):
     received_messages = db.relationship('Message', foreign_keys='Message.recipient_id', backref='recipient', lazy=True)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
-        # handle missing password_hash gracefully
-        if not self.password_hash:
-            return False
-        return check_password_hash(self.password_hash, password)
+        # Missing hashes fail; the hash runs off the eventlet hub (utils/passwords.py)
+        return verify_password(self.password_hash, password)
 
     def to_dict(self):
         return {
@@ -3,45 +3,31 @@ from flask_restful import Api, Resource
 
 # Import all resource classes
 from .user import UserListResource, UserResource, UserSalaryResource, UserPaymentResource
-from .inventory import InventoryListResource, InventoryResource, ClearInventoryResource
+from .inventory import (
+    InventoryListResource, InventoryResource, ClearInventoryResource, InventoryBalanceResource,
+    CurrentStockResource
+)
 
 from .purchases import (
     purchases_bp,  # <-- Import blueprint with extra routes
     PurchaseListResource, PurchaseResource,
     ClearPurchasesResource, PurchaseSummaryResource, PurchaseByEmailResource
 )
-from .stock import StockMovementListResource, ClearStockMovementsResource
+from .stock import StockMovementListResource, ClearStockMovementsResource, StockImportResource
 from .expenses import CarExpensesResource
 from .other_expenses import OtherExpensesResource, OtherExpenseResource
 from .salaries import SalariesResource, SalaryResource, SalaryPaymentToggleStatusResource
 from .gradients import GradientListResource, ClearGradientsResource
-from .messages import MessageListResource, MessageResource, ClearMessagesResource
-from .dashboard import CEODashboardResource, SellerDashboardResource, PurchaserDashboardResource, StorekeeperDashboardResource
+from .messages import MessageListResource, MessageResource, ClearMessagesResource, UnreadMessageCountResource
+from .stream import StreamResource, StreamTokenResource
+from .ceo_dashboard import CEODashboardResource
+from .dashboard import SellerDashboardResource, PurchaserDashboardResource, StorekeeperDashboardResource
 from .clear_all import ClearAllDataResource
 from .profile_image import ProfileImageUploadResource
 from .seller_fruits import SellerFruitListResource, SellerFruitResource
 from .sales import SaleListResource, SaleResource, ClearSalesResource, SaleSummaryResource
 
 
-class CurrentStockResource(Resource):
-    """Resource to get current stock inventory."""
-    def get(self):
-        from models.inventory import Inventory
-        # Query all inventory items
-        items = Inventory.query.all()
-        data = []
-        for item in items:
-            data.append({
-                "fruitType": item.fruit_type,
-                "quantity": item.quantity,
-                "unit": item.unit or "kg"
-            })
-        return {
-            'success': True,
-            'data': data
-        }
-
-
 # =====================================================================
 # MAIN API BLUEPRINT
 # =====================================================================
@@ -67,10 +53,12 @@ api.add_resource(UserPaymentResource, '/users/<int:user_id>/payment')
 api.add_resource(InventoryListResource, '/inventory')
 api.add_resource(InventoryResource, '/inventory/<int:inv_id>')
 api.add_resource(ClearInventoryResource, '/inventory/clear')
+api.add_resource(InventoryBalanceResource, '/inventory/<int:inv_id>/balance')
 
 # ----------- STOCK MOVEMENTS -----------
 api.add_resource(StockMovementListResource, '/stock-movements')
 api.add_resource(ClearStockMovementsResource, '/stock-movements/clear')
+api.add_resource(StockImportResource, '/stock-import/<string:kind>')
 
 # ----------- EXPENSES -----------
 api.add_resource(OtherExpensesResource, '/other_expenses')
@@ -96,6 +84,11 @@ api.add_resource(ClearGradientsResource, '/gradients/clear')
 api.add_resource(MessageListResource, '/messages')
 api.add_resource(MessageResource, '/messages/<int:message_id>')
 api.add_resource(ClearMessagesResource, '/messages/clear')
+api.add_resource(UnreadMessageCountResource, '/messages/unread-count')
+
+# ----------- LIVE UPDATES (SSE) -----------
+api.add_resource(StreamResource, '/stream')
+api.add_resource(StreamTokenResource, '/stream/token')
 
 # ----------- DASHBOARDS -----------
 api.add_resource(CEODashboardResource, '/ceo/dashboard')
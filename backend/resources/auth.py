@@ -1,12 +1,15 @@
 from flask_restful import Resource, reqparse
 from flask_jwt_extended import (
     create_access_token, create_refresh_token,
-    jwt_required, get_jwt_identity
+    jwt_required, get_jwt_identity, get_jwt
 )
 from flask import current_app, request
 from models.user import User
 from utils.helpers import make_response_data, get_current_user
-from utils.it_monitor import log_login_success, log_login_failure
+from utils.it_monitor import log_login_success, log_login_failure, log_logout
+from utils.token_versions import token_claims, VERSION_CLAIM
+from utils.passwords import needs_rehash
+from utils.token_revocation import get_revocation_list, revoke_token
 
 from flask import make_response
 from datetime import timedelta
@@ -32,12 +35,16 @@ class LoginResource(Resource):
 
             user = User.query.filter_by(email=email).first()
             if user and user.check_password(password):
-                # Avoid AttributeError if role is None or not an Enum
-                role_val = getattr(user.role, 'value', None) if user.role is not None else None
+                # Upgrade hashes made with weaker parameters while the password is at hand
+                if needs_rehash(user.password_hash):
+                    user.set_password(password)
+                    db.session.commit()
+                # Role and token version claims let role_required skip the user lookup
+                claims = token_claims(user)
                 # Convert user.id to string for JWT 'sub' claim (required by PyJWT >= 2.9.0)
                 user_id_str = str(user.id)
-                access_token = create_access_token(identity=user_id_str, additional_claims={"role": role_val})
-                refresh_token = create_refresh_token(identity=user_id_str)
+                access_token = create_access_token(identity=user_id_str, additional_claims=claims)
+                refresh_token = create_refresh_token(identity=user_id_str, additional_claims=claims)
                 log_login_success(user)
                 return make_response_data(data={
                     'access_token': access_token,
@@ -53,6 +60,31 @@ class LoginResource(Resource):
             # Avoid leaking internals; return generic message
             return make_response_data(success=False, message="Internal server error", status_code=500)
 
+class LogoutResource(Resource):
+    @jwt_required()
+    def post(self):
+        """Revoke the access token and, when given, the refresh token issued with it."""
+        claims = get_jwt()
+        revoke_token(claims)
+
+        data = request.get_json(silent=True) or {}
+        refresh_token = data.get('refresh_token')
+        if refresh_token:
+            try:
+                from flask_jwt_extended import decode_token
+                decoded = decode_token(refresh_token, allow_expired=True)
+            except Exception:
+                decoded = None
+            # Only the caller's own refresh token can be revoked this way
+            if decoded and decoded.get('sub') == claims.get('sub'):
+                revoke_token(decoded)
+
+        user = get_current_user()
+        if user:
+            log_logout(user)
+        return make_response_data(message="Logged out successfully")
+
+
 class MeResource(Resource):
     @jwt_required()
     def get(self):
@@ -80,11 +112,22 @@ class RefreshResource(Resource):
             from flask_jwt_extended import decode_token
             decoded = decode_token(refresh_token, allow_expired=False)
             identity = decoded['sub']
-            access_token = create_access_token(identity=identity)
-            return make_response_data(data={'access_token': access_token}, message="Token refreshed successfully")
         except Exception as e:
             return make_response_data(success=False, message="Invalid refresh token", status_code=401)
 
+        # decode_token skips the blocklist; logged-out and reset tokens stop here
+        if get_revocation_list().is_revoked(decoded):
+            return make_response_data(success=False, message="Invalid refresh token", status_code=401)
+
+        # Re-issue with the user's current role; refresh tokens from before a role
+        # change or deactivation are no longer accepted
+        user = User.query.get(int(identity)) if str(identity).isdigit() else None
+        if not user or user.is_active is False or (
+                VERSION_CLAIM in decoded and decoded[VERSION_CLAIM] != (user.token_version or 0)):
+            return make_response_data(success=False, message="Invalid refresh token", status_code=401)
+        access_token = create_access_token(identity=identity, additional_claims=token_claims(user))
+        return make_response_data(data={'access_token': access_token}, message="Token refreshed successfully")
+
 
 class ChangePasswordResource(Resource):
     @jwt_required()
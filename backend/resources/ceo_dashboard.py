@@ -1,5 +1,4 @@
 from flask_restful import Resource
-from flask_jwt_extended import jwt_required
 from sqlalchemy import func
 from extensions import db
 from models.user import User, UserRole
@@ -10,10 +9,12 @@ from models.driver import DriverExpense
 from models.other_expense import OtherExpense
 from models.seller_fruit import SellerFruit
 from models.salary import Salary
+from resources.salaries import salary_history_query, monthly_payroll
 from utils.helpers import make_response_data
+from utils.decorators import role_required
 
 class CEODashboardResource(Resource):
-    @jwt_required()
+    @role_required('ceo')
     def get(self):
         # Aggregate stats for CEO overview
         total_users = User.query.count()
@@ -122,13 +123,19 @@ class CEODashboardResource(Resource):
 
         # Monthly summary (all fruits combined)
         month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+        # Payroll from the shared monthly rollup, combined across years like the other columns
+        payroll = monthly_payroll()
+        salaries_by_month = {}
+        for row in payroll:
+            month_number = int(row['month'][5:7])
+            salaries_by_month[month_number] = salaries_by_month.get(month_number, 0.0) + row['total']
         monthly_data = []
         for i, month in enumerate(range(1, 13)):
             sales = db.session.query(func.sum(Sale.amount)).filter(func.extract('month', Sale.date) == month).scalar()
             purchases = db.session.query(func.sum(Purchase.cost)).filter(func.extract('month', Purchase.purchase_date) == month).scalar()
             car_expenses = db.session.query(func.sum(DriverExpense.amount)).filter(func.extract('month', DriverExpense.date) == month).scalar()
             other_expenses = db.session.query(func.sum(OtherExpense.amount)).filter(func.extract('month', OtherExpense.date) == month).scalar()
-            salaries = db.session.query(func.sum(User.salary)).scalar()  # Assuming salaries are monthly
+            salaries = salaries_by_month.get(month)
             profit = (sales or 0) - ((purchases or 0) + (car_expenses or 0) + (other_expenses or 0) + (salaries or 0))
             monthly_data.append({
                 'month': month_names[i],
@@ -153,12 +160,10 @@ class CEODashboardResource(Resource):
         
         purchases_data = []
         for purchase, purchaser_email in purchases_query.all():
-            purchase_dict = purchase.to_dict()
-            purchase_dict['purchaserEmail'] = purchaser_email
-            purchases_data.append(purchase_dict)
+            purchases_data.append(purchase.to_dict(purchaser_email=purchaser_email))
 
-        # Fetch all salaries for CEO view
-        salaries = Salary.query.order_by(Salary.date.desc()).all()
+        # Latest salary payments for CEO view; the full history pages through /api/salaries
+        salaries = salary_history_query().order_by(Salary.date.desc(), Salary.id.desc()).limit(50).all()
         salaries_data = [salary.to_dict() for salary in salaries]
 
         stats = {
@@ -181,5 +186,6 @@ class CEODashboardResource(Resource):
             'companyPerformance': company_performance,
             'sellerFruits': seller_fruits_data,
             'purchases': purchases_data,
-            'salaries': salaries_data
+            'salaries': salaries_data,
+            'payroll': payroll
         }, message='CEO dashboard overview fetched.')
@@ -7,6 +7,7 @@ from models.sales import Sale
 from models.purchases import Purchase
 from utils.helpers import make_response_data, get_current_user
 from utils.decorators import role_required
+from utils.user_cache import load_user
 
 
 from flask_jwt_extended import jwt_required, get_jwt_identity
@@ -98,13 +99,7 @@ class DashboardResource(Resource):
     @jwt_required()
     def get(self):
         user_id = get_jwt_identity()
-        # Convert string ID back to int for SQLAlchemy query.get()
-        if user_id is not None:
-            try:
-                user_id = int(user_id)
-            except (TypeError, ValueError):
-                pass
-        user = User.query.get(user_id)
+        user = load_user(user_id)
         if not user:
             return make_response_data(False, "User not found.", 404)
         
@@ -137,23 +132,6 @@ class DashboardResource(Resource):
         return make_response_data(False, "Role not recognized.", 403)
 
 
-class CEODashboardResource(Resource):
-    @role_required('ceo')
-    def get(self):
-        total_users = User.query.count()
-        total_inventory_items = Inventory.query.count()
-        total_revenue = db.session.query(func.sum(Sale.amount)).scalar() or 0
-        total_cost = db.session.query(func.sum(Purchase.cost)).scalar() or 0
-
-        data = {
-            "total_users": total_users,
-            "total_inventory_items": total_inventory_items,
-            "total_revenue": f"{total_revenue:,.2f} KES",
-            "total_cost": f"{total_cost:,.2f} KES",
-            "net_profit": f"{(total_revenue - total_cost):,.2f} KES"
-        }
-        return make_response_data(data=data, message="CEO dashboard data fetched.")
-
 class SellerDashboardResource(Resource):
     @role_required('seller')
     def get(self):
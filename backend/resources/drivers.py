@@ -3,6 +3,7 @@ from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.driver import DriverExpense
 from models.user import db
+from utils.user_cache import load_user
 import logging
 
 drivers_bp = Blueprint('drivers', __name__, url_prefix='/api/drivers')
@@ -13,14 +14,7 @@ logger = logging.getLogger('drivers')
 def get_driver_expenses(driver_email):
     try:
         user_id = get_jwt_identity()
-        # Convert string ID back to int for SQLAlchemy query.get()
-        if user_id is not None:
-            try:
-                user_id = int(user_id)
-            except (TypeError, ValueError):
-                pass
-        from models.user import User
-        current_user = User.query.get(user_id)
+        current_user = load_user(user_id)
         if not current_user:
             return jsonify({"success": False, "msg": "Unauthorized"}), 403
         if current_user.email != driver_email and current_user.role.value != 'ceo':
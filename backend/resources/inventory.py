@@ -1,12 +1,38 @@
+import hashlib
+import json
 from flask_restful import Resource, reqparse
-from datetime import datetime
+from flask import request, make_response
+from datetime import datetime, date
 from extensions import db
 from models.inventory import Inventory
+from models.inventory_snapshot import InventorySnapshot
 from models.stock_movement import StockMovement
 from utils.helpers import make_response_data, get_current_user
 from utils.decorators import role_required
+from utils.stock_ledger import set_balance, balance_at, finite_number, StockLedgerError
+from utils.cache import VersionedCache, invalidate_on_commit
 from sqlalchemy import text
 
+# Current stock grouped by fruit/unit, rebuilt only after inventory or movement writes
+current_stock_cache = VersionedCache(ttl=30)
+invalidate_on_commit(current_stock_cache, Inventory, StockMovement)
+
+
+def build_current_stock():
+    """Group inventory quantities by fruit type and unit; returns ``(digest, data)``."""
+    unit = db.func.coalesce(Inventory.unit, 'kg')
+    rows = db.session.query(
+        Inventory.fruit_type, unit, db.func.sum(Inventory.quantity), db.func.count(Inventory.id)
+    ).group_by(Inventory.fruit_type, unit).order_by(Inventory.fruit_type, unit).all()
+    data = [
+        {"fruitType": fruit, "quantity": float(quantity or 0), "unit": unit_name, "items": count}
+        for fruit, unit_name, quantity, count in rows
+    ]
+    # Content hash, so every worker hands out the same ETag for the same stock
+    digest = hashlib.sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()
+    return digest, data
+
+
 parser = reqparse.RequestParser()
 parser.add_argument('name', type=str, required=True)
 parser.add_argument('quantity', type=str, required=True)
@@ -56,9 +82,14 @@ class InventoryListResource(Resource):
             except ValueError:
                 return make_response_data(success=False, message="Invalid date format for expiry_date. Use YYYY-MM-DD.", status_code=400)
 
+        try:
+            opening_quantity = finite_number(data['quantity'], "Quantity")
+        except StockLedgerError as e:
+            return make_response_data(success=False, message=str(e), status_code=400)
+
         new_item = Inventory(
             name=data['name'],
-            quantity=data['quantity'],
+            quantity=0.0,
             fruit_type=data['fruit_type'],
             unit=data['unit'],
             location=data['location'],
@@ -66,6 +97,9 @@ class InventoryListResource(Resource):
             added_by=current_user.id
         )
         db.session.add(new_item)
+        db.session.flush()
+        # The opening quantity is recorded as a movement so the balance stays derivable
+        set_balance(new_item.id, opening_quantity, current_user.id, notes='Opening balance')
         db.session.commit()
         return make_response_data(data=new_item.to_dict(), message="Inventory item added.", status_code=201)
 
@@ -74,9 +108,16 @@ class InventoryResource(Resource):
     def put(self, inv_id):
         item = Inventory.query.get_or_404(inv_id)
         data = parser.parse_args()
-        
+        current_user = get_current_user()
+
+        try:
+            new_quantity = finite_number(data['quantity'], "Quantity")
+        except StockLedgerError as e:
+            return make_response_data(success=False, message=str(e), status_code=400)
+
+        # Quantity edits become adjustment movements applied under the row lock
+        set_balance(item.id, new_quantity, current_user.id, notes='Stock-take adjustment')
         item.name = data['name']
-        item.quantity = data['quantity']
         item.fruit_type = data['fruit_type']
         item.unit = data.get('unit', item.unit)
         item.location = data.get('location', item.location)
@@ -97,11 +138,46 @@ class ClearInventoryResource(Resource):
     @role_required('ceo')
     def delete(self):
         try:
-            # Must delete movements first due to foreign key constraints
+            # Must delete snapshots and movements first due to foreign key constraints
+            InventorySnapshot.query.delete()
             StockMovement.query.delete()
             num_deleted = Inventory.query.delete()
             db.session.commit()
             return make_response_data(message=f"Successfully cleared {num_deleted} inventory items and their movements.")
         except Exception as e:
             db.session.rollback()
-            return make_response_data(success=False, message="Failed to clear inventory.", errors=[str(e)], status_code=500)
\ No newline at end of file
+            return make_response_data(success=False, message="Failed to clear inventory.", errors=[str(e)], status_code=500)
+
+class InventoryBalanceResource(Resource):
+    @role_required('ceo', 'storekeeper')
+    def get(self, inv_id):
+        """Balance as of ?at=YYYY-MM-DD (default today) from the nearest snapshot plus later movements."""
+        item = Inventory.query.get_or_404(inv_id)
+        at_param = request.args.get('at')
+        try:
+            at_date = datetime.strptime(at_param, '%Y-%m-%d').date() if at_param else date.today()
+        except ValueError:
+            return make_response_data(success=False, message="Invalid date format for at. Use YYYY-MM-DD.", status_code=400)
+
+        balance, snapshot = balance_at(item.id, at_date)
+        return make_response_data(data={
+            'inventory_id': item.id,
+            'at': at_date.isoformat(),
+            'balance': balance,
+            'unit': item.unit,
+            'snapshot_as_of': snapshot.as_of.isoformat() if snapshot else None
+        }, message="Inventory balance fetched.")
+
+
+class CurrentStockResource(Resource):
+    """Resource to get current stock inventory."""
+    def get(self):
+        digest, data = current_stock_cache.get_or_compute('current', build_current_stock)
+        if request.if_none_match.contains(digest):
+            response = make_response('', 304)
+            response.set_etag(digest)
+            return response
+        return {
+            'success': True,
+            'data': data
+        }, 200, {'ETag': f'"{digest}"', 'Cache-Control': 'no-cache'}
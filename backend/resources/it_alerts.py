@@ -1,8 +1,8 @@
 from flask_restful import Resource, reqparse
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.it_alert import ITAlert, AlertSeverity
-from models.user import User
-from utils.helpers import make_response_data
+from utils.user_cache import load_user
+from utils.helpers import make_response_data, count_rows, keyset_page, COUNT_MODES
 from extensions import db
 from datetime import datetime
 import logging
@@ -13,24 +13,21 @@ class ITAlertsResource(Resource):
     def get(self):
         # Check role
         current_user_id = get_jwt_identity()
-        # Convert string ID back to int for SQLAlchemy query.get()
-        if current_user_id is not None:
-            try:
-                current_user_id = int(current_user_id)
-            except (TypeError, ValueError):
-                pass
-        user = User.query.get(current_user_id)
+        user = load_user(current_user_id)
         logging.info(f"User: {user.email if user else 'None'}, Role: {user.role.value if user else 'None'}")
         if not user or user.role.value not in ['it', 'admin']:
             return make_response_data(success=False, message="Access denied", status_code=403)
 
         parser = reqparse.RequestParser()
-        parser.add_argument('start', type=str, help='Start date ISO string')
-        parser.add_argument('end', type=str, help='End date ISO string')
-        parser.add_argument('severity', type=str, action='append', help='Severity filter')
-        parser.add_argument('acknowledged', type=str, help='Acknowledged filter')
-        parser.add_argument('page', type=int, default=1, help='Page number')
-        parser.add_argument('per_page', type=int, default=50, help='Items per page')
+        parser.add_argument('start', type=str, help='Start date ISO string', location='args')
+        parser.add_argument('end', type=str, help='End date ISO string', location='args')
+        parser.add_argument('severity', type=str, action='append', help='Severity filter', location='args')
+        parser.add_argument('acknowledged', type=str, help='Acknowledged filter', location='args')
+        parser.add_argument('page', type=int, default=1, help='Page number', location='args')
+        parser.add_argument('per_page', type=int, default=50, help='Items per page', location='args')
+        parser.add_argument('cursor', type=str, help='next_cursor from the previous page', location='args')
+        parser.add_argument('total', type=str, default='exact', choices=COUNT_MODES,
+                            help='exact, approx or none', location='args')
 
         args = parser.parse_args()
 
@@ -59,19 +56,26 @@ class ITAlertsResource(Resource):
         if args['acknowledged'] is not None:
             query = query.filter(ITAlert.acknowledged == args['acknowledged'])
 
-        # Pagination
-        total = query.count()
-        alerts = query.order_by(ITAlert.created_at.desc()).paginate(
-            page=args['page'], per_page=args['per_page'], error_out=False
-        )
+        # One COUNT (or an estimate/none); keyset pages on (created_at, id) with ?cursor=
+        per_page = min(max(args['per_page'], 1), 200)
+        total, estimated = count_rows(query, args['total'])
+        try:
+            alerts, next_cursor = keyset_page(
+                query, (ITAlert.created_at, ITAlert.id), per_page,
+                cursor=args['cursor'], offset=(max(args['page'], 1) - 1) * per_page
+            )
+        except (TypeError, ValueError):
+            return make_response_data(success=False, message="Invalid cursor.", status_code=400)
 
         return make_response_data(data={
-            'alerts': [alert.to_dict() for alert in alerts.items],
+            'alerts': [alert.to_dict() for alert in alerts],
             'meta': {
                 'total': total,
-                'page': alerts.page,
-                'per_page': alerts.per_page,
-                'pages': alerts.pages
+                'total_is_estimate': estimated,
+                'page': args['page'],
+                'per_page': per_page,
+                'pages': -(-total // per_page) if total is not None else None,
+                'next_cursor': next_cursor
             }
         })
 
@@ -81,13 +85,7 @@ class ITIncidentsResource(Resource):
     def post(self):
         # Check role
         current_user_id = get_jwt_identity()
-        # Convert string ID back to int for SQLAlchemy query.get()
-        if current_user_id is not None:
-            try:
-                current_user_id = int(current_user_id)
-            except (TypeError, ValueError):
-                pass
-        user = User.query.get(current_user_id)
+        user = load_user(current_user_id)
         if not user or user.role.value not in ['it', 'admin']:
             return make_response_data(success=False, message="Access denied", status_code=403)
 
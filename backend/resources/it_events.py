@@ -1,9 +1,11 @@
 from flask_restful import Resource, reqparse
-from flask import request, make_response
+from flask import request, make_response, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.it_event import ITEvent, EventType, Severity
-from models.user import User
-from utils.helpers import make_response_data
+from utils.user_cache import load_user
+from utils.helpers import make_response_data, count_rows, keyset_page, COUNT_MODES
+from utils.it_event_partitions import parse_month, iter_archived_events
+from utils.it_event_search import search_events, highlight
 from extensions import db
 from datetime import datetime, timedelta
 import json
@@ -13,24 +15,22 @@ class ITEventsResource(Resource):
     def get(self):
         # Check if user has IT or Admin role
         current_user_id = get_jwt_identity()
-        # Convert string ID back to int for SQLAlchemy query.get()
-        if current_user_id is not None:
-            try:
-                current_user_id = int(current_user_id)
-            except (TypeError, ValueError):
-                pass
-        user = User.query.get(current_user_id)
+        user = load_user(current_user_id)
         if not user or user.role.value not in ['it', 'admin']:
             return make_response_data(success=False, message="Access denied", status_code=403)
 
         parser = reqparse.RequestParser()
-        parser.add_argument('start', type=str, help='Start date ISO string')
-        parser.add_argument('end', type=str, help='End date ISO string')
-        parser.add_argument('severity[]', type=str, action='append', help='Severity filter')
-        parser.add_argument('event_type[]', type=str, action='append', help='Event type filter')
-        parser.add_argument('user_email', type=str, help='User email filter')
-        parser.add_argument('page', type=int, default=1, help='Page number')
-        parser.add_argument('per_page', type=int, default=50, help='Items per page')
+        parser.add_argument('start', type=str, help='Start date ISO string', location='args')
+        parser.add_argument('end', type=str, help='End date ISO string', location='args')
+        parser.add_argument('severity[]', type=str, action='append', help='Severity filter', location='args')
+        parser.add_argument('event_type[]', type=str, action='append', help='Event type filter', location='args')
+        parser.add_argument('user_email', type=str, help='User email filter', location='args')
+        parser.add_argument('q', type=str, help='Full-text search in summary, server logs and stack trace', location='args')
+        parser.add_argument('page', type=int, default=1, help='Page number', location='args')
+        parser.add_argument('per_page', type=int, default=50, help='Items per page', location='args')
+        parser.add_argument('cursor', type=str, help='next_cursor from the previous page', location='args')
+        parser.add_argument('total', type=str, default='exact', choices=COUNT_MODES,
+                            help='exact, approx or none', location='args')
 
         args = parser.parse_args()
 
@@ -42,7 +42,10 @@ class ITEventsResource(Resource):
 
         if args['start']:
             start_date = datetime.fromisoformat(args['start'].replace('Z', '+00:00'))
-            query = query.filter(ITEvent.timestamp >= start_date)
+        else:
+            # Keep the default view on recent partitions; older months need an explicit start
+            start_date = datetime.utcnow() - timedelta(days=current_app.config['IT_EVENT_DEFAULT_LOOKBACK_DAYS'])
+        query = query.filter(ITEvent.timestamp >= start_date)
 
         if args['end']:
             end_date = datetime.fromisoformat(args['end'].replace('Z', '+00:00'))
@@ -59,19 +62,39 @@ class ITEventsResource(Resource):
         if args['user_email']:
             query = query.filter(ITEvent.user_email == args['user_email'])
 
-        # Pagination
-        total = query.count()
-        events = query.order_by(ITEvent.timestamp.desc()).paginate(
-            page=args['page'], per_page=args['per_page'], error_out=False
-        )
+        # One COUNT (or a planner estimate with total=approx, none with total=none);
+        # pages follow (timestamp, id) with ?cursor=, or fall back to ?page= offsets
+        per_page = min(max(args['per_page'], 1), 200)
+        offset = (max(args['page'], 1) - 1) * per_page
+        search = (args['q'] or '').strip()
+        if search:
+            # Ranked search results page by offset only; next_cursor stays None
+            query, ranked = search_events(query, search)
+            total, estimated = count_rows(query, args['total'])
+            results = [
+                dict(event.to_dict(), rank=round(float(rank or 0), 4), snippet=highlight(snippet))
+                for event, rank, snippet in ranked.offset(offset).limit(per_page).all()
+            ]
+            next_cursor = None
+        else:
+            total, estimated = count_rows(query, args['total'])
+            try:
+                events, next_cursor = keyset_page(
+                    query, (ITEvent.timestamp, ITEvent.id), per_page, cursor=args['cursor'], offset=offset
+                )
+            except (TypeError, ValueError):
+                return make_response_data(success=False, message="Invalid cursor.", status_code=400)
+            results = [event.to_dict() for event in events]
 
         return make_response_data(data={
-            'events': [event.to_dict() for event in events.items],
+            'events': results,
             'meta': {
                 'total': total,
-                'page': events.page,
-                'per_page': events.per_page,
-                'pages': events.pages
+                'total_is_estimate': estimated,
+                'page': args['page'],
+                'per_page': per_page,
+                'pages': -(-total // per_page) if total is not None else None,
+                'next_cursor': next_cursor
             }
         })
 
@@ -81,13 +104,7 @@ class ITEventResource(Resource):
     def get(self, event_id):
         # Check role
         current_user_id = get_jwt_identity()
-        # Convert string ID back to int for SQLAlchemy query.get()
-        if current_user_id is not None:
-            try:
-                current_user_id = int(current_user_id)
-            except (TypeError, ValueError):
-                pass
-        user = User.query.get(current_user_id)
+        user = load_user(current_user_id)
         if not user or user.role.value not in ['it', 'admin']:
             return make_response_data(success=False, message="Access denied", status_code=403)
 
@@ -103,13 +120,7 @@ class ITAcknowledgeAlertsResource(Resource):
     def post(self):
         # Check role
         current_user_id = get_jwt_identity()
-        # Convert string ID back to int for SQLAlchemy query.get()
-        if current_user_id is not None:
-            try:
-                current_user_id = int(current_user_id)
-            except (TypeError, ValueError):
-                pass
-        user = User.query.get(current_user_id)
+        user = load_user(current_user_id)
         if not user or user.role.value not in ['it', 'admin']:
             return make_response_data(success=False, message="Access denied", status_code=403)
 
@@ -122,3 +133,63 @@ class ITAcknowledgeAlertsResource(Resource):
         # In a real system, you'd have an acknowledgment table
 
         return make_response_data(message="Alerts acknowledged successfully")
+
+
+class ITEventWriterMetricsResource(Resource):
+    @jwt_required()
+    def get(self):
+        """Queue depth, drop and flush counters of the background IT event writer."""
+        current_user_id = get_jwt_identity()
+        user = load_user(current_user_id)
+        if not user or user.role.value not in ['it', 'admin']:
+            return make_response_data(success=False, message="Access denied", status_code=403)
+
+        writer = current_app.extensions.get('it_event_writer')
+        return make_response_data(data=writer.metrics() if writer else {})
+
+
+class ITEventArchiveResource(Resource):
+    @jwt_required()
+    def get(self):
+        """
+        Query archived (retention-expired) events between ``start_month`` and
+        ``end_month`` (YYYY-MM, inclusive), with the same filters as /it/events.
+        """
+        current_user_id = get_jwt_identity()
+        user = load_user(current_user_id)
+        if not user or user.role.value not in ['it', 'admin']:
+            return make_response_data(success=False, message="Access denied", status_code=403)
+
+        parser = reqparse.RequestParser()
+        parser.add_argument('start_month', type=str, required=True, help='First month, YYYY-MM', location='args')
+        parser.add_argument('end_month', type=str, help='Last month, YYYY-MM', location='args')
+        parser.add_argument('severity[]', type=str, action='append', help='Severity filter', location='args')
+        parser.add_argument('event_type[]', type=str, action='append', help='Event type filter', location='args')
+        parser.add_argument('user_email', type=str, help='User email filter', location='args')
+        parser.add_argument('limit', type=int, default=100, help='Maximum events returned', location='args')
+        args = parser.parse_args()
+
+        try:
+            start_month = parse_month(args['start_month'])
+            end_month = parse_month(args['end_month']) if args['end_month'] else start_month
+        except ValueError as e:
+            return make_response_data(success=False, message=str(e), status_code=400)
+        limit = min(max(args['limit'], 1), 1000)
+
+        events = []
+        truncated = False
+        for event in iter_archived_events(
+            current_app.config['IT_EVENT_ARCHIVE_DIR'], start_month, end_month,
+            event_types=set(args['event_type[]'] or []),
+            severities=set(args['severity[]'] or []),
+            user_email=args['user_email']
+        ):
+            if len(events) == limit:
+                truncated = True
+                break
+            events.append(event)
+
+        return make_response_data(data={
+            'events': events,
+            'meta': {'limit': limit, 'truncated': truncated}
+        })
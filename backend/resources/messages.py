@@ -1,10 +1,12 @@
 from flask_restful import Resource, reqparse
 from sqlalchemy import or_
+from sqlalchemy.orm import selectinload
 from extensions import db
 from models.message import Message
 from models.user import UserRole
-from utils.helpers import make_response_data, get_current_user
+from utils.helpers import make_response_data, get_current_user, keyset_page
 from utils.decorators import role_required
+from utils.message_counters import unread_count
 
 parser = reqparse.RequestParser()
 parser.add_argument('message', type=str, required=True)
@@ -14,14 +16,35 @@ parser.add_argument('recipient_id', type=int)
 class MessageListResource(Resource):
     @role_required('ceo', 'storekeeper', 'seller', 'purchaser', 'driver')
     def get(self):
+        list_parser = reqparse.RequestParser()
+        list_parser.add_argument('per_page', type=int, default=50, location='args')
+        list_parser.add_argument('cursor', type=str, help='next_cursor from the previous page', location='args')
+        args = list_parser.parse_args()
+
         current_user = get_current_user()
-        messages = Message.query.filter(
+        # Senders and recipients load in one query each instead of two per message
+        query = Message.query.options(
+            selectinload(Message.sender), selectinload(Message.recipient)
+        ).filter(
             or_(
                 Message.recipient_id == current_user.id,
                 Message.recipient_role == current_user.role
             )
-        ).order_by(Message.created_at.desc()).all()
-        return make_response_data(data=[m.to_dict() for m in messages], message="Messages fetched.")
+        )
+        per_page = min(max(args['per_page'], 1), 200)
+        try:
+            messages, next_cursor = keyset_page(
+                query, (Message.created_at, Message.id), per_page, cursor=args['cursor']
+            )
+        except (TypeError, ValueError):
+            return make_response_data(success=False, message="Invalid cursor.", status_code=400)
+        return make_response_data(data={
+            'messages': [m.to_dict() for m in messages],
+            'meta': {
+                'per_page': per_page,
+                'next_cursor': next_cursor
+            }
+        }, message="Messages fetched.")
 
     @role_required('ceo', 'storekeeper', 'seller', 'purchaser', 'driver')
     def post(self):
@@ -41,6 +64,12 @@ class MessageListResource(Resource):
         db.session.commit()
         return make_response_data(data=new_message.to_dict(), message="Message sent.", status_code=201)
 
+class UnreadMessageCountResource(Resource):
+    @role_required('ceo', 'storekeeper', 'seller', 'purchaser', 'driver')
+    def get(self):
+        # Read from maintained counters (utils/message_counters.py), not by counting messages
+        return make_response_data(data={'unread': unread_count(get_current_user())}, message="Unread count fetched.")
+
 class MessageResource(Resource):
     @role_required('ceo', 'storekeeper', 'seller', 'purchaser', 'driver')
     def put(self, message_id): # Mark as read
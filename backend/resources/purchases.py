@@ -5,14 +5,16 @@ from datetime import datetime
 from extensions import db
 from models.purchases import Purchase
 from models.user import UserRole, User
-from utils.helpers import make_response_data, get_current_user
+from utils.helpers import make_response_data, get_current_user, month_bucket, numeric_text
+from utils.cache import VersionedCache, invalidate_on_commit
+from utils.user_cache import load_user
 from utils.decorators import role_required
 from flask import send_file
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet
-from sqlalchemy import text
+from sqlalchemy import text, cast
 import io
 import logging
 
@@ -31,6 +33,176 @@ parser.add_argument('date', type=str, required=True)
 parser.add_argument('amountPerKg', type=float, required=True)
 
 
+def purchase_rows_query():
+    """
+    Select purchase columns (numeric fields as text) together with the purchaser
+    email via one outer join, so listing a page never looks users up per row.
+    """
+    return db.session.query(
+        Purchase.id,
+        Purchase.purchaser_id,
+        Purchase.employee_name,
+        Purchase.fruit_type,
+        cast(Purchase.quantity, db.Text).label('quantity'),
+        Purchase.unit,
+        Purchase.buyer_name,
+        cast(Purchase.cost, db.Text).label('cost'),
+        Purchase.purchase_date,
+        Purchase.created_at,
+        cast(Purchase.amount_per_kg, db.Text).label('amount_per_kg'),
+        User.email.label('purchaser_email')
+    ).outerjoin(User, Purchase.purchaser_id == User.id)
+
+
+def purchase_row_to_dict(row):
+    """Serialize a row from ``purchase_rows_query`` the same way as ``Purchase.to_dict``."""
+    return {
+        'id': row.id,
+        'purchaser_id': row.purchaser_id,
+        'purchaserEmail': row.purchaser_email,
+        'employeeName': row.employee_name,
+        'fruitType': row.fruit_type,
+        'quantity': row.quantity,
+        'unit': row.unit,
+        'buyerName': row.buyer_name,
+        'amount': row.cost,
+        'amountPerKg': row.amount_per_kg,
+        'date': row.purchase_date.isoformat() if row.purchase_date else None,
+        'created_at': row.created_at.isoformat() if row.created_at else None
+    }
+
+
+# Whitelisted ?sort_by= keys for the purchase listing
+PURCHASE_SORT_KEYS = {
+    'date': Purchase.purchase_date,
+    'created_at': Purchase.created_at,
+    'fruit_type': Purchase.fruit_type,
+    'buyer_name': Purchase.buyer_name,
+    'amount': numeric_text(Purchase.cost),
+}
+
+
+def parse_purchase_filters(args):
+    """
+    Validate the purchase listing query parameters.
+    Returns ``(filters, error_message)``; ``error_message`` is None when valid.
+    """
+    filters = {
+        'fruit_type': args.get('fruit_type') or None,
+        'purchaser': args.get('purchaser') or None,
+        'purchaser_id': None,
+        'buyer_name': args.get('buyer_name') or None,
+        'start_date': None,
+        'end_date': None,
+        'min_cost': None,
+        'max_cost': None,
+        'sort_by': args.get('sort_by', 'date'),
+        'order': (args.get('order') or 'desc').lower(),
+    }
+
+    if args.get('purchaser_id'):
+        try:
+            filters['purchaser_id'] = int(args['purchaser_id'])
+        except ValueError:
+            return None, "purchaser_id must be an integer."
+
+    for key in ('start_date', 'end_date'):
+        if args.get(key):
+            try:
+                filters[key] = datetime.strptime(args[key], '%Y-%m-%d').date()
+            except ValueError:
+                return None, f"Invalid date format for {key}. Use YYYY-MM-DD."
+
+    for key in ('min_cost', 'max_cost'):
+        if args.get(key):
+            try:
+                filters[key] = float(args[key])
+            except ValueError:
+                return None, f"{key} must be a number."
+
+    if filters['sort_by'] not in PURCHASE_SORT_KEYS:
+        return None, f"Invalid sort_by. Allowed: {', '.join(sorted(PURCHASE_SORT_KEYS))}."
+    if filters['order'] not in ('asc', 'desc'):
+        return None, "Invalid order. Use 'asc' or 'desc'."
+
+    return filters, None
+
+
+def apply_purchase_filters(query, filters):
+    """Apply parsed filters to a query that selects from purchase joined to user."""
+    if filters['fruit_type']:
+        query = query.filter(Purchase.fruit_type == filters['fruit_type'])
+    if filters['purchaser_id'] is not None:
+        query = query.filter(Purchase.purchaser_id == filters['purchaser_id'])
+    if filters['purchaser']:
+        query = query.filter(User.email == filters['purchaser'])
+    if filters['buyer_name']:
+        query = query.filter(Purchase.buyer_name.ilike(f"%{filters['buyer_name']}%"))
+    if filters['start_date']:
+        query = query.filter(Purchase.purchase_date >= filters['start_date'])
+    if filters['end_date']:
+        query = query.filter(Purchase.purchase_date <= filters['end_date'])
+    if filters['min_cost'] is not None:
+        query = query.filter(numeric_text(Purchase.cost) >= filters['min_cost'])
+    if filters['max_cost'] is not None:
+        query = query.filter(numeric_text(Purchase.cost) <= filters['max_cost'])
+    return query
+
+
+def order_purchase_query(query, filters):
+    """Order by the whitelisted sort key, with id as a stable tie-breaker."""
+    column = PURCHASE_SORT_KEYS[filters['sort_by']]
+    if filters['order'] == 'asc':
+        return query.order_by(column.asc(), Purchase.id.asc())
+    return query.order_by(column.desc(), Purchase.id.desc())
+
+
+PURCHASE_SUMMARY_BREAKDOWNS = {'month', 'purchaser'}
+
+# Summaries keyed by the requested breakdowns; dropped on any purchase write
+purchase_summary_cache = VersionedCache(ttl=60)
+invalidate_on_commit(purchase_summary_cache, Purchase)
+
+
+def build_purchase_summary(breakdowns=()):
+    """Aggregate purchase cost in SQL: one grouped query per requested breakdown."""
+    # cost is free text; values that are not numbers count as 0, as safe_float did
+    cost = db.func.coalesce(db.func.sum(numeric_text(Purchase.cost)), 0.0)
+
+    by_fruit = db.session.query(
+        Purchase.fruit_type, cost, db.func.count(Purchase.id)
+    ).group_by(Purchase.fruit_type).all()
+
+    summary = {
+        'total_cost': sum(float(total) for _, total, _ in by_fruit),
+        'purchase_count': sum(count for _, _, count in by_fruit),
+        'cost_by_fruit': [
+            {'fruit_type': fruit, 'total_cost': float(total), 'count': count}
+            for fruit, total, count in by_fruit
+        ]
+    }
+
+    if 'month' in breakdowns:
+        month = month_bucket(Purchase.purchase_date)
+        rows = db.session.query(month, cost, db.func.count(Purchase.id)).group_by(month).order_by(month).all()
+        summary['cost_by_month'] = [
+            {'month': m, 'total_cost': float(total), 'count': count} for m, total, count in rows
+        ]
+
+    if 'purchaser' in breakdowns:
+        rows = db.session.query(
+            Purchase.purchaser_id, User.email, cost, db.func.count(Purchase.id)
+        ).outerjoin(User, Purchase.purchaser_id == User.id).group_by(
+            Purchase.purchaser_id, User.email
+        ).all()
+        summary['cost_by_purchaser'] = [
+            {'purchaser_id': pid, 'purchaser_email': email, 'total_cost': float(total), 'count': count}
+            for pid, email, total, count in rows
+        ]
+
+    return summary
+
+
 # --- New Routes ---
 @purchases_bp.route("/ceo/messages", methods=["GET"])
 def get_ceo_messages():
@@ -53,68 +225,29 @@ class PurchaseListResource(Resource):
         page = request.args.get('page', default=1, type=int)
         per_page = request.args.get('per_page', default=20, type=int)
 
+        filters, error = parse_purchase_filters(request.args)
+        if error:
+            return make_response_data(success=False, message=error, status_code=400)
+
         try:
-            # Use raw SQL to fetch purchases as strings to avoid numeric type conversion issues
-            # Get total count first
-            count_result = db.session.execute(text("SELECT COUNT(*) FROM purchase")).fetchone()
-            total_count = count_result[0] if count_result else 0
+            count_query = db.session.query(db.func.count(Purchase.id)).select_from(Purchase).outerjoin(
+                User, Purchase.purchaser_id == User.id
+            )
+            total_count = apply_purchase_filters(count_query, filters).scalar() or 0
 
             # Calculate offset for pagination
             offset = (page - 1) * per_page
 
-            # Fetch paginated purchases
-            purchases_result = db.session.execute(text(f"SELECT id, purchaser_id, employee_name, fruit_type, quantity::text, unit, buyer_name, cost::text, purchase_date, created_at, amount_per_kg::text FROM purchase ORDER BY purchase_date DESC LIMIT {per_page} OFFSET {offset}")).fetchall()
-
-            # Convert to dict-like objects for compatibility
-            purchases = []
-            for row in purchases_result:
-                # Get purchaser email
-                purchaser_email = None
-                try:
-                    user = db.session.get(User, row[1])
-                    if user:
-                        purchaser_email = user.email
-                except Exception:
-                    purchaser_email = None
-
-                purchase_dict = {
-                    'id': row[0],
-                    'purchaser_id': row[1],
-                    'purchaserEmail': purchaser_email,
-                    'employeeName': row[2],
-                    'fruitType': row[3],
-                    'quantity': row[4],
-                    'unit': row[5],
-                    'buyerName': row[6],
-                    'amount': row[7],
-                    'amountPerKg': row[10],
-                    'date': row[8],
-                    'created_at': row[9]
-                }
-                purchase_obj = type('PurchaseObj', (), purchase_dict)()
-                # Use default argument to capture purchase_obj at definition time
-                purchase_obj.to_dict = lambda s=purchase_obj: {
-                    'id': s.id,
-                    'purchaser_id': s.purchaser_id,
-                    'purchaserEmail': s.purchaserEmail,
-                    'employeeName': s.employeeName,
-                    'fruitType': s.fruitType,
-                    'quantity': s.quantity,
-                    'unit': s.unit,
-                    'buyerName': s.buyerName,
-                    'amount': s.amount,
-                    'amountPerKg': s.amountPerKg,
-                    'date': s.date.isoformat() if s.date else None,
-                    'created_at': s.created_at.isoformat() if s.created_at else None
-                }
-                purchases.append(purchase_obj)
+            # Fetch the page with purchaser emails joined in (no per-row user lookups)
+            query = apply_purchase_filters(purchase_rows_query(), filters)
+            rows = order_purchase_query(query, filters).limit(per_page).offset(offset).all()
 
             # Calculate total pages
             total_pages = (total_count + per_page - 1) // per_page
 
             return make_response_data(
                 data={
-                    "items": [p.to_dict() for p in purchases],
+                    "items": [purchase_row_to_dict(row) for row in rows],
                     "meta": {
                         "page": page,
                         "per_page": per_page,
@@ -160,10 +293,12 @@ class PurchaseListResource(Resource):
                 purchase_date=purchase_date,
                 amount_per_kg=data['amountPerKg']
             )
+            # Read before the commit expires the user
+            purchaser_email = current_user.email
             db.session.add(new_purchase)
             db.session.commit()
             return make_response_data(
-                data=new_purchase.to_dict(),
+                data=new_purchase.to_dict(purchaser_email=purchaser_email),
                 message="Purchase recorded.",
                 status_code=201
             )
@@ -180,7 +315,9 @@ class PurchaseListResource(Resource):
 class PurchaseResource(Resource):
     @role_required('ceo')
     def put(self, purchase_id):
-        purchase = Purchase.query.get_or_404(purchase_id)
+        purchase, purchaser_email = db.session.query(Purchase, User.email).join(
+            User, User.id == Purchase.purchaser_id
+        ).filter(Purchase.id == purchase_id).first_or_404()
         data = parser.parse_args()
 
         purchase.supplier_name = data['supplier_name']
@@ -193,7 +330,7 @@ class PurchaseResource(Resource):
 
         db.session.commit()
         return make_response_data(
-            data=purchase.to_dict(),
+            data=purchase.to_dict(purchaser_email=purchaser_email),
             message="Purchase record updated."
         )
 
@@ -218,53 +355,36 @@ class ClearPurchasesResource(Resource):
 class PurchaseSummaryResource(Resource):
     @role_required('ceo')
     def get(self):
-        # Fetch all purchases using raw SQL to avoid PostgreSQL numeric type issues
+        """
+        Purchase totals by fruit, with optional ?breakdown=month,purchaser.
+        Served from a cache that is invalidated whenever purchases change.
+        """
+        breakdowns = tuple(sorted(
+            b.strip() for b in request.args.get('breakdown', '').split(',') if b.strip()
+        ))
+        unknown = set(breakdowns) - PURCHASE_SUMMARY_BREAKDOWNS
+        if unknown:
+            return make_response_data(
+                success=False,
+                message=f"Invalid breakdown. Allowed: {', '.join(sorted(PURCHASE_SUMMARY_BREAKDOWNS))}.",
+                status_code=400
+            )
+
         try:
-            purchases_result = db.session.execute(text("SELECT id, purchaser_id, employee_name, fruit_type, quantity::text, unit, buyer_name, cost::text, purchase_date, created_at, amount_per_kg::text FROM purchase")).fetchall()
-            # Convert to dict-like objects for compatibility
-            purchases = []
-            for row in purchases_result:
-                purchase_dict = {
-                    'id': row[0],
-                    'purchaser_id': row[1],
-                    'employee_name': row[2],
-                    'fruit_type': row[3],
-                    'quantity': row[4],
-                    'unit': row[5],
-                    'buyer_name': row[6],
-                    'cost': row[7],
-                    'purchase_date': row[8],
-                    'created_at': row[9],
-                    'amount_per_kg': row[10]
-                }
-                purchases.append(type('PurchaseObj', (), purchase_dict)())
+            summary = purchase_summary_cache.get_or_compute(
+                breakdowns, lambda: build_purchase_summary(breakdowns)
+            )
         except Exception as e:
-            logger.error(f"Error fetching purchases for summary: {str(e)}")
+            logging.getLogger('purchases').error(f"Error building purchase summary: {str(e)}")
             db.session.rollback()
-            purchases = []
-
-        from utils.helpers import safe_float
-        total_cost = sum(safe_float(p.cost) for p in purchases) if purchases else 0
-
-        # Group by fruit type
-        cost_by_fruit_dict = {}
-        for purchase in purchases:
-            fruit = purchase.fruit_type
-            if fruit not in cost_by_fruit_dict:
-                cost_by_fruit_dict[fruit] = 0
-            cost_by_fruit_dict[fruit] += safe_float(purchase.cost)
-
-        cost_by_fruit = [
-            {'fruit_type': fruit, 'total_cost': cost}
-            for fruit, cost in cost_by_fruit_dict.items()
-        ]
-
-        summary = {
-            'total_cost': total_cost,
-            'cost_by_fruit': cost_by_fruit
-        }
+            return make_response_data(
+                success=False,
+                message="Failed to fetch purchase summary. Please try again later.",
+                status_code=500
+            )
         return make_response_data(data=summary, message="Purchase summary fetched.")
 
+
 class PurchaseByEmailResource(Resource):
     @jwt_required()
     def get(self):
@@ -286,7 +406,7 @@ class PurchaseByEmailResource(Resource):
                     status_code=401
                 )
 
-            current_user = User.query.get(current_user_id)
+            current_user = load_user(current_user_id)
             if not current_user:
                 return make_response_data(
                     success=False,
@@ -320,46 +440,10 @@ class PurchaseByEmailResource(Resource):
                     message="No user found with this email."
                 )
 
-            # Use raw SQL to fetch purchases as strings to avoid numeric type conversion issues
-            purchases_result = db.session.execute(text(f"SELECT id, purchaser_id, employee_name, fruit_type, quantity::text, unit, buyer_name, cost::text, purchase_date, created_at, amount_per_kg::text FROM purchase WHERE purchaser_id = {user.id}")).fetchall()
-
-            # Convert to dict-like objects for compatibility
-            purchases = []
-            for row in purchases_result:
-                purchase_dict = {
-                    'id': row[0],
-                    'purchaser_id': row[1],
-                    'purchaserEmail': email,
-                    'employeeName': row[2],
-                    'fruitType': row[3],
-                    'quantity': row[4],
-                    'unit': row[5],
-                    'buyerName': row[6],
-                    'amount': row[7],
-                    'amountPerKg': row[10],
-                    'date': row[8],
-                    'created_at': row[9]
-                }
-                purchase_obj = type('PurchaseObj', (), purchase_dict)()
-                # Use default argument to capture purchase_obj at definition time
-                purchase_obj.to_dict = lambda s=purchase_obj: {
-                    'id': s.id,
-                    'purchaser_id': s.purchaser_id,
-                    'purchaserEmail': s.purchaserEmail,
-                    'employeeName': s.employeeName,
-                    'fruitType': s.fruitType,
-                    'quantity': s.quantity,
-                    'unit': s.unit,
-                    'buyerName': s.buyerName,
-                    'amount': s.amount,
-                    'amountPerKg': s.amountPerKg,
-                    'date': s.date.isoformat() if s.date else None,
-                    'created_at': s.created_at.isoformat() if s.created_at else None
-                }
-                purchases.append(purchase_obj)
+            rows = purchase_rows_query().filter(Purchase.purchaser_id == user.id).all()
 
             return make_response_data(
-                data=[p.to_dict() for p in purchases],
+                data=[purchase_row_to_dict(row) for row in rows],
                 message="Purchases fetched successfully."
             )
         except Exception as e:
@@ -380,36 +464,7 @@ class DailyPurchasesReportResource(Resource):
         except ValueError:
             return make_response_data(success=False, message="Invalid date format. Use YYYY-MM-DD.", status_code=400)
 
-        # Use raw SQL to fetch purchases as strings to avoid numeric type conversion issues
-        purchases_result = db.session.execute(text(f"SELECT id, purchaser_id, employee_name, fruit_type, quantity::text, unit, buyer_name, cost::text, purchase_date, created_at, amount_per_kg::text FROM purchase WHERE purchase_date = '{report_date}'")).fetchall()
-
-        # Convert to dict-like objects for compatibility
-        purchases = []
-        for row in purchases_result:
-            # Get purchaser email
-            purchaser_email = None
-            try:
-                user = db.session.get(User, row[1])
-                if user:
-                    purchaser_email = user.email
-            except Exception:
-                purchaser_email = None
-
-            purchase_dict = {
-                'id': row[0],
-                'purchaser_id': row[1],
-                'purchaser': user if 'user' in locals() and user else None,  # For backward compatibility in PDF generation
-                'employee_name': row[2],
-                'fruit_type': row[3],
-                'quantity': row[4],
-                'unit': row[5],
-                'buyer_name': row[6],
-                'cost': row[7],
-                'purchase_date': row[8],
-                'created_at': row[9],
-                'amount_per_kg': row[10]
-            }
-            purchases.append(type('PurchaseObj', (), purchase_dict)())
+        purchases = purchase_rows_query().filter(Purchase.purchase_date == report_date).all()
 
         if not purchases:
             return make_response_data(success=False, message=f"No purchases found for {date_str}.", status_code=404)
@@ -437,7 +492,7 @@ class DailyPurchasesReportResource(Resource):
         # Table data
         data = [['Date', 'Purchaser', 'Employee', 'Fruit Type', 'Quantity', 'Buyer', 'Amount']]
         for purchase in purchases:
-            purchaser_email = purchase.purchaser.email if purchase.purchaser and hasattr(purchase.purchaser, 'email') else 'N/A'
+            purchaser_email = purchase.purchaser_email or 'N/A'
             data.append([
                 purchase.purchase_date.strftime('%Y-%m-%d'),
                 purchaser_email,
@@ -445,7 +500,7 @@ class DailyPurchasesReportResource(Resource):
                 purchase.fruit_type,
                 f"{purchase.quantity} {purchase.unit}",
                 purchase.buyer_name,
-                f'KES {purchase.cost:,.2f}'
+                f'KES {safe_float(purchase.cost):,.2f}'
             ])
 
         # Create table
@@ -1,10 +1,12 @@
-from flask_restful import Resource
+from flask_restful import Resource, reqparse
 from flask import request
 from flask_jwt_extended import jwt_required
+from sqlalchemy import func, or_
 from extensions import db
 from models.receipt import Receipt
-from utils.helpers import make_response_data
-import json
+from models.receipt_item import ReceiptItem
+from utils.helpers import make_response_data, keyset_page, count_rows, contains_pattern, COUNT_MODES
+from utils.decorators import role_required
 from datetime import datetime
 
 class ReceiptResource(Resource):
@@ -20,7 +22,7 @@ class ReceiptResource(Resource):
             buyer_contact=data['buyer']['contact'],
             date=datetime.fromisoformat(data['date']),
             payment=data['payment'],
-            items=json.dumps(data['items']),
+            items=[ReceiptItem.from_payload(position, item) for position, item in enumerate(data['items'] or [])],
             subtotal=float(data['subtotal']) if data['subtotal'] else 0.0,
             discount=float(data['discount']) if data['discount'] else 0.0,
             final_total=float(data['finalTotal']) if data['finalTotal'] else 0.0
@@ -32,5 +34,69 @@ class ReceiptResource(Resource):
     def get(self, receipt_num):
         receipt = Receipt.query.filter_by(receipt_num=receipt_num).first()
         if not receipt:
-            return make_response_data(False, 404, 'Receipt not found.')
+            return make_response_data(success=False, message='Receipt not found.', status_code=404)
         return make_response_data(data=receipt.to_dict())
+
+
+def receipt_totals_by_payment(query):
+    """Receipt count and final total per payment method for the rows ``query`` matches."""
+    rows = query.order_by(None).with_entities(
+        Receipt.payment,
+        func.count(Receipt.id),
+        func.coalesce(func.sum(Receipt.final_total), 0.0)
+    ).group_by(Receipt.payment).order_by(Receipt.payment).all()
+    return [
+        {'payment': payment, 'count': count, 'total': float(total)}
+        for payment, count, total in rows
+    ]
+
+
+class ReceiptSearchResource(Resource):
+    @role_required('ceo', 'seller')
+    def get(self):
+        """
+        Receipts newest first, filtered by buyer name/contact (``q``), date range and
+        payment method, with keyset pagination and totals per payment method.
+        """
+        parser = reqparse.RequestParser()
+        parser.add_argument('q', type=str, help='part of the buyer name or contact', location='args')
+        parser.add_argument('start_date', type=str, help='YYYY-MM-DD', location='args')
+        parser.add_argument('end_date', type=str, help='YYYY-MM-DD', location='args')
+        parser.add_argument('payment', type=str, location='args')
+        parser.add_argument('per_page', type=int, default=50, location='args')
+        parser.add_argument('cursor', type=str, help='next_cursor from the previous page', location='args')
+        parser.add_argument('total', type=str, default='exact', choices=COUNT_MODES, location='args')
+        args = parser.parse_args()
+
+        query = Receipt.query
+        if args['q'] and args['q'].strip():
+            # Substring match; served by the trigram indexes on PostgreSQL
+            pattern = contains_pattern(args['q'].strip())
+            query = query.filter(or_(Receipt.buyer_name.ilike(pattern, escape='\\'),
+                                     Receipt.buyer_contact.ilike(pattern, escape='\\')))
+        try:
+            if args['start_date']:
+                query = query.filter(Receipt.date >= datetime.strptime(args['start_date'], '%Y-%m-%d').date())
+            if args['end_date']:
+                query = query.filter(Receipt.date <= datetime.strptime(args['end_date'], '%Y-%m-%d').date())
+        except ValueError:
+            return make_response_data(success=False, message='Invalid date format. Use YYYY-MM-DD', status_code=400)
+        if args['payment']:
+            query = query.filter(Receipt.payment == args['payment'])
+
+        per_page = min(max(args['per_page'], 1), 200)
+        total, estimated = count_rows(query, args['total'])
+        try:
+            receipts, next_cursor = keyset_page(query, (Receipt.date, Receipt.id), per_page, cursor=args['cursor'])
+        except (TypeError, ValueError):
+            return make_response_data(success=False, message='Invalid cursor.', status_code=400)
+        return make_response_data(data={
+            'items': [receipt.to_dict() for receipt in receipts],
+            'totals_by_payment': receipt_totals_by_payment(query),
+            'meta': {
+                'total': total,
+                'total_is_estimate': estimated,
+                'per_page': per_page,
+                'next_cursor': next_cursor
+            }
+        })
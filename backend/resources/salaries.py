@@ -1,17 +1,62 @@
-from flask_restful import Resource
+from flask_restful import Resource, reqparse
 from flask_jwt_extended import jwt_required
+from sqlalchemy import case, func
+from sqlalchemy.orm import joinedload
 from extensions import db
 from models.user import User
 from models.salary import Salary
-from utils.helpers import make_response_data, get_current_user
+from utils.cache import VersionedCache, invalidate_on_commit
+from utils.helpers import make_response_data, get_current_user, keyset_page, count_rows, month_bucket, COUNT_MODES
 from datetime import datetime
 
+
+def salary_history_query():
+    """Salary rows with their user loaded in the same query (``to_dict`` reads name and email)."""
+    return Salary.query.options(joinedload(Salary.user))
+
+
+# Shared by /api/salaries/monthly and the CEO dashboard; dropped whenever salaries change
+payroll_rollup_cache = VersionedCache(ttl=60)
+invalidate_on_commit(payroll_rollup_cache, Salary)
+
+
+def monthly_payroll():
+    """
+    Payroll per month ('YYYY-MM', oldest first): total, paid and unpaid amounts,
+    number of payments and of people paid. One grouped query, cached.
+    """
+    def compute():
+        month = month_bucket(Salary.date)
+        rows = db.session.query(
+            month.label('month'),
+            func.coalesce(func.sum(Salary.amount), 0).label('total'),
+            func.coalesce(func.sum(case((Salary.is_paid.is_(True), Salary.amount), else_=0)), 0).label('paid'),
+            func.count(Salary.id).label('payments'),
+            func.count(func.distinct(Salary.user_id)).label('employees')
+        ).filter(Salary.date.isnot(None)).group_by(month).order_by(month).all()
+        return [{
+            'month': row.month,
+            'total': float(row.total),
+            'paid': float(row.paid),
+            'unpaid': float(row.total) - float(row.paid),
+            'payments': row.payments,
+            'employees': row.employees
+        } for row in rows]
+
+    return payroll_rollup_cache.get_or_compute('monthly', compute)
+
+
 class SalaryPaymentsResource(Resource):
     @jwt_required()
     def get(self):
-        salaries = Salary.query.order_by(Salary.date.desc()).all()
+        salaries = salary_history_query().order_by(Salary.date.desc()).all()
         return make_response_data(data=[s.to_dict() for s in salaries], message="Salary payments fetched successfully.")
 
+class SalaryMonthlyPayrollResource(Resource):
+    @jwt_required()
+    def get(self):
+        return make_response_data(data=monthly_payroll(), message="Monthly payroll fetched successfully.")
+
 class SalariesResource(Resource):
     @jwt_required()
     def delete(self):
@@ -21,8 +66,33 @@ class SalariesResource(Resource):
         return make_response_data(message="All salary records deleted.", status_code=200)
     @jwt_required()
     def get(self):
-        salaries = Salary.query.order_by(Salary.date.desc()).all()
-        return make_response_data(data=[s.to_dict() for s in salaries], message="Salary payment history fetched successfully.")
+        parser = reqparse.RequestParser()
+        parser.add_argument('per_page', type=int, default=50, location='args')
+        parser.add_argument('cursor', type=str, help='next_cursor from the previous page', location='args')
+        parser.add_argument('user_id', type=int, location='args')
+        parser.add_argument('total', type=str, default='exact', choices=COUNT_MODES, location='args')
+        args = parser.parse_args()
+
+        query = salary_history_query()
+        if args['user_id']:
+            query = query.filter(Salary.user_id == args['user_id'])
+
+        # Newest first by (date, id); the user comes from the same query
+        per_page = min(max(args['per_page'], 1), 200)
+        total, estimated = count_rows(query, args['total'])
+        try:
+            salaries, next_cursor = keyset_page(query, (Salary.date, Salary.id), per_page, cursor=args['cursor'])
+        except (TypeError, ValueError):
+            return make_response_data(success=False, message="Invalid cursor.", status_code=400)
+        return make_response_data(data={
+            'items': [s.to_dict() for s in salaries],
+            'meta': {
+                'total': total,
+                'total_is_estimate': estimated,
+                'per_page': per_page,
+                'next_cursor': next_cursor
+            }
+        }, message="Salary payment history fetched successfully.")
 
     @jwt_required()
     def post(self):
@@ -44,6 +114,11 @@ class SalariesResource(Resource):
         return make_response_data(data=salary.to_dict(), message="Salary record created", status_code=201)
 
 class SalaryResource(Resource):
+    @jwt_required()
+    def get(self, salary_id):
+        salary = salary_history_query().filter(Salary.id == salary_id).first_or_404()
+        return make_response_data(data=salary.to_dict(), message="Salary record fetched.")
+
     @jwt_required()
     def delete(self, salary_id):
         salary = Salary.query.get_or_404(salary_id)
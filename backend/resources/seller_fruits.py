@@ -1,6 +1,8 @@
 from flask_restful import Resource, reqparse
+from sqlalchemy.orm import joinedload
 from models.seller_fruit import SellerFruit
-from models.user import User
+from utils.helpers import keyset_page, count_rows, contains_pattern, COUNT_MODES
+from utils.user_cache import load_user
 from extensions import db
 from flask import request
 from datetime import datetime
@@ -9,29 +11,63 @@ from flask_jwt_extended import get_jwt_identity, jwt_required
 class SellerFruitListResource(Resource):
     @jwt_required()
     def get(self):
+        parser = reqparse.RequestParser()
+        parser.add_argument('per_page', type=int, default=50, location='args')
+        parser.add_argument('cursor', type=str, help='next_cursor from the previous page', location='args')
+        parser.add_argument('date', type=str, help='YYYY-MM-DD', location='args')
+        parser.add_argument('start_date', type=str, help='YYYY-MM-DD', location='args')
+        parser.add_argument('end_date', type=str, help='YYYY-MM-DD', location='args')
+        parser.add_argument('stock_name', type=str, location='args')
+        parser.add_argument('customer_name', type=str, location='args')
+        parser.add_argument('total', type=str, default='exact', choices=COUNT_MODES, location='args')
+        args = parser.parse_args()
+
         # Get current user from JWT token
         current_user_id = get_jwt_identity()
         if not current_user_id:
             return {"message": "Authentication required"}, 401
 
-        # Convert string ID back to int for SQLAlchemy query.get()
-        if current_user_id is not None:
-            try:
-                current_user_id = int(current_user_id)
-            except (TypeError, ValueError):
-                pass
-
         # Get current user role
-        user = User.query.get(current_user_id)
+        user = load_user(current_user_id)
         if not user:
             return {"message": "User not found"}, 404
 
-        # If CEO, return all seller fruits; otherwise, filter by user
-        if getattr(user, 'role', None) == 'ceo':
-            fruits = SellerFruit.query.all()
-        else:
-            fruits = SellerFruit.query.filter_by(created_by=current_user_id).all()
-        return [fruit.to_dict() for fruit in fruits], 200
+        # Creators come from the same query (one join) instead of one lookup per row
+        query = SellerFruit.query.options(joinedload(SellerFruit.creator))
+        # If CEO, list all seller fruits; otherwise only the user's own
+        if getattr(user.role, 'value', user.role) != 'ceo':
+            query = query.filter(SellerFruit.created_by == user.id)
+
+        try:
+            if args['date']:
+                query = query.filter(SellerFruit.date == datetime.strptime(args['date'], '%Y-%m-%d').date())
+            if args['start_date']:
+                query = query.filter(SellerFruit.date >= datetime.strptime(args['start_date'], '%Y-%m-%d').date())
+            if args['end_date']:
+                query = query.filter(SellerFruit.date <= datetime.strptime(args['end_date'], '%Y-%m-%d').date())
+        except ValueError:
+            return {"message": "Invalid date format. Use YYYY-MM-DD"}, 400
+        if args['stock_name']:
+            query = query.filter(SellerFruit.stock_name == args['stock_name'])
+        if args['customer_name']:
+            query = query.filter(SellerFruit.customer_name.ilike(contains_pattern(args['customer_name']), escape='\\'))
+
+        # Newest first by (date, id): a range scan of (created_by, date, id) for sellers
+        per_page = min(max(args['per_page'], 1), 200)
+        total, estimated = count_rows(query, args['total'])
+        try:
+            fruits, next_cursor = keyset_page(query, (SellerFruit.date, SellerFruit.id), per_page, cursor=args['cursor'])
+        except (TypeError, ValueError):
+            return {"message": "Invalid cursor."}, 400
+        return {
+            'items': [fruit.to_dict() for fruit in fruits],
+            'meta': {
+                'total': total,
+                'total_is_estimate': estimated,
+                'per_page': per_page,
+                'next_cursor': next_cursor
+            }
+        }, 200
 
     @jwt_required()
     def delete(self):
@@ -63,14 +99,7 @@ class SellerFruitListResource(Resource):
         if not current_user_id:
             return {"message": "Authentication required"}, 401
 
-        # Convert string ID back to int for SQLAlchemy query
-        if current_user_id is not None:
-            try:
-                current_user_id = int(current_user_id)
-            except (TypeError, ValueError):
-                pass
-
-        user = User.query.get(current_user_id)
+        user = load_user(current_user_id)
         if not user:
             return {"message": "User not found"}, 404
 
@@ -154,7 +183,7 @@ class SellerFruitListResource(Resource):
             date=date,
             amount=amount,
             customer_name=customer_name,
-            created_by=current_user_id
+            created_by=user.id
         )
         db.session.add(new_fruit)
         db.session.commit()
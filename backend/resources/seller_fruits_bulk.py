@@ -1,36 +1,125 @@
+import math
+
 from flask_restful import Resource
+from flask_jwt_extended import get_jwt_identity, jwt_required
 from models.seller_fruit import SellerFruit
+from utils.user_cache import load_user
 from extensions import db
 from flask import request
+from datetime import datetime
+
+MAX_BULK_ITEMS = 10000
+# Rows per INSERT; with psycopg2 each chunk is one execute_values round trip
+BULK_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 200
+
+TEXT_FIELDS = (('stock_name', True), ('fruit_name', True), ('customer_name', False))
+NUMBER_FIELDS = ('qty', 'unit_price', 'amount')
+
+
+def coerce_seller_fruit(item):
+    """Validate one bulk item; returns ``(row values, [error messages])``."""
+    if not isinstance(item, dict):
+        return None, ["Item must be an object"]
+    row, errors = {}, []
+    for field, required in TEXT_FIELDS:
+        value = item.get(field)
+        value = str(value).strip() if value is not None else ''
+        max_length = SellerFruit.__table__.c[field].type.length
+        if not value:
+            if required:
+                errors.append(f"{field} is required")
+            row[field] = None
+        elif len(value) > max_length:
+            errors.append(f"{field} must be at most {max_length} characters")
+        else:
+            row[field] = value
+    for field in NUMBER_FIELDS:
+        value = item.get(field)
+        if value is None or value == '':
+            errors.append(f"{field} is required")
+            continue
+        try:
+            if isinstance(value, bool):
+                raise TypeError
+            number = float(value)
+        except (TypeError, ValueError):
+            errors.append(f"{field} must be a valid number")
+            continue
+        if not math.isfinite(number):
+            errors.append(f"{field} must be a finite number")
+            continue
+        if not number > 0:
+            errors.append(f"{field} must be a positive number")
+        row[field] = number
+    try:
+        row['date'] = datetime.strptime(str(item.get('date') or ''), '%Y-%m-%d').date()
+    except ValueError:
+        errors.append("date is required as YYYY-MM-DD")
+    return row, errors
+
+
+def insert_seller_fruits(rows, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Insert ``rows`` (column dicts) in chunks and return their ids in order.
+    Where the driver supports executemany with RETURNING (psycopg2) each chunk
+    is one statement; elsewhere (SQLite) rows go one statement each.
+    """
+    table = SellerFruit.__table__
+    connection = db.session.connection()
+    ids = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        if connection.dialect.insert_executemany_returning:
+            ids.extend(row.id for row in connection.execute(table.insert().returning(table.c.id), chunk))
+        else:
+            ids.extend(connection.execute(table.insert(), row).inserted_primary_key[0] for row in chunk)
+    return ids
+
 
 class SellerFruitBulkResource(Resource):
+    @jwt_required()
     def post(self):
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
         items = data.get('items', [])
 
-        if not items:
+        if not items or not isinstance(items, list):
             return {"message": "No items provided"}, 400
+        if len(items) > MAX_BULK_ITEMS:
+            return {"message": f"At most {MAX_BULK_ITEMS} items per request"}, 400
 
-        created_fruits = []
-        for item in items:
-            fruit_name = item.get('fruit_name')
-            qty = item.get('qty')
-            unit_price = item.get('unit_price')
-            date = item.get('date')
-            amount = item.get('amount')
-
-            if not all([fruit_name, qty, unit_price, date, amount]):
-                return {"message": f"Missing required fields for item: {item}"}, 400
-
-            new_fruit = SellerFruit(
-                fruit_name=fruit_name,
-                qty=qty,
-                unit_price=unit_price,
-                date=date,
-                amount=amount
-            )
-            db.session.add(new_fruit)
-            created_fruits.append(new_fruit)
+        user = load_user(get_jwt_identity())
+        if not user:
+            return {"message": "User not found"}, 404
 
+        # Validate the whole batch first; nothing is inserted unless every item is valid
+        rows, errors, failed = [], [], 0
+        for index, item in enumerate(items):
+            row, item_errors = coerce_seller_fruit(item)
+            if item_errors:
+                failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({"index": index, "errors": item_errors})
+            elif not failed:
+                rows.append(row)
+        if failed:
+            return {
+                "message": f"{failed} of {len(items)} items are invalid; nothing was saved",
+                "errors": errors,
+                "errors_truncated": failed > len(errors)
+            }, 400
+
+        # Read before the commit expires the user, so serializing needs no reload
+        creator_id, creator_email = user.id, user.email
+        created_at = datetime.utcnow()
+        for row in rows:
+            row['created_by'] = creator_id
+            row['created_at'] = created_at
+        ids = insert_seller_fruits(rows)
         db.session.commit()
-        return [fruit.to_dict() for fruit in created_fruits], 201
+
+        # Serialize from the inserted values; every row belongs to the current user
+        return [
+            SellerFruit.serialize(dict(row, id=fruit_id), creator_email)
+            for fruit_id, row in zip(ids, rows)
+        ], 201
@@ -1,49 +1,113 @@
 from flask_restful import Resource, reqparse
+from flask import request
 from datetime import datetime
 from flask_jwt_extended import jwt_required
 from extensions import db
+from models.inventory import Inventory
+from models.inventory_snapshot import InventorySnapshot
 from models.stock_movement import StockMovement
-from utils.helpers import make_response_data, get_current_user
+from utils.helpers import make_response_data, get_current_user, encode_cursor, decode_cursor
 from utils.decorators import role_required
-from sqlalchemy import text
+from utils.stock_ledger import record_movement, record_opening_balances, StockLedgerError
+from utils.stock_import import StockImport, ImportFileError, iter_upload_rows
+from sqlalchemy import tuple_
 
 stock_parser = reqparse.RequestParser()
 stock_parser.add_argument('inventory_id', type=int, required=True)
 stock_parser.add_argument('movement_type', type=str, required=True)
 stock_parser.add_argument('quantity', type=str, required=True)
 stock_parser.add_argument('unit', type=str)
-stock_parser.add_argument('remaining_stock', type=str)
 stock_parser.add_argument('date', type=str, required=True)
 stock_parser.add_argument('notes', type=str)
+stock_parser.add_argument('selling_price', type=float)
+
+MOVEMENT_PAGE_DEFAULT = 50
+MOVEMENT_PAGE_MAX = 200
+
+
+def movement_rows_query():
+    """Select stock movement columns plus the inventory item name in one join."""
+    return db.session.query(
+        StockMovement.id,
+        StockMovement.inventory_id,
+        Inventory.name.label('inventory_item_name'),
+        StockMovement.movement_type,
+        StockMovement.quantity,
+        StockMovement.unit,
+        StockMovement.remaining_stock,
+        StockMovement.date,
+        StockMovement.notes,
+        StockMovement.selling_price,
+        StockMovement.added_by,
+        StockMovement.created_at
+    ).outerjoin(Inventory, StockMovement.inventory_id == Inventory.id)
+
+
+def movement_row_to_dict(row):
+    """Serialize a row from ``movement_rows_query`` like ``StockMovement.to_dict``."""
+    return {
+        'id': row.id,
+        'inventory_id': row.inventory_id,
+        'inventory_item_name': row.inventory_item_name,
+        'movement_type': row.movement_type,
+        'quantity': row.quantity,
+        'unit': row.unit,
+        'remaining_stock': row.remaining_stock,
+        'date': row.date.isoformat() if row.date else None,
+        'notes': row.notes,
+        'selling_price': row.selling_price,
+        'added_by': row.added_by,
+        'created_at': row.created_at.isoformat() if row.created_at else None
+    }
+
 
 class StockMovementListResource(Resource):
     @jwt_required()
     def get(self):
+        """
+        Newest-first stock movements, keyset paginated on (date, id).
+        Filters: inventory_id, movement_type, start_date, end_date; pass the
+        returned meta.next_cursor as ?cursor= to fetch the next page.
+        """
+        args = request.args
+        limit = min(max(args.get('limit', default=MOVEMENT_PAGE_DEFAULT, type=int), 1), MOVEMENT_PAGE_MAX)
+
+        query = movement_rows_query()
+        try:
+            if args.get('inventory_id'):
+                query = query.filter(StockMovement.inventory_id == int(args['inventory_id']))
+            if args.get('movement_type'):
+                query = query.filter(StockMovement.movement_type == args['movement_type'])
+            if args.get('start_date'):
+                query = query.filter(StockMovement.date >= datetime.strptime(args['start_date'], '%Y-%m-%d').date())
+            if args.get('end_date'):
+                query = query.filter(StockMovement.date <= datetime.strptime(args['end_date'], '%Y-%m-%d').date())
+            if args.get('cursor'):
+                cursor_date, cursor_id = decode_cursor(args['cursor'], 2)
+                cursor_date = datetime.strptime(cursor_date, '%Y-%m-%d').date()
+                query = query.filter(tuple_(StockMovement.date, StockMovement.id) < (cursor_date, int(cursor_id)))
+        except (TypeError, ValueError):
+            return make_response_data(
+                success=False,
+                message="Invalid filter or cursor. Dates use YYYY-MM-DD; inventory_id must be an integer.",
+                status_code=400
+            )
+
         try:
-            # Use raw SQL to fetch stock movements as strings to avoid numeric type conversion issues
-            movements_result = db.session.execute(text("SELECT id, inventory_id, movement_type, quantity::text, unit, remaining_stock::text, date, notes, selling_price::text, added_by, created_at FROM stock_movement ORDER BY date DESC")).fetchall()
-            # Convert to dict-like objects for compatibility
-            movements = []
-            for row in movements_result:
-                movement_dict = {
-                    'id': row[0],
-                    'inventory_id': row[1],
-                    'movement_type': row[2],
-                    'quantity': row[3],
-                    'unit': row[4],
-                    'remaining_stock': row[5],
-                    'date': row[6],
-                    'notes': row[7],
-                    'selling_price': row[8],
-                    'added_by': row[9],
-                    'created_at': row[10]
-                }
-                movements.append(type('MovementObj', (), movement_dict)())
+            rows = query.order_by(StockMovement.date.desc(), StockMovement.id.desc()).limit(limit + 1).all()
         except Exception as e:
             db.session.rollback()
             return make_response_data(success=False, message=f"Error fetching stock movements: {str(e)}", status_code=500)
 
-        return make_response_data(data=[m.to_dict() for m in movements], message="Stock movements fetched.")
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].date.isoformat(), rows[-1].id)
+
+        return make_response_data(data={
+            'items': [movement_row_to_dict(row) for row in rows],
+            'meta': {'limit': limit, 'next_cursor': next_cursor}
+        }, message="Stock movements fetched.")
 
     from flask_jwt_extended import jwt_required
 
@@ -57,23 +121,71 @@ class StockMovementListResource(Resource):
             move_date = datetime.strptime(data['date'], '%Y-%m-%d').date()
         except ValueError:
             return make_response_data(success=False, message="Invalid date format. Use YYYY-MM-DD.", status_code=400)
-        new_movement = StockMovement(
-            inventory_id=data['inventory_id'],
-            movement_type=data['movement_type'],
-            quantity=data['quantity'],
-            unit=data['unit'],
-            remaining_stock=data['remaining_stock'],
-            date=move_date,
-            notes=data.get('notes'),
-            added_by=current_user.id
-        )
-        db.session.add(new_movement)
+
+        # remaining_stock and the inventory quantity are computed server-side under a row lock
+        try:
+            new_movement = record_movement(
+                inventory_id=data['inventory_id'],
+                movement_type=data['movement_type'],
+                quantity=data['quantity'],
+                move_date=move_date,
+                added_by=current_user.id,
+                unit=data['unit'],
+                notes=data.get('notes'),
+                selling_price=data.get('selling_price')
+            )
+        except StockLedgerError as e:
+            # Fixed ledger messages only; never the raw input or conversion errors
+            db.session.rollback()
+            return make_response_data(success=False, message=str(e), status_code=400)
         db.session.commit()
         return make_response_data(data=new_movement.to_dict(), message="Stock movement recorded.", status_code=201)
 
 class ClearStockMovementsResource(Resource):
     @role_required('ceo')
     def delete(self):
+        current_user = get_current_user()
+        InventorySnapshot.query.delete()
         num_deleted = StockMovement.query.delete()
+        # Keep current balances derivable from the (now empty) movement history
+        record_opening_balances(current_user.id)
         db.session.commit()
-        return make_response_data(message=f"Successfully cleared {num_deleted} stock movement records.")
\ No newline at end of file
+        return make_response_data(message=f"Successfully cleared {num_deleted} stock movement records.")
+
+
+class StockImportResource(Resource):
+    @role_required('ceo', 'storekeeper')
+    def post(self, kind):
+        """
+        Bulk import a CSV/XLSX upload (multipart field ``file``).
+        ``kind`` is ``inventory`` (stock take: name, fruit_type, quantity[, unit,
+        location, expiry_date, date]) or ``movements`` (inventory or inventory_id,
+        movement_type, quantity, date[, unit, notes, selling_price]).
+        Pass ``dry_run=true`` to validate without saving.
+        """
+        current_user = get_current_user()
+        upload = request.files.get('file')
+        if upload is None or upload.filename == '':
+            return make_response_data(success=False, message="No file uploaded.", status_code=400)
+        dry_run = request.values.get('dry_run', '').lower() in ('1', 'true', 'yes')
+
+        try:
+            report = StockImport(kind, current_user.id, dry_run=dry_run).run(iter_upload_rows(upload))
+        except ImportFileError as e:
+            db.session.rollback()
+            return make_response_data(success=False, message=str(e), status_code=400)
+
+        if not report['complete']:
+            # Earlier chunks were committed before the file became unreadable
+            return make_response_data(
+                success=False,
+                data=report,
+                message=f"Import stopped early. {report['error']}",
+                errors=report['errors']
+            )
+        verb = "validated" if dry_run else "imported"
+        return make_response_data(
+            data=report,
+            message=f"{report['imported']} of {report['rows']} rows {verb}.",
+            errors=report['errors']
+        )
@@ -0,0 +1,115 @@
+import json
+
+from flask import Response, current_app, request
+from flask_restful import Resource
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_request_location
+
+from extensions import db
+from utils.helpers import make_response_data, get_current_user
+from utils.event_stream import (
+    get_stream_broker, parse_cursor, format_cursor, latest_cursor, replay, create_stream_token, STREAM_SCOPE
+)
+
+
+def _sse(channel, cursor, payload):
+    return f"id: {format_cursor(*cursor)}\nevent: {channel}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+def is_stream_request():
+    """True when the current request is for ``StreamResource``."""
+    view = current_app.view_functions.get(request.endpoint)
+    return getattr(view, 'view_class', None) is StreamResource
+
+
+def _event_stream(app, broker, user_id, role, cursor, heartbeat):
+    """Yield missed rows, then live ones; runs after the request context is gone."""
+    alert_id, message_id = cursor
+    broker.subscribe()
+    try:
+        # Take the broker position before replaying so nothing committed in between is lost
+        seq = broker.last_seq
+        yield f"retry: {app.config.get('STREAM_RETRY_MS', 5000)}\n\n"
+        complete = False
+        while not complete:
+            with app.app_context():
+                missed, complete = replay((alert_id, message_id), user_id, role)
+                db.session.remove()
+            chunks = []
+            for channel, row_id, payload in missed:
+                if channel == 'alert':
+                    alert_id = max(alert_id, row_id)
+                else:
+                    message_id = max(message_id, row_id)
+                chunks.append(_sse(channel, (alert_id, message_id), payload))
+            if chunks:
+                yield ''.join(chunks)
+
+        while True:
+            entries = broker.wait(seq, heartbeat)
+            if not entries:
+                yield ": keep-alive\n\n"
+                continue
+            seq = entries[-1].seq
+            chunks = []
+            with app.app_context():
+                for entry in entries:
+                    if entry.channel == 'alert':
+                        if entry.row_id <= alert_id:
+                            continue
+                        alert_id = entry.row_id
+                    else:
+                        if entry.row_id <= message_id:
+                            continue
+                        message_id = entry.row_id
+                    if entry.visible_to(user_id, role):
+                        chunks.append(_sse(entry.channel, (alert_id, message_id), entry.payload()))
+                db.session.remove()
+            if chunks:
+                yield ''.join(chunks)
+    finally:
+        broker.unsubscribe()
+
+
+class StreamTokenResource(Resource):
+    @jwt_required()
+    def post(self):
+        """Short-lived token for ``/api/stream?jwt=``; EventSource cannot send headers."""
+        current_user = get_current_user()
+        if not current_user:
+            return make_response_data(success=False, message="Authentication required. Please log in.",
+                                      status_code=401)
+        token, expires_in = create_stream_token(current_user)
+        return make_response_data(data={'token': token, 'expires_in': expires_in}, message="Stream token issued.")
+
+
+class StreamResource(Resource):
+    # EventSource cannot send headers, so a stream token (POST /api/stream/token) may come as ?jwt=
+    @jwt_required(locations=['headers', 'query_string'])
+    def get(self):
+        """
+        Server-Sent Events: ``alert`` events (IT/admin) and ``message`` events for
+        the current user. Resumes after ``Last-Event-ID`` (or ?last_event_id=).
+        """
+        # Full access tokens stay out of URLs (and so out of access logs)
+        if get_jwt_request_location() == 'query_string' and get_jwt().get('scope') != STREAM_SCOPE:
+            return make_response_data(success=False, message="Use a stream token from /api/stream/token.",
+                                      status_code=401)
+        current_user = get_current_user()
+        if not current_user:
+            return make_response_data(success=False, message="Authentication required. Please log in.",
+                                      status_code=401)
+        role = current_user.role.value if current_user.role else None
+
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        cursor = parse_cursor(last_event_id)
+        if cursor is None:
+            cursor = latest_cursor()
+
+        app = current_app._get_current_object()
+        broker = get_stream_broker(app)
+        heartbeat = app.config.get('STREAM_HEARTBEAT_SECONDS', 15)
+        return Response(
+            _event_stream(app, broker, current_user.id, role, cursor, heartbeat),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+        )
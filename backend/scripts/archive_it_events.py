@@ -0,0 +1,32 @@
+"""
+Create upcoming it_event partitions and archive months past retention (run daily, e.g. from cron):
+
+    python backend/scripts/archive_it_events.py [retention_months]
+
+Archived months are written to IT_EVENT_ARCHIVE_DIR as it_event_YYYY-MM.jsonl.gz
+and can be queried through /api/it/events/archive.
+"""
+import os
+import sys
+
+# Ensure the backend directory is on sys.path so `app`, `models` and `utils` import
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, os.pardir))
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+from app import app
+from utils.it_event_partitions import ensure_partitions, apply_retention
+
+
+if __name__ == "__main__":
+    with app.app_context():
+        retention = int(sys.argv[1]) if len(sys.argv) > 1 else app.config['IT_EVENT_RETENTION_MONTHS']
+        created = ensure_partitions()
+        archived = apply_retention(retention, app.config['IT_EVENT_ARCHIVE_DIR'])
+    for name in created:
+        print(f"Created partition {name}")
+    for month, count in archived.items():
+        print(f"Archived {count} events from {month}")
+    if not created and not archived:
+        print("Nothing to do")
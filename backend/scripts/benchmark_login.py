@@ -0,0 +1,93 @@
+"""
+Benchmark password verification on one eventlet worker:
+
+    python backend/scripts/benchmark_login.py [logins] [concurrency] [target_ms]
+
+Runs ``logins`` verifications from ``concurrency`` green threads for the old
+setup (Werkzeug's 260,000-iteration default, hashed inline on the hub) and for
+the shipped one (``PASSWORD_HASH_ITERATIONS`` from config, at least
+``MIN_ITERATIONS``, through ``utils.passwords`` and eventlet's native thread
+pool). For each it reports logins per second and the longest stall of a green
+thread that ticks every 10 ms, i.e. how long other requests on the worker
+would have waited.
+
+It then prints the iteration count that takes about ``target_ms`` (default
+100) per hash on this machine, never below ``MIN_ITERATIONS``, as a suggested
+``PASSWORD_HASH_ITERATIONS``. Run it on the production hardware and set the
+value in the environment so every worker uses the same count.
+"""
+import eventlet
+
+eventlet.monkey_patch()
+
+import os
+import sys
+import time
+
+# Ensure the backend directory is on sys.path so `utils` imports
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, os.pardir))
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from config import Config
+from utils.passwords import MIN_ITERATIONS, verify_password
+
+TICK_SECONDS = 0.01
+# Werkzeug's pbkdf2:sha256 default before this app set its own count
+OLD_ITERATIONS = 260000
+CALIBRATION_ITERATIONS = 100000
+
+
+def run(verify, password_hash, logins, concurrency):
+    pool = eventlet.GreenPool(concurrency)
+    stalls = []
+    done = eventlet.event.Event()
+
+    def ticker():
+        last = time.perf_counter()
+        while not done.ready():
+            eventlet.sleep(TICK_SECONDS)
+            now = time.perf_counter()
+            stalls.append(now - last - TICK_SECONDS)
+            last = now
+
+    tick = eventlet.spawn(ticker)
+    started = time.perf_counter()
+    results = list(pool.imap(lambda _: verify(password_hash, 'Secret123'), range(logins)))
+    elapsed = time.perf_counter() - started
+    done.send()
+    tick.wait()
+    assert all(results)
+    return {
+        'logins_per_second': logins / elapsed,
+        'max_stall_ms': max(stalls, default=0) * 1000,
+    }
+
+
+def recommended_iterations(target_ms):
+    """Iterations taking about ``target_ms`` per hash here, rounded to 10,000 and at least ``MIN_ITERATIONS``."""
+    started = time.perf_counter()
+    generate_password_hash('Secret123', f'pbkdf2:sha256:{CALIBRATION_ITERATIONS}')
+    per_iteration_ms = (time.perf_counter() - started) * 1000 / CALIBRATION_ITERATIONS
+    return max(int(target_ms / per_iteration_ms) // 10000 * 10000, MIN_ITERATIONS)
+
+
+if __name__ == "__main__":
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    target_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 100.0
+    shipped = max(Config.PASSWORD_HASH_ITERATIONS, MIN_ITERATIONS)
+    cases = (
+        (f'before ({OLD_ITERATIONS} iterations, inline)', OLD_ITERATIONS, check_password_hash),
+        (f'after ({shipped} iterations, thread pool)', shipped, verify_password),
+    )
+    for name, iterations, verify in cases:
+        password_hash = generate_password_hash('Secret123', f'pbkdf2:sha256:{iterations}')
+        result = run(verify, password_hash, logins, concurrency)
+        print(f"{name:>40}: {result['logins_per_second']:6.1f} logins/s, "
+              f"longest hub stall {result['max_stall_ms']:7.1f} ms")
+    print(f"Suggested PASSWORD_HASH_ITERATIONS for ~{target_ms:.0f} ms per hash: "
+          f"{recommended_iterations(target_ms)}")
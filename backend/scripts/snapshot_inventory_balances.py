@@ -0,0 +1,24 @@
+"""
+Take a balance snapshot for every inventory item (run daily, e.g. from cron):
+
+    python backend/scripts/snapshot_inventory_balances.py [YYYY-MM-DD]
+"""
+import os
+import sys
+from datetime import datetime, date
+
+# Ensure the backend directory is on sys.path so `app`, `models` and `utils` import
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, os.pardir))
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+from app import app
+from utils.stock_ledger import take_snapshots
+
+
+if __name__ == "__main__":
+    as_of = datetime.strptime(sys.argv[1], '%Y-%m-%d').date() if len(sys.argv) > 1 else date.today()
+    with app.app_context():
+        count = take_snapshots(as_of)
+    print(f"Snapshotted {count} inventory balances as of {as_of.isoformat()}")
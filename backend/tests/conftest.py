@@ -0,0 +1,67 @@
+import os
+import sys
+from contextlib import contextmanager
+
+import pytest
+
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+# Tests run against an in-memory SQLite database; must be set before config/app import.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from extensions import db
+from models.user import User, UserRole
+from utils.token_versions import token_claims
+
+
+@pytest.fixture
+def app():
+    application = create_app()
+    application.config['TESTING'] = True
+    yield application
+    application.extensions['it_event_writer'].stop()
+    with application.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def make_user(email, role=UserRole.CEO, name=None):
+    """Create and commit a user; call inside an app context."""
+    user = User(email=email, name=name or email.split('@')[0], role=role)
+    user.set_password('Secret123')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def auth_headers(user):
+    """Bearer headers for ``user``; call inside an app context."""
+    token = create_access_token(identity=str(user.id), additional_claims=token_claims(user))
+    return {'Authorization': f'Bearer {token}'}
+
+
+@contextmanager
+def count_queries():
+    """Collect every SQL statement issued on the app engine while the block runs."""
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
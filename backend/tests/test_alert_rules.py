@@ -0,0 +1,77 @@
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from config import Config
+from models.it_event import EventType
+from models.user import UserRole
+from utils.alert_rules import AlertRuleError, compile_alert_rules, parse_condition
+from utils.alert_windows import AlertWindowEngine
+from tests.conftest import make_user, count_queries
+
+
+def _event(event_type, ip='10.0.0.1', payload=None, user_id=None, n=0):
+    return SimpleNamespace(id=f'evt_{n}', event_type=event_type, ip=ip, user_email=None,
+                           user_id=user_id, payload=payload, timestamp=datetime(2025, 1, 1, 12, 0, n % 60))
+
+
+def test_config_conditions_compile():
+    rules = {rule.name: rule for rule in compile_alert_rules(Config.ALERT_RULES)}
+    burst = rules['failed_login_burst']
+    assert (burst.event_type, burst.threshold, burst.window_seconds, burst.group_by) == \
+        (EventType.FAILED_LOGIN, 5, 900, 'ip')
+    errors = rules['api_error_burst']
+    assert (errors.event_type, errors.threshold, errors.window_seconds, errors.group_by) == \
+        (EventType.API_ERROR, 10, 300, None)
+    assert rules['permission_change'].threshold == 1
+    assert rules['mass_data_export'].event_type == EventType.DATA_EXPORT
+
+
+@pytest.mark.parametrize('condition', [
+    'lots of failed_login',
+    '>=5 teleport within 5m',
+    '>=5 failed_login from same planet within 5m',
+    '>=5 failed_login',
+    '>1GB failed_login',
+    '>1GB data export by nobody',
+])
+def test_bad_conditions_are_rejected(condition):
+    with pytest.raises(AlertRuleError):
+        parse_condition('rule', condition)
+
+
+def test_strict_count_and_grouping():
+    rule = parse_condition('r', '>3 api_error from same resource within 1h')
+    assert (rule.threshold, rule.window_seconds, rule.group_by) == (4, 3600, 'resource')
+
+
+def test_size_rule_only_looks_up_users_for_large_exports(app):
+    engine = AlertWindowEngine([parse_condition('mass_data_export', '>1GB data export by non-admin')])
+    with app.app_context():
+        seller_id = make_user('seller@example.com', UserRole.SELLER).id
+        admin_id = make_user('admin@example.com', UserRole.ADMIN).id
+        with count_queries() as statements:
+            assert not engine.process(_event(EventType.DATA_EXPORT, payload={'export_size_mb': 900},
+                                             user_id=seller_id))
+        assert statements == []
+        assert engine.process(_event(EventType.DATA_EXPORT, payload={'export_size_mb': 2048}, user_id=seller_id))
+        assert not engine.process(_event(EventType.DATA_EXPORT, payload={'export_size_mb': 2048}, user_id=admin_id))
+
+
+def test_unrelated_event_types_skip_rules():
+    engine = AlertWindowEngine(compile_alert_rules(Config.ALERT_RULES))
+    assert EventType.LOGIN not in engine.rules_by_type
+    assert engine.rules_by_type[EventType.FAILED_LOGIN][0].name == 'failed_login_burst'
+
+
+def test_engine_keeps_up_with_ten_thousand_events_per_second():
+    engine = AlertWindowEngine(compile_alert_rules(Config.ALERT_RULES))
+    types = [EventType.LOGIN, EventType.FAILED_LOGIN, EventType.API_ERROR, EventType.LOGOUT]
+    events = [_event(types[n % 4], ip=f'10.0.0.{n % 200}', n=n) for n in range(20000)]
+    started = time.perf_counter()
+    for event in events:
+        engine.process(event)
+    # 20k events is two seconds of traffic at 10k/s
+    assert time.perf_counter() - started < 2.0
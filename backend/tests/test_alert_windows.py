@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+from models.it_alert import ITAlert
+from models.it_event import ITEvent, EventType, Severity
+from utils.alert_windows import AlertWindowEngine, SlidingWindowCounter, WindowRule
+from utils.it_monitor import check_alert_rules
+from tests.conftest import count_queries
+
+START = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def _event(n, event_type=EventType.FAILED_LOGIN, ip='10.0.0.1', seconds=0):
+    return ITEvent(id=f'evt_{n}', event_type=event_type, severity=Severity.WARNING, ip=ip,
+                   summary='x', timestamp=START + timedelta(seconds=seconds))
+
+
+def test_counter_slides_out_old_buckets():
+    counter = SlidingWindowCounter(60, buckets=6)
+    for second in range(0, 30, 5):
+        counter.add(second)
+    assert counter.count(30) == 6
+    # Whole 10s buckets expire: at t=70 only the events at 20s and 25s remain
+    assert counter.count(70) == 2
+    assert counter.count(500) == 0
+
+
+def test_engine_fires_once_per_window_and_key():
+    engine = AlertWindowEngine([WindowRule('burst', EventType.FAILED_LOGIN, threshold=5,
+                                           window_seconds=900, group_by='ip')])
+    fired = [engine.process(_event(i, seconds=i)) for i in range(20)]
+    assert [i for i, result in enumerate(fired) if result] == [4]
+    assert fired[4][0][1] == [f'evt_{i}' for i in range(5)]
+
+    # A different IP has its own window; unrelated event types are ignored
+    assert not engine.process(_event(99, ip='10.0.0.2', seconds=30))
+    assert not engine.process(_event(100, event_type=EventType.LOGIN, seconds=30))
+
+    # After the window has passed a new burst fires again
+    fired = [engine.process(_event(200 + i, seconds=910 + i)) for i in range(5)]
+    assert [bool(result) for result in fired] == [False] * 4 + [True]
+
+
+def test_rule_checks_do_not_query_events(app):
+    with app.app_context():
+        with count_queries() as statements:
+            for i in range(25):
+                check_alert_rules(_event(i, event_type=EventType.API_ERROR, seconds=i))
+        assert not any('it_event' in statement for statement in statements)
+        alerts = ITAlert.query.all()
+        assert [alert.title for alert in alerts] == ['High Rate of API Errors']
+        assert len(alerts[0].event_ids) == 10
@@ -0,0 +1,48 @@
+from models.it_alert import ITAlert
+from models.it_event import ITEvent, EventType
+from utils.error_aggregator import ApiErrorAggregator
+from utils.it_monitor import get_alert_title, log_api_error
+
+
+def test_repeated_errors_are_written_as_one_event(app, client):
+    for _ in range(25):
+        assert client.post('/api/no-such-endpoint').status_code == 405
+    client.post('/api/another-missing-endpoint')
+
+    aggregator = app.extensions['it_api_error_aggregator']
+    assert aggregator.recorded == 26 and aggregator.pending() == 2
+    # Shutdown flushes the open windows
+    app.extensions['it_event_writer'].stop()
+
+    with app.app_context():
+        events = ITEvent.query.filter_by(event_type=EventType.API_ERROR).order_by(ITEvent.occurrence_count).all()
+        assert [event.occurrence_count for event in events] == [1, 25]
+        folded = events[1].to_dict()
+        assert folded['resource'] == '/api/no-such-endpoint'
+        assert folded['payload']['status_code'] == 405
+        assert folded['first_seen_at'] <= folded['last_seen_at']
+        # The burst rule counts occurrences, not rows
+        assert ITAlert.query.filter_by(title=get_alert_title('api_error_burst')).count() == 1
+
+
+def test_errors_group_by_route_template(app):
+    for inv_id in (1, 2, 3):
+        with app.test_request_context(f'/api/inventory/{inv_id}', method='DELETE'):
+            log_api_error(f'/api/inventory/{inv_id}', "Not found", 404)
+    with app.test_request_context('/api/inventory/4', method='DELETE'):
+        log_api_error('/api/inventory/4', "Forbidden access", 403)
+
+    with app.app_context():
+        rows = app.extensions['it_api_error_aggregator'].collect(force=True)
+    counts = {(row['resource'], row['payload']['status_code']): row['occurrence_count'] for row in rows}
+    assert counts == {('/api/inventory/<int:inv_id>', 404): 3, ('/api/inventory/<int:inv_id>', 403): 1}
+
+
+def test_open_windows_are_kept_until_they_close(app):
+    aggregator = ApiErrorAggregator(window_seconds=60)
+    aggregator.record('/api/x', 404, 'Not found')
+    with app.app_context():
+        assert aggregator.collect() == []
+        assert aggregator.pending() == 1
+        assert len(aggregator.collect(force=True)) == 1
+    assert aggregator.pending() == 0
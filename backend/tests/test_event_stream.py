@@ -0,0 +1,112 @@
+from flask_jwt_extended import create_access_token
+
+from extensions import db
+from models.it_alert import ITAlert, AlertSeverity
+from models.message import Message
+from models.user import UserRole
+from tests.conftest import make_user, auth_headers
+
+
+def _next_event(chunks):
+    """Next non-keep-alive chunk of the stream."""
+    for chunk in chunks:
+        chunk = chunk.decode()
+        if not chunk.startswith(':'):
+            return chunk
+    return None
+
+
+def _open_stream(app, client, **kwargs):
+    app.config['STREAM_HEARTBEAT_SECONDS'] = 0.05
+    app.extensions['stream_broker'].poll_seconds = 0
+    response = client.get('/api/stream', buffered=False, **kwargs)
+    assert response.status_code == 200 and response.mimetype == 'text/event-stream'
+    return response
+
+
+def test_stream_resumes_then_follows_new_rows(app, client):
+    with app.app_context():
+        ceo = make_user('ceo@example.com', UserRole.CEO)
+        seller = make_user('seller@example.com', UserRole.SELLER)
+        headers = auth_headers(seller)
+        db.session.add(Message(sender_id=ceo.id, recipient_role=UserRole.SELLER, message='first'))
+        db.session.commit()
+        ceo_id = ceo.id
+
+    response = _open_stream(app, client, headers=dict(headers, **{'Last-Event-ID': 'a0-m0'}))
+    chunks = response.iter_encoded()
+    assert _next_event(chunks).startswith('retry:')
+    replayed = _next_event(chunks)
+    assert replayed.startswith('id: a0-m1\nevent: message\n') and '"first"' in replayed
+
+    with app.app_context():
+        db.session.add(Message(sender_id=ceo_id, recipient_role=UserRole.DRIVER, message='for drivers'))
+        db.session.add(Message(sender_id=ceo_id, recipient_role=UserRole.SELLER, message='second'))
+        db.session.add(ITAlert(event_ids=['evt_1'], title='Alert', severity=AlertSeverity.LOW))
+        db.session.commit()
+
+    live = _next_event(chunks)
+    # Only what the seller may see, with a cursor past everything already considered
+    assert live.count('event: ') == 1 and '"second"' in live and live.startswith('id: a0-m3\n')
+    response.close()
+    assert app.extensions['stream_broker'].subscribers == 0
+
+
+def test_it_staff_stream_with_a_stream_token_only(app, client):
+    with app.app_context():
+        user = make_user('it@example.com', UserRole.IT)
+        headers = auth_headers(user)
+        access_token = create_access_token(identity=str(user.id), additional_claims={'role': 'it'})
+
+    assert client.get('/api/stream').status_code == 401
+    # Full access tokens are refused in the URL
+    assert client.get('/api/stream', query_string={'jwt': access_token}).status_code == 401
+
+    token = client.post('/api/stream/token', headers=headers).get_json()['data']['token']
+    # ...and stream tokens are refused everywhere but the stream
+    assert client.get('/api/auth/me', headers={'Authorization': f'Bearer {token}'}).status_code == 400
+
+    response = _open_stream(app, client, query_string={'jwt': token})
+    chunks = response.iter_encoded()
+    assert _next_event(chunks).startswith('retry:')
+
+    with app.app_context():
+        db.session.add(ITAlert(event_ids=['evt_1'], title='Failed login burst', severity=AlertSeverity.CRITICAL))
+        db.session.commit()
+    assert 'event: alert' in _next_event(chunks)
+    response.close()
+
+
+def test_replay_pages_through_everything_missed(app, client, monkeypatch):
+    import resources.stream
+    from utils.event_stream import replay
+    monkeypatch.setattr(resources.stream, 'replay', lambda *args: replay(*args, limit=2))
+    with app.app_context():
+        ceo = make_user('ceo@example.com', UserRole.CEO)
+        headers = auth_headers(make_user('seller@example.com', UserRole.SELLER))
+        for i in range(5):
+            db.session.add(Message(sender_id=ceo.id, recipient_role=UserRole.SELLER, message=f'missed {i}'))
+        db.session.commit()
+
+    response = _open_stream(app, client, headers=dict(headers, **{'Last-Event-ID': 'a0-m0'}))
+    chunks = response.iter_encoded()
+    assert _next_event(chunks).startswith('retry:')
+    replayed = ''.join(_next_event(chunks) for _ in range(3))
+    assert [f'missed {i}' in replayed for i in range(5)] == [True] * 5
+    assert 'id: a0-m5\n' in replayed
+    response.close()
+
+
+def test_tail_publishes_rows_from_other_processes(app):
+    broker = app.extensions['stream_broker']
+    with app.app_context():
+        ceo_id = make_user('ceo@example.com', UserRole.CEO).id
+        broker._poll()
+        # A Core insert skips the session hooks, like a commit in another worker
+        db.session.execute(Message.__table__.insert().values(
+            sender_id=ceo_id, recipient_id=ceo_id, message='elsewhere', is_read=False))
+        db.session.commit()
+        seq = broker.last_seq
+        broker._poll()
+    entries = broker.wait(seq, 0)
+    assert [(e.channel, e.recipient_id) for e in entries] == [('message', ceo_id)]
@@ -0,0 +1,122 @@
+from datetime import date
+
+from extensions import db
+from models.inventory import Inventory
+from models.inventory_snapshot import InventorySnapshot
+from models.stock_movement import StockMovement
+from models.user import UserRole
+from resources.inventory import current_stock_cache
+from utils.stock_ledger import take_snapshots, balance_at, signed_quantity
+from tests.conftest import make_user, auth_headers, count_queries
+
+
+def _create_item(client, headers, quantity):
+    response = client.post('/api/inventory', headers=headers, json={
+        'name': 'Cold room A', 'quantity': str(quantity), 'fruit_type': 'Mango', 'unit': 'kg'
+    })
+    assert response.status_code == 201
+    return response.get_json()['data']['id']
+
+
+def _move(client, headers, inventory_id, movement_type, quantity, day):
+    return client.post('/api/stock-movements', headers=headers, json={
+        'inventory_id': inventory_id, 'movement_type': movement_type,
+        'quantity': str(quantity), 'date': day, 'remaining_stock': '9999'
+    })
+
+
+def _replay(inventory_id, at_date):
+    movements = StockMovement.query.filter(
+        StockMovement.inventory_id == inventory_id, StockMovement.date <= at_date
+    ).all()
+    return sum(signed_quantity(m.movement_type, m.quantity) for m in movements)
+
+
+def test_movements_maintain_inventory_balance(app, client):
+    with app.app_context():
+        keeper = make_user('keeper@example.com', UserRole.STOREKEEPER)
+        headers = auth_headers(keeper)
+
+    inventory_id = _create_item(client, headers, 100)
+    response = _move(client, headers, inventory_id, 'out', 30, '2025-01-02')
+    assert response.status_code == 201
+    # Client-supplied remaining_stock is ignored
+    assert response.get_json()['data']['remaining_stock'] == 70
+    _move(client, headers, inventory_id, 'in', 5, '2025-01-03')
+    assert _move(client, headers, inventory_id, 'teleport', 5, '2025-01-03').status_code == 400
+    for bad in ('nan', 'inf', 'lots'):
+        response = _move(client, headers, inventory_id, 'in', bad, '2025-01-03')
+        assert response.status_code == 400
+        assert response.get_json()['message'] in ('Quantity must be a number.', 'Quantity must be a finite number.')
+
+    response = client.put(f'/api/inventory/{inventory_id}', headers=headers, json={
+        'name': 'Cold room A', 'quantity': '60', 'fruit_type': 'Mango'
+    })
+    assert response.status_code == 200
+
+    with app.app_context():
+        assert db.session.get(Inventory, inventory_id).quantity == 60
+        assert balance_at(inventory_id, date.today())[0] == 60
+        adjustments = StockMovement.query.filter_by(inventory_id=inventory_id, movement_type='adjust').all()
+        assert sorted(m.quantity for m in adjustments) == [-15, 100]
+
+
+def test_balance_endpoint_uses_snapshots_and_matches_replay(app, client):
+    with app.app_context():
+        keeper = make_user('keeper@example.com', UserRole.STOREKEEPER)
+        headers = auth_headers(keeper)
+
+    inventory_id = _create_item(client, headers, 0)
+    for day, kind, qty in [('2025-01-01', 'in', 50), ('2025-01-05', 'out', 10),
+                           ('2025-01-10', 'sale', 5), ('2025-01-15', 'in', 20)]:
+        assert _move(client, headers, inventory_id, kind, qty, day).status_code == 201
+
+    with app.app_context():
+        assert take_snapshots(date(2025, 1, 7)) == 1
+
+    body = client.get(f'/api/inventory/{inventory_id}/balance?at=2025-01-12', headers=headers).get_json()['data']
+    assert body['balance'] == 35
+    assert body['snapshot_as_of'] == '2025-01-07'
+
+    body = client.get(f'/api/inventory/{inventory_id}/balance?at=2025-01-03', headers=headers).get_json()['data']
+    assert body['balance'] == 50
+    assert body['snapshot_as_of'] is None
+
+    # A back-dated movement invalidates later snapshots
+    assert _move(client, headers, inventory_id, 'spoilage', 2, '2025-01-06').status_code == 201
+    with app.app_context():
+        assert InventorySnapshot.query.count() == 0
+        take_snapshots(date(2025, 1, 12))
+        for day in (3, 6, 12, 20):
+            at_date = date(2025, 1, day)
+            assert balance_at(inventory_id, at_date)[0] == _replay(inventory_id, at_date)
+
+    assert client.get(f'/api/inventory/{inventory_id}/balance?at=soon', headers=headers).status_code == 400
+
+
+def test_current_stock_is_grouped_cached_and_supports_etag(app, client):
+    current_stock_cache.invalidate()
+    with app.app_context():
+        keeper = make_user('keeper@example.com', UserRole.STOREKEEPER)
+        headers = auth_headers(keeper)
+
+    first = _create_item(client, headers, 40)
+    _create_item(client, headers, 15)
+
+    response = client.get('/api/current-stock')
+    assert response.status_code == 200
+    assert response.get_json()['data'] == [{'fruitType': 'Mango', 'quantity': 55.0, 'unit': 'kg', 'items': 2}]
+    etag = response.headers['ETag']
+
+    with app.app_context():
+        with count_queries() as statements:
+            response = client.get('/api/current-stock', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert statements == []
+
+    assert _move(client, headers, first, 'out', 10, '2025-01-02').status_code == 201
+    response = client.get('/api/current-stock', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert response.get_json()['data'][0]['quantity'] == 45.0
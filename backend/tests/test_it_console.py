@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from extensions import db
+from models.it_alert import ITAlert, AlertSeverity
+from models.it_event import ITEvent, EventType, Severity
+from models.user import UserRole
+from tests.conftest import make_user, auth_headers, count_queries
+
+
+def _seed_events(count):
+    now = datetime.utcnow()
+    for n in range(count):
+        db.session.add(ITEvent(
+            id=f'evt_{n:04d}', timestamp=now - timedelta(minutes=n // 2),  # pairs share a timestamp
+            event_type=EventType.API_ERROR if n % 3 else EventType.FAILED_LOGIN,
+            severity=Severity.WARNING, user_email=f'u{n % 4}@example.com', summary=f'event {n}'))
+    db.session.commit()
+
+
+def test_event_pages_follow_the_keyset_cursor(app, client):
+    with app.app_context():
+        headers = auth_headers(make_user('it@example.com', UserRole.IT))
+        _seed_events(45)
+        db.session.remove()
+
+        with count_queries() as statements:
+            response = client.get('/api/it/events?per_page=20', headers=headers)
+        event_statements = [s for s in statements if 'it_event' in s]
+        # One COUNT and one page query
+        assert len(event_statements) == 2
+
+    body = response.get_json()['data']
+    assert body['meta']['total'] == 45 and body['meta']['pages'] == 3
+    seen = [e['id'] for e in body['events']]
+    cursor = body['meta']['next_cursor']
+    while cursor:
+        body = client.get(f'/api/it/events?per_page=20&total=none&cursor={cursor}', headers=headers).get_json()['data']
+        assert body['meta']['total'] is None
+        seen += [e['id'] for e in body['events']]
+        cursor = body['meta']['next_cursor']
+    assert len(seen) == len(set(seen)) == 45
+
+    # Offset pages still work for the console's page numbers
+    page_two = client.get('/api/it/events?per_page=20&page=2', headers=headers).get_json()['data']['events']
+    assert [e['id'] for e in page_two] == seen[20:40]
+    assert client.get('/api/it/events?cursor=garbage', headers=headers).status_code == 400
+
+
+def _plan(query):
+    statement = query.statement.compile(db.engine, compile_kwargs={"literal_binds": True})
+    return ' | '.join(row[-1] for row in db.session.execute(text(f"EXPLAIN QUERY PLAN {statement}")))
+
+
+def test_console_filters_use_indexes(app):
+    since = datetime(2025, 1, 1)
+    ordered = (ITEvent.timestamp.desc(), ITEvent.id.desc())
+    with app.app_context():
+        cases = [
+            (ITEvent.query.filter(ITEvent.timestamp >= since), 'ix_it_event_timestamp_id'),
+            (ITEvent.query.filter(ITEvent.timestamp >= since, ITEvent.event_type == EventType.API_ERROR),
+             'ix_it_event_event_type_timestamp_id'),
+            (ITEvent.query.filter(ITEvent.timestamp >= since, ITEvent.severity == Severity.CRITICAL),
+             'ix_it_event_severity_timestamp_id'),
+            (ITEvent.query.filter(ITEvent.timestamp >= since, ITEvent.user_email == 'a@example.com'),
+             'ix_it_event_user_email_timestamp_id'),
+            (ITAlert.query.filter(ITAlert.acknowledged.is_(False)).order_by(
+                ITAlert.created_at.desc(), ITAlert.id.desc()), 'ix_it_alert_acknowledged_created_at_id'),
+        ]
+        for query, index_name in cases:
+            if query.column_descriptions[0]['type'] is ITEvent:
+                query = query.order_by(*ordered)
+            plan = _plan(query.limit(50))
+            assert index_name in plan, plan
+            assert 'USE TEMP B-TREE' not in plan, plan
+
+
+def test_alert_list_pages_and_filters(app, client):
+    with app.app_context():
+        headers = auth_headers(make_user('it@example.com', UserRole.IT))
+        start = datetime(2025, 1, 1)
+        for n in range(7):
+            db.session.add(ITAlert(event_ids=[], title=f'alert {n}', severity=AlertSeverity.HIGH,
+                                   acknowledged=n % 2 == 0, created_at=start + timedelta(hours=n)))
+        db.session.commit()
+
+    body = client.get('/api/it/alerts?acknowledged=false&per_page=2', headers=headers).get_json()['data']
+    assert [a['title'] for a in body['alerts']] == ['alert 5', 'alert 3']
+    assert body['meta']['total'] == 3
+    cursor = body['meta']['next_cursor']
+    body = client.get(f'/api/it/alerts?acknowledged=false&per_page=2&cursor={cursor}', headers=headers).get_json()['data']
+    assert [a['title'] for a in body['alerts']] == ['alert 1']
+    assert body['meta']['next_cursor'] is None
@@ -0,0 +1,84 @@
+import gzip
+import json
+import os
+from datetime import date, datetime, timedelta
+
+from extensions import db
+from models.it_event import ITEvent, EventType, Severity
+from models.user import UserRole
+from utils.it_event_partitions import apply_retention, archive_month, stored_months, archive_path
+from tests.conftest import make_user, auth_headers
+
+
+def _add_event(n, timestamp, event_type=EventType.API_ERROR):
+    db.session.add(ITEvent(id=f'evt_{n}', timestamp=timestamp, event_type=event_type,
+                           severity=Severity.WARNING, summary=f'event {n}', stack_trace='Traceback ...'))
+
+
+def test_retention_archives_old_months_and_archive_is_queryable(app, client, tmp_path):
+    app.config['IT_EVENT_ARCHIVE_DIR'] = str(tmp_path)
+    with app.app_context():
+        headers = auth_headers(make_user('it@example.com', UserRole.IT))
+        for n, day in enumerate([date(2025, 1, 5), date(2025, 1, 20), date(2025, 2, 3), date(2025, 4, 1)]):
+            _add_event(n, datetime.combine(day, datetime.min.time()),
+                       EventType.FAILED_LOGIN if n == 1 else EventType.API_ERROR)
+        db.session.commit()
+
+        archived = apply_retention(2, str(tmp_path), today=date(2025, 4, 15))
+        assert archived == {'2025-01': 2, '2025-02': 1}
+        assert stored_months() == [date(2025, 4, 1)]
+        assert [e.id for e in ITEvent.query.all()] == ['evt_3']
+
+        with gzip.open(archive_path(str(tmp_path), date(2025, 1, 1)), 'rt') as archive:
+            rows = [json.loads(line) for line in archive]
+        assert [row['id'] for row in rows] == ['evt_0', 'evt_1']
+        assert rows[0]['stack_trace'] == 'Traceback ...'
+
+        # Archiving the same month again appends instead of overwriting
+        _add_event(9, datetime(2025, 1, 25))
+        db.session.commit()
+        assert apply_retention(2, str(tmp_path), today=date(2025, 4, 15)) == {'2025-01': 1}
+
+    response = client.get('/api/it/events/archive?start_month=2025-01&end_month=2025-02'
+                          '&event_type[]=api_error', headers=headers)
+    assert response.status_code == 200
+    events = response.get_json()['data']['events']
+    assert [e['id'] for e in events] == ['evt_0', 'evt_9', 'evt_2']
+    assert client.get('/api/it/events/archive?start_month=January', headers=headers).status_code == 400
+
+
+def test_archiving_keeps_events_committed_after_the_export(app, tmp_path, monkeypatch):
+    with app.app_context():
+        _add_event(0, datetime(2025, 1, 5))
+        db.session.commit()
+
+        replace = os.replace
+
+        def replace_then_log_late_event(source, target):
+            replace(source, target)
+            # An event for the same month lands after the export read the month
+            _add_event(1, datetime(2025, 1, 6))
+            db.session.flush()
+
+        monkeypatch.setattr(os, 'replace', replace_then_log_late_event)
+        assert archive_month(date(2025, 1, 1), str(tmp_path), batch_size=1) == 1
+        assert [e.id for e in ITEvent.query.all()] == ['evt_1']
+
+        monkeypatch.setattr(os, 'replace', replace)
+        assert archive_month(date(2025, 1, 1), str(tmp_path)) == 1
+        assert ITEvent.query.count() == 0
+        with gzip.open(archive_path(str(tmp_path), date(2025, 1, 1)), 'rt') as archive:
+            assert [json.loads(line)['id'] for line in archive] == ['evt_0', 'evt_1']
+
+
+def test_event_list_defaults_to_recent_events(app, client):
+    with app.app_context():
+        headers = auth_headers(make_user('it@example.com', UserRole.IT))
+        _add_event(1, datetime.utcnow() - timedelta(days=2))
+        _add_event(2, datetime.utcnow() - timedelta(days=200))
+        db.session.commit()
+
+    events = client.get('/api/it/events', headers=headers).get_json()['data']['events']
+    assert [e['id'] for e in events] == ['evt_1']
+    old = client.get('/api/it/events?start=2000-01-01T00:00:00', headers=headers).get_json()['data']['events']
+    assert {e['id'] for e in old} == {'evt_1', 'evt_2'}
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from extensions import db
+from models.it_event import ITEvent, EventType, Severity
+from models.user import UserRole
+from tests.conftest import make_user, auth_headers
+
+
+def _event(event_id, summary, server_logs=None, stack_trace=None):
+    return ITEvent(id=event_id, timestamp=datetime.utcnow(), event_type=EventType.API_ERROR,
+                   severity=Severity.WARNING, summary=summary, server_logs=server_logs, stack_trace=stack_trace)
+
+
+def test_search_ranks_matches_and_highlights_snippets(app, client):
+    with app.app_context():
+        headers = auth_headers(make_user('it@example.com', UserRole.IT))
+        db.session.add_all([
+            _event('evt_trace', 'API Error: Internal server error',
+                   stack_trace='Traceback: psycopg2.OperationalError: connection timeout'),
+            _event('evt_summary', 'Database connection timeout on <reports>'),
+            _event('evt_other', 'Failed login', server_logs='bad password'),
+        ])
+        db.session.commit()
+
+    body = client.get('/api/it/events?q=connection timeout', headers=headers).get_json()['data']
+    assert body['meta']['total'] == 2 and body['meta']['next_cursor'] is None
+    # Summary matches outrank stack-trace matches
+    assert [e['id'] for e in body['events']] == ['evt_summary', 'evt_trace']
+    snippet = body['events'][0]['snippet']
+    assert '<mark>connection</mark>' in snippet and '&lt;reports&gt;' in snippet
+
+    # Stemmed, and kept in sync when events change
+    assert [e['id'] for e in client.get('/api/it/events?q=passwords', headers=headers)
+            .get_json()['data']['events']] == ['evt_other']
+    with app.app_context():
+        ITEvent.query.filter_by(id='evt_other').delete()
+        db.session.commit()
+    assert client.get('/api/it/events?q=password', headers=headers).get_json()['data']['meta']['total'] == 0
+
+
+def test_search_treats_operators_as_text(app, client):
+    with app.app_context():
+        headers = auth_headers(make_user('it@example.com', UserRole.IT))
+        db.session.add(_event('evt_1', 'NEAR "quoted" OR * timeout'))
+        db.session.commit()
+
+    for q in ('"quoted" OR', 'NEAR(', '***'):
+        response = client.get('/api/it/events', query_string={'q': q}, headers=headers)
+        assert response.status_code == 200
+    assert client.get('/api/it/events', query_string={'q': '"quoted" OR'},
+                      headers=headers).get_json()['data']['meta']['total'] == 1
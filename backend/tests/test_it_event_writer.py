@@ -0,0 +1,91 @@
+import threading
+from datetime import datetime
+
+from extensions import db
+from models.it_alert import ITAlert
+from models.it_event import ITEvent, EventType, Severity
+from models.user import User, UserRole
+from utils.event_writer import EventWriter
+from utils.it_monitor import log_event
+from tests.conftest import make_user
+
+
+def test_events_are_written_in_the_background(app, client):
+    with app.app_context():
+        make_user('keeper@example.com', UserRole.STOREKEEPER)
+
+    for _ in range(6):
+        response = client.post('/api/auth/login', json={'email': 'keeper@example.com', 'password': 'wrong'})
+        assert response.status_code == 401
+    writer = app.extensions['it_event_writer']
+    assert writer.flush()
+
+    with app.app_context():
+        assert ITEvent.query.filter_by(event_type=EventType.FAILED_LOGIN).count() == 6
+        # Rules still run once the batch is stored
+        assert ITAlert.query.count() >= 1
+    metrics = writer.metrics()
+    assert metrics['written'] == 6 and metrics['dropped'] == 0 and metrics['queue_depth'] == 0
+
+
+def test_log_event_does_not_commit_the_callers_session(app):
+    with app.test_request_context('/api/anything'):
+        db.session.add(User(email='pending@example.com', name='Pending', role=UserRole.SELLER))
+        log_event(EventType.CONFIG_CHANGE, Severity.INFO, summary='changed')
+        db.session.rollback()
+        assert app.extensions['it_event_writer'].flush()
+        assert User.query.filter_by(email='pending@example.com').count() == 0
+        assert ITEvent.query.filter_by(event_type=EventType.CONFIG_CHANGE).one().resource == '/api/anything'
+
+
+class _StalledWriter(EventWriter):
+    """Writer whose first flush waits until released, so the queue can fill up."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.release = threading.Event()
+
+    def _write(self, batch):
+        self.release.wait(5)
+        super()._write(batch)
+
+
+def test_full_queue_drops_and_reports_it(app):
+    writer = _StalledWriter(app, maxsize=2, batch_size=1, flush_interval=0.05)
+    row = {column.name: None for column in ITEvent.__table__.columns}
+    row.update(event_type=EventType.LOGOUT, severity=Severity.INFO, summary='logout', occurrence_count=1,
+               timestamp=datetime.utcnow())
+
+    accepted = [writer.submit(dict(row, id=f'evt_{i}')) for i in range(6)]
+    metrics = writer.metrics()
+    assert metrics['dropped'] == accepted.count(False) >= 3
+    assert metrics['queue_depth'] <= 2
+
+    writer.release.set()
+    assert writer.flush()
+    writer.stop()
+    assert writer.metrics()['written'] == accepted.count(True)
+
+
+def test_counters_add_up_under_concurrent_submits(app):
+    writer = _StalledWriter(app, maxsize=50, batch_size=1, flush_interval=0.05)
+    row = {column.name: None for column in ITEvent.__table__.columns}
+    row.update(event_type=EventType.LOGOUT, severity=Severity.INFO, summary='logout', occurrence_count=1,
+               timestamp=datetime.utcnow())
+
+    def submit_many(start):
+        for i in range(200):
+            writer.submit(dict(row, id=f'evt_{start}_{i}'))
+
+    threads = [threading.Thread(target=submit_many, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    metrics = writer.metrics()
+    assert metrics['enqueued'] + metrics['dropped'] == 8 * 200
+    writer.release.set()
+    assert writer.flush()
+    writer.stop()
+    assert writer.metrics()['written'] == writer.metrics()['enqueued']
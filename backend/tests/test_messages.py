@@ -0,0 +1,72 @@
+from extensions import db
+from models.message import Message
+from models.user import UserRole
+from tests.conftest import make_user, auth_headers, count_queries
+
+
+def _inbox(client, headers, per_page):
+    messages, cursor, pages = [], None, 0
+    while True:
+        url = f'/api/messages?per_page={per_page}' + (f'&cursor={cursor}' if cursor else '')
+        with count_queries() as statements:
+            data = client.get(url, headers=headers).get_json()['data']
+        messages.extend(data['messages'])
+        pages += 1
+        # at most the auth user lookup + page + senders + recipients, whatever the page size
+        assert len([s for s in statements if 'FROM message' in s or 'FROM user' in s]) <= 4
+        cursor = data['meta']['next_cursor']
+        if not cursor:
+            return messages, pages
+
+
+def test_inbox_pages_by_cursor_with_senders_preloaded(app, client):
+    with app.app_context():
+        ceo = make_user('ceo@example.com', UserRole.CEO)
+        seller = make_user('seller@example.com', UserRole.SELLER)
+        other = make_user('other@example.com', UserRole.DRIVER)
+        for i in range(7):
+            db.session.add(Message(sender_id=ceo.id, message=f'role {i}', recipient_role=UserRole.SELLER))
+            db.session.add(Message(sender_id=ceo.id, message=f'direct {i}', recipient_id=seller.id))
+            db.session.add(Message(sender_id=ceo.id, message=f'other {i}', recipient_id=other.id))
+        db.session.commit()
+        headers = auth_headers(seller)
+        db.session.remove()
+
+        messages, pages = _inbox(client, headers, per_page=4)
+    assert pages == 4
+    assert len(messages) == 14
+    assert len({m['id'] for m in messages}) == 14
+    assert all(m['sender_name'] == 'ceo' for m in messages)
+    assert {m['recipient_name'] for m in messages} == {'All Sellers', 'seller'}
+    keys = [(m['created_at'], m['id']) for m in messages]
+    assert keys == sorted(keys, reverse=True)
+    assert client.get('/api/messages?cursor=nope', headers=headers).status_code == 400
+
+
+def test_unread_count_follows_sends_reads_and_clears(app, client):
+    with app.app_context():
+        ceo = make_user('ceo@example.com', UserRole.CEO)
+        seller = make_user('seller@example.com', UserRole.SELLER)
+        ceo_headers, seller_headers = auth_headers(ceo), auth_headers(seller)
+        seller_id = seller.id
+
+    def unread(headers):
+        with app.app_context(), count_queries() as statements:
+            response = client.get('/api/messages/unread-count', headers=headers)
+        assert [s for s in statements if 'message' in s] == [s for s in statements if 'FROM message_counter' in s]
+        return response.get_json()['data']['unread']
+
+    client.post('/api/messages', json={'message': 'to sellers', 'recipient_role': 'seller'}, headers=ceo_headers)
+    client.post('/api/messages', json={'message': 'to you', 'recipient_id': seller_id}, headers=ceo_headers)
+    both = client.post('/api/messages', json={'message': 'both', 'recipient_id': seller_id, 'recipient_role': 'seller'},
+                       headers=ceo_headers).get_json()['data']
+    assert unread(seller_headers) == 3
+    assert unread(ceo_headers) == 0
+
+    assert client.put(f"/api/messages/{both['id']}", headers=seller_headers).status_code == 200
+    assert unread(seller_headers) == 2
+
+    assert client.delete('/api/messages/clear', headers=ceo_headers).status_code == 200
+    assert unread(seller_headers) == 0
+    client.post('/api/messages', json={'message': 'again', 'recipient_role': 'seller'}, headers=ceo_headers)
+    assert unread(seller_headers) == 1
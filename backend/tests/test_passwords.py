@@ -0,0 +1,33 @@
+from werkzeug.security import generate_password_hash
+
+from extensions import db
+from models.user import User, UserRole
+from utils.passwords import MIN_ITERATIONS, needs_rehash, target_iterations
+from tests.conftest import make_user
+
+
+def test_login_upgrades_weaker_hashes(app, client):
+    app.config['PASSWORD_HASH_ITERATIONS'] = MIN_ITERATIONS + 10000
+    with app.app_context():
+        user = make_user('keeper@example.com', UserRole.STOREKEEPER)
+        user.password_hash = generate_password_hash('Secret123', 'pbkdf2:sha256:1000')
+        db.session.commit()
+
+    assert client.post('/api/auth/login', json={'email': 'keeper@example.com', 'password': 'Secret123'}).status_code == 200
+    with app.app_context():
+        stored = User.query.filter_by(email='keeper@example.com').one().password_hash
+        assert stored.startswith(f'pbkdf2:sha256:{MIN_ITERATIONS + 10000}$')
+        assert not needs_rehash(stored)
+    assert client.post('/api/auth/login', json={'email': 'keeper@example.com', 'password': 'Secret123'}).status_code == 200
+    assert client.post('/api/auth/login', json={'email': 'keeper@example.com', 'password': 'wrong'}).status_code == 401
+
+
+def test_iterations_are_fixed_with_a_floor_and_scrypt_is_kept(app):
+    with app.app_context():
+        app.config['PASSWORD_HASH_ITERATIONS'] = 1000
+        assert target_iterations() == MIN_ITERATIONS
+        app.config['PASSWORD_HASH_ITERATIONS'] = MIN_ITERATIONS
+        assert not needs_rehash('scrypt:32768:8:1$salt$hash')
+        assert needs_rehash('pbkdf2:sha1:1000000$salt$hash')
+        assert needs_rehash(f'pbkdf2:sha256:{MIN_ITERATIONS - 1}$salt$hash')
+        assert not needs_rehash(f'pbkdf2:sha256:{MIN_ITERATIONS}$salt$hash')
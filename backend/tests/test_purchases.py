@@ -0,0 +1,184 @@
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+from extensions import db
+from models.purchases import Purchase
+from models.user import UserRole
+from resources.purchases import (
+    purchase_rows_query, parse_purchase_filters, apply_purchase_filters, order_purchase_query
+)
+from tests.conftest import make_user, auth_headers, count_queries
+
+# auth user lookup + COUNT(*) + one joined page query
+MAX_LIST_STATEMENTS = 3
+# one user identity lookup (shared and cached) + user by email + one purchase query
+MAX_BY_EMAIL_STATEMENTS = 3
+
+
+def _add_purchases(purchasers, count):
+    start = date(2025, 1, 1)
+    for i in range(count):
+        db.session.add(Purchase(
+            purchaser_id=purchasers[i % len(purchasers)].id,
+            employee_name='Emp',
+            fruit_type='Mango' if i % 2 else 'Avocado',
+            quantity='10',
+            unit='kg',
+            buyer_name=f'Buyer {i}',
+            cost=str(100 + i),
+            purchase_date=start + timedelta(days=i),
+            amount_per_kg='10'
+        ))
+    db.session.commit()
+
+
+def _list_statement_count(app, client, n_purchases):
+    with app.app_context():
+        ceo = make_user(f'ceo{n_purchases}@example.com')
+        purchasers = [make_user(f'p{n_purchases}_{i}@example.com', UserRole.PURCHASER) for i in range(5)]
+        _add_purchases(purchasers, n_purchases)
+        headers = auth_headers(ceo)
+        db.session.remove()
+        with count_queries() as statements:
+            response = client.get(f'/api/purchases?per_page={n_purchases}', headers=headers)
+    assert response.status_code == 200
+    items = response.get_json()['data']['items']
+    assert len(items) == n_purchases
+    assert all(item['purchaserEmail'] for item in items)
+    return len(statements)
+
+
+def test_purchase_list_statement_count_is_constant(app, client):
+    assert _list_statement_count(app, client, 5) <= MAX_LIST_STATEMENTS
+    assert _list_statement_count(app, client, 40) <= MAX_LIST_STATEMENTS
+
+
+def _by_email_statement_count(app, client, n_purchases):
+    email = f'buyer{n_purchases}@example.com'
+    with app.app_context():
+        purchaser = make_user(email, UserRole.PURCHASER)
+        _add_purchases([purchaser], n_purchases)
+        headers = auth_headers(purchaser)
+        db.session.remove()
+        with count_queries() as statements:
+            response = client.get(f'/api/purchases/by-email?email={email}', headers=headers)
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    assert len(data) == n_purchases
+    assert {item['purchaserEmail'] for item in data} == {email}
+    return len(statements)
+
+
+def test_purchases_by_email_statement_count_is_constant(app, client):
+    small = _by_email_statement_count(app, client, 3)
+    assert small <= MAX_BY_EMAIL_STATEMENTS
+    assert _by_email_statement_count(app, client, 30) == small
+
+
+def _query_plan(query):
+    statement = query.statement.compile(db.engine, compile_kwargs={"literal_binds": True})
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {statement}")).fetchall()
+    return ' | '.join(row[-1] for row in rows)
+
+
+def test_common_purchase_filters_use_indexes(app):
+    cases = [
+        ({'fruit_type': 'Mango'}, 'ix_purchase_fruit_type_purchase_date'),
+        ({'fruit_type': 'Mango', 'start_date': '2025-01-05'}, 'ix_purchase_fruit_type_purchase_date'),
+        ({'purchaser_id': '1', 'end_date': '2025-02-01'}, 'ix_purchase_purchaser_id_purchase_date'),
+        ({'start_date': '2025-01-01', 'end_date': '2025-01-31'}, 'ix_purchase_purchase_date'),
+        ({}, 'ix_purchase_purchase_date'),
+    ]
+    with app.app_context():
+        purchaser = make_user('indexed@example.com', UserRole.PURCHASER)
+        _add_purchases([purchaser], 50)
+        for args, index_name in cases:
+            filters, error = parse_purchase_filters(args)
+            assert error is None
+            query = order_purchase_query(apply_purchase_filters(purchase_rows_query(), filters), filters)
+            plan = _query_plan(query.limit(20))
+            assert index_name in plan, (args, plan)
+            assert 'USE TEMP B-TREE' not in plan, (args, plan)
+
+
+def test_purchase_list_filters_and_sorting(app, client):
+    with app.app_context():
+        ceo = make_user('ceo@example.com')
+        purchasers = [make_user(f'f{i}@example.com', UserRole.PURCHASER) for i in range(2)]
+        _add_purchases(purchasers, 20)
+        headers = auth_headers(ceo)
+
+    response = client.get(
+        '/api/purchases?fruit_type=Mango&purchaser=f1@example.com&min_cost=105'
+        '&sort_by=amount&order=asc', headers=headers)
+    assert response.status_code == 200
+    body = response.get_json()['data']
+    items = body['items']
+    assert body['meta']['total'] == len(items) == 8
+    assert all(item['fruitType'] == 'Mango' for item in items)
+    assert all(item['purchaserEmail'] == 'f1@example.com' for item in items)
+    assert [float(item['amount']) for item in items] == sorted(float(item['amount']) for item in items)
+    assert float(items[0]['amount']) >= 105
+
+    response = client.get('/api/purchases?start_date=2025-01-03&end_date=2025-01-05', headers=headers)
+    assert [item['date'] for item in response.get_json()['data']['items']] == ['2025-01-05', '2025-01-04', '2025-01-03']
+
+    assert client.get('/api/purchases?sort_by=password', headers=headers).status_code == 400
+    assert client.get('/api/purchases?start_date=yesterday', headers=headers).status_code == 400
+
+
+def test_purchase_summary_is_aggregated_and_cached(app, client):
+    with app.app_context():
+        ceo = make_user('ceo@example.com')
+        purchasers = [make_user(f's{i}@example.com', UserRole.PURCHASER) for i in range(2)]
+        _add_purchases(purchasers, 10)
+        headers = auth_headers(ceo)
+        purchaser_headers = auth_headers(purchasers[0])
+
+        with count_queries() as first:
+            response = client.get('/api/purchases/summary?breakdown=month,purchaser', headers=headers)
+        summary = response.get_json()['data']
+        assert summary['total_cost'] == sum(100 + i for i in range(10))
+        assert {f['fruit_type']: f['count'] for f in summary['cost_by_fruit']} == {'Mango': 5, 'Avocado': 5}
+        assert summary['cost_by_month'] == [{'month': '2025-01', 'total_cost': summary['total_cost'], 'count': 10}]
+        assert sorted(p['purchaser_email'] for p in summary['cost_by_purchaser']) == ['s0@example.com', 's1@example.com']
+        assert sum('purchase' in s for s in first) == 3
+
+        with count_queries() as second:
+            client.get('/api/purchases/summary?breakdown=purchaser,month', headers=headers)
+        assert not any('purchase' in s for s in second)
+
+        response = client.post('/api/purchases', headers=purchaser_headers, json={
+            'employeeName': 'Emp', 'fruitType': 'Kiwi', 'quantity': '3', 'unit': 'kg',
+            'buyerName': 'B', 'amount': 50, 'date': '2025-03-01', 'amountPerKg': 5
+        })
+        assert response.status_code == 201
+        assert response.get_json()['data']['purchaserEmail'] == 's0@example.com'
+
+    summary = client.get('/api/purchases/summary', headers=headers).get_json()['data']
+    assert summary['total_cost'] == sum(100 + i for i in range(10)) + 50
+    assert 'cost_by_month' not in summary
+    assert client.get('/api/purchases/summary?breakdown=weekday', headers=headers).status_code == 400
+
+
+def test_purchase_summary_skips_costs_that_are_not_numbers(app, client):
+    from sqlalchemy.dialects import postgresql
+    from utils.helpers import numeric_text
+
+    with app.app_context():
+        purchaser = make_user('p@example.com', UserRole.PURCHASER)
+        _add_purchases([purchaser], 2)
+        for cost in ('n/a', ' 12.5 ', '1e2'):
+            db.session.add(Purchase(purchaser_id=purchaser.id, employee_name='Emp', fruit_type='Kiwi', quantity='1',
+                                    unit='kg', buyer_name='B', cost=cost, purchase_date=date(2025, 2, 1),
+                                    amount_per_kg='1'))
+        db.session.commit()
+        headers = auth_headers(make_user('ceo@example.com'))
+
+    summary = client.get('/api/purchases/summary', headers=headers).get_json()['data']
+    assert summary['total_cost'] == 100 + 101 + 12.5 + 100
+    assert {f['fruit_type']: f['count'] for f in summary['cost_by_fruit']}['Kiwi'] == 3
+    # On PostgreSQL the cast only runs behind the numeric check
+    compiled = str(numeric_text(Purchase.cost).compile(dialect=postgresql.dialect()))
+    assert compiled.startswith('CASE WHEN (purchase.cost ~ ') and 'CAST(trim(purchase.cost) AS FLOAT)' in compiled
@@ -0,0 +1,95 @@
+from extensions import db
+from models.receipt import Receipt
+from models.receipt_item import ReceiptItem
+from models.user import UserRole
+from tests.conftest import make_user, auth_headers, count_queries
+
+
+def _payload(num, items, **overrides):
+    payload = {
+        'invoiceNum': num,
+        'seller': {'name': 'Ryanmart', 'address': 'Nairobi', 'phone': '0700'},
+        'buyer': {'name': 'Jane Doe', 'contact': '0711'},
+        'date': '2025-03-01',
+        'payment': 'mpesa',
+        'items': items,
+        'subtotal': 100, 'discount': 0, 'finalTotal': 100
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_receipt_items_are_stored_as_rows(app, client):
+    with app.app_context():
+        headers = auth_headers(make_user('seller@example.com', UserRole.SELLER))
+
+    items = [
+        {'fruit': 'Mango', 'description': 'Ripe', 'quantity': '3', 'unitPrice': '20', 'total': 60},
+        {'fruit': 'Avocado', 'description': '', 'quantity': 2, 'unitPrice': 20, 'total': '40'},
+    ]
+    assert client.post('/api/receipts', json=_payload('R-1', items), headers=headers).status_code == 200
+
+    with app.app_context():
+        db.session.remove()
+        with count_queries() as statements:
+            response = client.get('/api/receipts/R-1')
+        assert response.get_json()['data']['items'] == [
+            {'fruit': 'Mango', 'description': 'Ripe', 'quantity': 3.0, 'unitPrice': 20.0, 'total': 60.0},
+            {'fruit': 'Avocado', 'description': None, 'quantity': 2.0, 'unitPrice': 20.0, 'total': 40.0},
+        ]
+        # The receipt, then its items in one query
+        assert len(statements) == 2
+
+        # Item-level lookups are plain indexed queries now
+        mango_receipts = db.session.query(Receipt.receipt_num).join(ReceiptItem).filter(
+            ReceiptItem.fruit == 'Mango').all()
+        assert mango_receipts == [('R-1',)]
+
+        db.session.delete(Receipt.query.filter_by(receipt_num='R-1').one())
+        db.session.commit()
+        assert ReceiptItem.query.count() == 0
+
+
+def test_receipt_search_filters_pages_and_totals_by_payment(app, client):
+    with app.app_context():
+        headers = auth_headers(make_user('seller@example.com', UserRole.SELLER))
+
+    buyers = [('Jane Doe', '0711'), ('John Smith', '0722'), ('Janet Roe', '0733')]
+    for i in range(9):
+        name, contact = buyers[i % 3]
+        payload = _payload(f'R-{i}', [{'fruit': 'Mango', 'quantity': 1, 'unitPrice': 10, 'total': 10}],
+                           buyer={'name': name, 'contact': contact}, date=f'2025-03-0{1 + i}',
+                           payment='cash' if i % 2 else 'mpesa', finalTotal=10 * (i + 1))
+        assert client.post('/api/receipts', json=payload, headers=headers).status_code == 200
+
+    items, cursor = [], None
+    while True:
+        url = '/api/receipts/search?q=jan&per_page=2' + (f'&cursor={cursor}' if cursor else '')
+        data = client.get(url, headers=headers).get_json()['data']
+        items.extend(data['items'])
+        cursor = data['meta']['next_cursor']
+        if not cursor:
+            break
+    assert [item['receiptNum'] for item in items] == ['R-8', 'R-6', 'R-5', 'R-3', 'R-2', 'R-0']
+    assert data['meta']['total'] == 6
+    assert data['totals_by_payment'] == [
+        {'payment': 'cash', 'count': 2, 'total': 100.0},
+        {'payment': 'mpesa', 'count': 4, 'total': 200.0},
+    ]
+
+    data = client.get('/api/receipts/search?q=0722&payment=cash&start_date=2025-03-02&end_date=2025-03-05',
+                      headers=headers).get_json()['data']
+    assert [item['receiptNum'] for item in data['items']] == ['R-1']
+    assert data['totals_by_payment'] == [{'payment': 'cash', 'count': 1, 'total': 20.0}]
+
+    assert client.get('/api/receipts/search?start_date=03/01/2025', headers=headers).status_code == 400
+    assert client.get('/api/receipts/search?cursor=nope', headers=headers).status_code == 400
+    assert client.get('/api/receipts/R-404').status_code == 404
+
+    # Wildcards in q are matched literally
+    assert client.get('/api/receipts/search?q=%25', headers=headers).get_json()['data']['items'] == []
+    assert client.get('/api/receipts/search?q=J_n', headers=headers).get_json()['data']['items'] == []
+
+    with app.app_context():
+        driver_headers = auth_headers(make_user('driver@example.com', UserRole.DRIVER))
+    assert client.get('/api/receipts/search?q=jan', headers=driver_headers).status_code == 403
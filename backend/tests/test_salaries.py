@@ -0,0 +1,72 @@
+from datetime import date
+
+from extensions import db
+from models.salary import Salary
+from models.user import UserRole
+from tests.conftest import make_user, auth_headers, count_queries
+
+
+def _add_salaries(users, count):
+    for i in range(count):
+        db.session.add(Salary(user_id=users[i % len(users)].id, amount=100 + i,
+                              date=date(2025, 1 + i % 3, 1 + i), is_paid=i % 2 == 0))
+    db.session.commit()
+
+
+def test_salary_history_pages_with_users_joined(app, client):
+    with app.app_context():
+        ceo = make_user('ceo@example.com', UserRole.CEO)
+        staff = [make_user(f's{i}@example.com', UserRole.SELLER) for i in range(3)]
+        _add_salaries(staff, 7)
+        headers = auth_headers(ceo)
+        db.session.remove()
+
+        items, cursor, page_statements = [], None, []
+        while True:
+            url = '/api/salaries?per_page=3' + (f'&cursor={cursor}' if cursor else '')
+            with count_queries() as statements:
+                data = client.get(url, headers=headers).get_json()['data']
+            page_statements.append(len([s for s in statements if 'FROM salaries' in s]))
+            items.extend(data['items'])
+            cursor = data['meta']['next_cursor']
+            if not cursor:
+                break
+    assert data['meta']['total'] == 7
+    # COUNT + one page query joined to users, whatever the page size
+    assert page_statements == [2, 2, 2]
+    assert len({item['id'] for item in items}) == 7
+    assert all(item['user_email'].endswith('@example.com') for item in items)
+    keys = [(item['date'], item['id']) for item in items]
+    assert keys == sorted(keys, reverse=True)
+
+    one = client.get('/api/salaries?user_id=%d' % items[0]['user_id'], headers=headers).get_json()['data']
+    assert {item['user_id'] for item in one['items']} == {items[0]['user_id']}
+    assert client.get(f"/api/salaries/{items[0]['id']}", headers=headers).get_json()['data'] == items[0]
+
+
+def test_monthly_payroll_is_shared_with_the_dashboard(app, client):
+    with app.app_context():
+        ceo = make_user('ceo@example.com', UserRole.CEO)
+        staff = [make_user(f's{i}@example.com', UserRole.SELLER) for i in range(2)]
+        _add_salaries(staff, 6)
+        headers = auth_headers(ceo)
+        seller_headers = auth_headers(staff[1])
+        staff_id = staff[0].id
+
+    payroll = client.get('/api/salaries/monthly', headers=headers).get_json()['data']
+    assert [row['month'] for row in payroll] == ['2025-01', '2025-02', '2025-03']
+    january = payroll[0]
+    # Salaries 0 (paid) and 3 (unpaid)
+    assert (january['total'], january['paid'], january['unpaid']) == (203.0, 100.0, 103.0)
+    assert (january['payments'], january['employees']) == (2, 2)
+
+    assert client.get('/api/ceo/dashboard', headers=seller_headers).status_code == 403
+    dashboard = client.get('/api/ceo/dashboard', headers=headers).get_json()['data']
+    assert dashboard['payroll'] == payroll
+    assert [m['salaries'] for m in dashboard['monthlyData'][:4]] == [203.0, 205.0, 207.0, 0.0]
+
+    # Recording a payment drops the cached rollup
+    client.post('/api/salaries', json={'user_id': staff_id, 'amount': 50, 'date': '2025-04-15'}, headers=headers)
+    payroll = client.get('/api/salaries/monthly', headers=headers).get_json()['data']
+    assert payroll[-1] == {'month': '2025-04', 'total': 50.0, 'paid': 0.0, 'unpaid': 50.0,
+                           'payments': 1, 'employees': 1}
@@ -0,0 +1,69 @@
+from datetime import date
+
+from extensions import db
+from models.seller_fruit import SellerFruit
+from models.user import UserRole
+from tests.conftest import make_user, auth_headers, count_queries
+
+
+def _add_fruits(sellers, count):
+    for i in range(count):
+        db.session.add(SellerFruit(stock_name=f'Stock {i % 2}', fruit_name='Mango', qty=1, unit_price=10, amount=10,
+                                   date=date(2025, 3, 1 + i % 3), customer_name='Jane Doe' if i % 4 == 0 else None,
+                                   created_by=sellers[i % len(sellers)].id))
+    db.session.commit()
+
+
+def _walk(client, headers, query=''):
+    items, cursor, statements_per_page = [], None, []
+    while True:
+        url = f'/api/seller-fruits?per_page=4{query}' + (f'&cursor={cursor}' if cursor else '')
+        with count_queries() as statements:
+            body = client.get(url, headers=headers).get_json()
+        statements_per_page.append(len([s for s in statements if 'seller_fruits' in s]))
+        items.extend(body['items'])
+        cursor = body['meta']['next_cursor']
+        if not cursor:
+            return items, body['meta'], statements_per_page
+
+
+def test_sellers_page_through_their_own_rows_with_creators_joined(app, client):
+    with app.app_context():
+        sellers = [make_user(f's{i}@example.com', UserRole.SELLER) for i in range(2)]
+        _add_fruits(sellers, 20)
+        headers = auth_headers(sellers[0])
+        db.session.remove()
+
+        items, meta, statements_per_page = _walk(client, headers)
+    assert meta['total'] == 10
+    assert len({item['id'] for item in items}) == 10
+    assert {item['creator_email'] for item in items} == {'s0@example.com'}
+    keys = [(item['date'], item['id']) for item in items]
+    assert keys == sorted(keys, reverse=True)
+    # COUNT + one joined page query per page
+    assert statements_per_page == [2, 2, 2]
+
+
+def test_ceo_sees_every_seller_and_filters_apply(app, client):
+    with app.app_context():
+        sellers = [make_user(f's{i}@example.com', UserRole.SELLER) for i in range(2)]
+        _add_fruits(sellers, 12)
+        headers = auth_headers(make_user('boss@example.com', UserRole.CEO))
+
+        items, meta, _ = _walk(client, headers)
+        assert meta['total'] == 12
+        assert {item['creator_email'] for item in items} == {'s0@example.com', 's1@example.com'}
+
+        items, _, _ = _walk(client, headers, '&date=2025-03-02&stock_name=Stock 1')
+        assert {(item['date'], item['stock_name']) for item in items} == {('2025-03-02', 'Stock 1')}
+        assert len(items) == 2
+
+        items, _, _ = _walk(client, headers, '&customer_name=jane&start_date=2025-03-01&end_date=2025-03-02')
+        assert len(items) == 2 and {item['customer_name'] for item in items} == {'Jane Doe'}
+
+        # Wildcards in customer_name are matched literally
+        assert _walk(client, headers, '&customer_name=J_ne')[0] == []
+        assert _walk(client, headers, '&customer_name=%25')[0] == []
+
+    assert client.get('/api/seller-fruits?date=03/01/2025', headers=headers).status_code == 400
+    assert client.get('/api/seller-fruits?cursor=nope', headers=headers).status_code == 400
@@ -0,0 +1,55 @@
+from extensions import db
+from models.seller_fruit import SellerFruit
+from models.user import UserRole
+from tests.conftest import make_user, auth_headers, count_queries
+
+
+def _item(i, **overrides):
+    item = {'stock_name': 'Stock A', 'fruit_name': 'Mango', 'qty': str(1 + i), 'unit_price': 20,
+            'date': '2025-03-01', 'amount': 20 * (1 + i)}
+    item.update(overrides)
+    return item
+
+
+def test_bulk_insert_coerces_and_serializes_without_lazy_loads(app, client):
+    with app.app_context():
+        seller = make_user('seller@example.com', UserRole.SELLER)
+        headers = auth_headers(seller)
+        seller_id = seller.id
+
+        with count_queries() as statements:
+            response = client.post('/api/seller-fruits/bulk', json={'items': [_item(i) for i in range(2500)]},
+                                   headers=headers)
+        assert response.status_code == 201
+        created = response.get_json()
+        assert [fruit['qty'] for fruit in created[:3]] == [1.0, 2.0, 3.0]
+        assert {fruit['creator_email'] for fruit in created} == {'seller@example.com'}
+        assert created[0]['date'] == '2025-03-01'
+        # The request's own user lookup at most; none per row while serializing
+        assert len([s for s in statements if 'FROM user' in s]) <= 1
+
+        stored = {fruit.id: fruit for fruit in SellerFruit.query.all()}
+        assert len(stored) == 2500
+        assert all(stored[fruit['id']].qty == fruit['qty'] for fruit in created)
+        assert {fruit.created_by for fruit in stored.values()} == {seller_id}
+        # Same shape as the listing's serializer
+        assert created[0] == stored[created[0]['id']].to_dict()
+
+
+def test_bulk_insert_reports_every_invalid_item_and_saves_nothing(app, client):
+    with app.app_context():
+        headers = auth_headers(make_user('seller@example.com', UserRole.SELLER))
+
+    items = [_item(0), _item(1, qty='lots'), _item(2, date='01/03/2025', stock_name=''), _item(3, amount=-5),
+             _item(4, qty='inf', amount='NaN')]
+    response = client.post('/api/seller-fruits/bulk', json={'items': items}, headers=headers)
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body['errors'] == [
+        {'index': 1, 'errors': ['qty must be a valid number']},
+        {'index': 2, 'errors': ['stock_name is required', 'date is required as YYYY-MM-DD']},
+        {'index': 3, 'errors': ['amount must be a positive number']},
+        {'index': 4, 'errors': ['qty must be a finite number', 'amount must be a finite number']},
+    ]
+    with app.app_context():
+        assert SellerFruit.query.count() == 0
@@ -0,0 +1,129 @@
+import io
+
+import openpyxl
+
+from extensions import db
+from models.inventory import Inventory
+from models.stock_movement import StockMovement
+from models.user import UserRole
+from utils.stock_ledger import balance_at
+from tests.conftest import make_user, auth_headers, count_queries
+
+
+def _upload(client, headers, kind, filename, content, dry_run=False):
+    url = f'/api/stock-import/{kind}' + ('?dry_run=true' if dry_run else '')
+    return client.post(url, headers=headers, content_type='multipart/form-data',
+                       data={'file': (io.BytesIO(content), filename)})
+
+
+def _csv(lines):
+    return ('\n'.join(lines) + '\n').encode()
+
+
+def test_inventory_stock_take_csv(app, client):
+    with app.app_context():
+        keeper = make_user('keeper@example.com', UserRole.STOREKEEPER)
+        headers = auth_headers(keeper)
+    client.post('/api/inventory', headers=headers, json={
+        'name': 'Cold room A', 'quantity': '10', 'fruit_type': 'Mango', 'unit': 'kg'})
+
+    content = _csv([
+        'Name,Fruit Type,Quantity,Unit,Location',
+        'cold room a,Mango,25,kg,',
+        'Shelf B,Avocado,40,kg,Back store',
+        'Shelf C,,5,kg,',
+        'Shelf D,Kiwi,lots,kg,',
+    ])
+    response = _upload(client, headers, 'inventory', 'take.csv', content, dry_run=True)
+    assert response.status_code == 200
+    report = response.get_json()['data']
+    assert (report['rows'], report['imported'], report['failed']) == (4, 2, 2)
+    assert [e['row'] for e in report['errors']] == [4, 5]
+    with app.app_context():
+        assert Inventory.query.count() == 1
+
+    report = _upload(client, headers, 'inventory', 'take.csv', content).get_json()['data']
+    assert report['imported'] == 2
+    with app.app_context():
+        room = Inventory.query.filter_by(name='Cold room A').one()
+        shelf = Inventory.query.filter_by(name='Shelf B').one()
+        assert (room.quantity, shelf.quantity, shelf.location) == (25, 40, 'Back store')
+        assert balance_at(room.id, room.created_at.date())[0] == 25
+        assert StockMovement.query.filter_by(inventory_id=shelf.id).one().quantity == 40
+
+
+def test_movement_import_batches_and_keeps_balances(app, client):
+    with app.app_context():
+        keeper = make_user('keeper@example.com', UserRole.STOREKEEPER)
+        headers = auth_headers(keeper)
+    for name in ('Room A', 'Room B'):
+        client.post('/api/inventory', headers=headers, json={
+            'name': name, 'quantity': '0', 'fruit_type': 'Mango', 'unit': 'kg'})
+
+    lines = ['inventory,movement_type,quantity,date,notes']
+    for i in range(2500):
+        lines.append(f"{'Room A' if i % 2 else 'Room B'},in,2,2025-01-{1 + i % 28:02d},batch")
+    lines.append('Room Z,in,2,2025-01-01,')
+    lines.append('Room A,teleport,2,2025-01-01,')
+
+    with app.app_context():
+        with count_queries() as statements:
+            response = _upload(client, headers, 'movements', 'moves.csv', _csv(lines))
+    assert response.status_code == 200
+    report = response.get_json()['data']
+    assert (report['rows'], report['imported'], report['failed']) == (2502, 2500, 2)
+    assert "Room Z" in report['errors'][0]['error']
+    # Statements grow with the number of batches, not rows
+    assert len(statements) < 40
+
+    with app.app_context():
+        room_a = Inventory.query.filter_by(name='Room A').one()
+        assert room_a.quantity == 2500
+        assert StockMovement.query.filter_by(inventory_id=room_a.id).count() == 1250
+        latest = StockMovement.query.order_by(StockMovement.id.desc()).first()
+        assert latest.remaining_stock == db.session.get(Inventory, latest.inventory_id).quantity
+
+
+def test_movement_import_xlsx_and_bad_files(app, client):
+    with app.app_context():
+        keeper = make_user('keeper@example.com', UserRole.STOREKEEPER)
+        headers = auth_headers(keeper)
+    created = client.post('/api/inventory', headers=headers, json={
+        'name': 'Room A', 'quantity': '50', 'fruit_type': 'Mango', 'unit': 'kg'}).get_json()['data']
+
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(['inventory_id', 'movement_type', 'quantity', 'date'])
+    sheet.append([created['id'], 'sale', 20, '2025-02-01'])
+    sheet.append([created['id'], 'spoilage', 5, '2025-02-02'])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    report = _upload(client, headers, 'movements', 'moves.xlsx', buffer.getvalue()).get_json()['data']
+    assert report['imported'] == 2
+    with app.app_context():
+        assert db.session.get(Inventory, created['id']).quantity == 25
+
+    assert _upload(client, headers, 'movements', 'moves.txt', b'x').status_code == 400
+    assert _upload(client, headers, 'movements', 'moves.csv', _csv(['inventory,quantity', 'Room A,1'])).status_code == 400
+    assert _upload(client, headers, 'suppliers', 'moves.csv', _csv(['a', 'b'])).status_code == 400
+
+
+def test_unreadable_tail_keeps_saved_batches_and_says_so(app, client):
+    with app.app_context():
+        keeper = make_user('keeper@example.com', UserRole.STOREKEEPER)
+        headers = auth_headers(keeper)
+    client.post('/api/inventory', headers=headers, json={
+        'name': 'Room A', 'quantity': '0', 'fruit_type': 'Mango', 'unit': 'kg'})
+
+    lines = ['inventory,movement_type,quantity,date'] + ['Room A,in,1,2025-01-01'] * 2500
+    response = _upload(client, headers, 'movements', 'moves.csv', _csv(lines) + b'Room A,in,1,\xff\xfe\n')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['success'] is False
+    report = body['data']
+    assert report['complete'] is False
+    assert report['imported'] == 2000
+    assert 'Save it as UTF-8' in report['error'] and '2000 rows' in report['error']
+    with app.app_context():
+        assert Inventory.query.filter_by(name='Room A').one().quantity == 2000
@@ -0,0 +1,85 @@
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+from extensions import db
+from models.inventory import Inventory
+from models.stock_movement import StockMovement
+from models.user import UserRole
+from tests.conftest import make_user, auth_headers
+
+
+def _seed_movements(user, count):
+    items = [
+        Inventory(name=f'Store {i}', quantity=0, fruit_type='Mango', unit='kg', added_by=user.id)
+        for i in range(2)
+    ]
+    db.session.add_all(items)
+    db.session.flush()
+    start = date(2025, 1, 1)
+    for i in range(count):
+        db.session.add(StockMovement(
+            inventory_id=items[i % 2].id,
+            movement_type='in' if i % 3 else 'out',
+            quantity=10 + i,
+            unit='kg',
+            date=start + timedelta(days=i // 2),
+            added_by=user.id
+        ))
+    db.session.commit()
+    return items
+
+
+def test_stock_movements_cursor_pagination_covers_all_rows(app, client):
+    with app.app_context():
+        keeper = make_user('keeper@example.com', UserRole.STOREKEEPER)
+        _seed_movements(keeper, 25)
+        headers = auth_headers(keeper)
+
+    seen, cursor = [], None
+    while True:
+        url = '/api/stock-movements?limit=10' + (f'&cursor={cursor}' if cursor else '')
+        body = client.get(url, headers=headers).get_json()['data']
+        seen.extend(body['items'])
+        cursor = body['meta']['next_cursor']
+        if not cursor:
+            break
+
+    assert len(seen) == 25
+    assert len({m['id'] for m in seen}) == 25
+    keys = [(m['date'], m['id']) for m in seen]
+    assert keys == sorted(keys, reverse=True)
+    assert all(m['inventory_item_name'].startswith('Store') for m in seen)
+
+
+def test_stock_movements_filters(app, client):
+    with app.app_context():
+        keeper = make_user('keeper@example.com', UserRole.STOREKEEPER)
+        items = _seed_movements(keeper, 24)
+        inventory_id = items[0].id
+        headers = auth_headers(keeper)
+
+    body = client.get(f'/api/stock-movements?inventory_id={inventory_id}&movement_type=out'
+                      '&start_date=2025-01-02&end_date=2025-01-10', headers=headers).get_json()['data']
+    assert body['items']
+    for movement in body['items']:
+        assert movement['inventory_id'] == inventory_id
+        assert movement['movement_type'] == 'out'
+        assert '2025-01-02' <= movement['date'] <= '2025-01-10'
+
+    assert client.get('/api/stock-movements?cursor=garbage', headers=headers).status_code == 400
+    assert client.get('/api/stock-movements?start_date=01/02/2025', headers=headers).status_code == 400
+
+
+def test_stock_movement_filters_use_indexes(app):
+    with app.app_context():
+        plans = {}
+        for column, index_name in (('inventory_id', 'ix_stock_movement_inventory_id_date'),
+                                   ('movement_type', 'ix_stock_movement_movement_type_date')):
+            rows = db.session.execute(text(
+                f"EXPLAIN QUERY PLAN SELECT id FROM stock_movement WHERE {column} = 1 "
+                "AND date >= '2025-01-01' ORDER BY date DESC, id DESC LIMIT 50"
+            )).fetchall()
+            plans[index_name] = ' | '.join(row[-1] for row in rows)
+        for index_name, plan in plans.items():
+            assert index_name in plan, plan
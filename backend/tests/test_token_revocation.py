@@ -0,0 +1,143 @@
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask_jwt_extended import decode_token
+
+from extensions import db
+from models.it_event import ITEvent, EventType, Severity
+from models.revoked_token import RevokedToken
+from models.user import User, UserRole
+from utils.it_monitor import force_password_reset
+from utils.token_revocation import BloomFilter, RevocationList
+from tests.conftest import make_user, auth_headers, count_queries
+
+
+def _login(client, email):
+    data = client.post('/api/auth/login', json={'email': email, 'password': 'Secret123'}).get_json()['data']
+    return {'Authorization': f"Bearer {data['access_token']}"}, data['refresh_token']
+
+
+def test_logout_revokes_access_and_refresh_tokens(app, client):
+    with app.app_context():
+        make_user('seller@example.com', UserRole.SELLER)
+    headers, refresh_token = _login(client, 'seller@example.com')
+    other_headers, _ = _login(client, 'seller@example.com')
+
+    assert client.post('/api/auth/logout', json={'refresh_token': refresh_token}, headers=headers).status_code == 200
+    response = client.get('/api/auth/me', headers=headers)
+    assert response.status_code == 401
+    assert response.get_json()['error'] == 'token_revoked'
+    assert client.post('/api/auth/refresh', json={'refresh_token': refresh_token}).status_code == 401
+
+    # Other sessions stay signed in, and checking them needs no revocation query
+    with app.app_context():
+        with count_queries() as statements:
+            assert client.get('/api/auth/me', headers=other_headers).status_code == 200
+    assert not [s for s in statements if 'revoked_token' in s]
+
+
+def test_other_workers_pick_up_revocations_on_refresh(app, client):
+    with app.app_context():
+        user = make_user('keeper@example.com', UserRole.STOREKEEPER)
+        worker = RevocationList(refresh_seconds=0)
+        worker.refresh()
+        token = decode_token(auth_headers(user)['Authorization'].split()[1])
+        assert not worker.is_revoked(token)
+
+        db.session.add(RevokedToken(jti=token['jti'], user_id=user.id,
+                                    expires_at=datetime.utcnow() + timedelta(hours=1)))
+        db.session.add(RevokedToken(jti='long-gone', expires_at=datetime.utcnow() - timedelta(seconds=1)))
+        db.session.commit()
+        assert worker.is_revoked(token)
+        assert not worker.is_revoked({'jti': 'long-gone', 'sub': str(user.id)})
+
+
+def test_failed_login_burst_forces_a_password_reset(app, client):
+    with app.app_context():
+        user = make_user('victim@example.com', UserRole.SELLER)
+        user_id = user.id
+    headers, refresh_token = _login(client, 'victim@example.com')
+
+    for _ in range(5):
+        client.post('/api/auth/login', json={'email': 'victim@example.com', 'password': 'guess'})
+    assert app.extensions['it_event_writer'].flush()
+
+    assert client.get('/api/auth/me', headers=headers).status_code == 401
+    assert client.get('/api/messages', headers=headers).status_code == 401
+    assert client.post('/api/auth/refresh', json={'refresh_token': refresh_token}).status_code == 401
+    with app.app_context():
+        assert User.query.get(user_id).is_first_login is True
+
+    # Signing in again works and is flagged for a password change
+    login = client.post('/api/auth/login', json={'email': 'victim@example.com', 'password': 'Secret123'})
+    assert login.get_json()['data']['user']['is_first_login'] is True
+    headers = {'Authorization': f"Bearer {login.get_json()['data']['access_token']}"}
+    assert client.get('/api/auth/me', headers=headers).status_code == 200
+
+
+def test_revocation_list_grows_without_false_negatives():
+    revocations = RevocationList(capacity=64)
+    jtis = [f'jti-{i}' for i in range(1000)]
+    for jti in jtis:
+        revocations.add(jti=jti)
+    revocations._refreshed_at = float('inf')  # no database here
+    assert all(revocations.is_revoked({'jti': jti}) for jti in jtis)
+    assert not any(revocations.is_revoked({'jti': f'live-{i}'}) for i in range(1000))
+
+    bloom = BloomFilter(1000)
+    for jti in jtis:
+        bloom.add(jti)
+    false_positives = sum(f'live-{i}' in bloom for i in range(10000))
+    assert false_positives < 50
+
+
+def test_adds_during_a_rebuild_are_not_lost():
+    revocations = RevocationList(capacity=64)
+    revocations._refreshed_at = float('inf')  # no database here
+    past = datetime.utcnow() - timedelta(hours=1)
+    stop = threading.Event()
+
+    def prune_forever():
+        while not stop.is_set():
+            revocations.add(jti=f'expired-{time.monotonic()}', expires_at=past)
+            with revocations._lock:
+                revocations._prune(time.time())
+
+    # Switch threads as often as possible so adds land mid-rebuild
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        pruner = threading.Thread(target=prune_forever)
+        pruner.start()
+        jtis = [f'jti-{i}' for i in range(5000)]
+        for jti in jtis:
+            revocations.add(jti=jti)
+        stop.set()
+        pruner.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert all(revocations.is_revoked({'jti': jti}) for jti in jtis)
+
+
+def test_forced_reset_runs_once_per_window_and_only_for_real_accounts(app):
+    with app.app_context():
+        user = make_user('target@example.com', UserRole.CEO)
+        event = ITEvent(event_type=EventType.FAILED_LOGIN, severity=Severity.WARNING, user_email='target@example.com')
+
+        force_password_reset(event, None, 15 * 60)
+        # Another burst for the same email, e.g. from a second IP, within the window
+        force_password_reset(event, None, 15 * 60)
+        assert RevokedToken.query.filter_by(user_id=user.id).count() == 1
+        assert User.query.get(user.id).token_version == 1
+
+        force_password_reset(ITEvent(event_type=EventType.FAILED_LOGIN, severity=Severity.WARNING,
+                                     user_email='nobody@example.com'), None, 15 * 60)
+        assert RevokedToken.query.count() == 1
+
+        # Once the window has passed the account can be reset again
+        RevokedToken.query.update({RevokedToken.revoked_at: datetime.utcnow() - timedelta(hours=1)})
+        db.session.commit()
+        force_password_reset(event, None, 15 * 60)
+        assert RevokedToken.query.filter_by(user_id=user.id).count() == 2
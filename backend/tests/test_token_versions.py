@@ -0,0 +1,79 @@
+from flask_jwt_extended import create_access_token
+
+from extensions import db
+from models.user import User, UserRole
+from tests.conftest import make_user, auth_headers, count_queries
+
+
+def _user_statements(statements):
+    return [s for s in statements if 'FROM user' in s]
+
+
+def test_role_checks_use_claims_without_user_queries(app, client):
+    with app.app_context():
+        headers = auth_headers(make_user('keeper@example.com', UserRole.STOREKEEPER))
+        db.session.remove()
+
+        assert client.get('/api/messages', headers=headers).status_code == 200
+        with count_queries() as statements:
+            assert client.get('/api/messages', headers=headers).status_code == 200
+    assert _user_statements(statements) == []
+
+
+def test_role_change_and_deactivation_revoke_existing_tokens(app, client):
+    with app.app_context():
+        user = make_user('seller@example.com', UserRole.SELLER)
+        user_id = user.id
+        headers = auth_headers(user)
+    login = client.post('/api/auth/login', json={'email': 'seller@example.com', 'password': 'Secret123'})
+    refresh_token = login.get_json()['data']['refresh_token']
+    assert client.get('/api/messages', headers=headers).status_code == 200
+
+    with app.app_context():
+        User.query.get(user_id).role = UserRole.DRIVER
+        db.session.commit()
+    assert client.get('/api/messages', headers=headers).status_code == 401
+    assert client.post('/api/auth/refresh', json={'refresh_token': refresh_token}).status_code == 401
+
+    login = client.post('/api/auth/login', json={'email': 'seller@example.com', 'password': 'Secret123'})
+    headers = {'Authorization': f"Bearer {login.get_json()['data']['access_token']}"}
+    assert client.get('/api/messages', headers=headers).status_code == 200
+
+    with app.app_context():
+        User.query.get(user_id).is_active = False
+        db.session.commit()
+    assert client.get('/api/messages', headers=headers).status_code == 401
+
+
+def test_tokens_without_a_version_fall_back_to_the_stored_role(app, client):
+    with app.app_context():
+        user = make_user('ceo@example.com', UserRole.CEO)
+        token = create_access_token(identity=str(user.id), additional_claims={'role': 'seller'})
+    # The stored role wins over an unversioned claim
+    response = client.delete('/api/messages/clear', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200
+
+
+def test_tokens_of_deleted_users_fail_plain_jwt_routes(app, client):
+    with app.app_context():
+        user = make_user('gone@example.com', UserRole.SELLER)
+        headers = auth_headers(user)
+        unversioned = {'Authorization': f"Bearer {create_access_token(identity=str(user.id))}"}
+        assert client.get('/api/auth/me', headers=headers).status_code == 200
+
+        db.session.delete(user)
+        db.session.commit()
+    assert client.get('/api/auth/me', headers=headers).status_code == 401
+    assert client.get('/api/auth/me', headers=unversioned).status_code == 401
+
+
+def test_rolled_back_changes_leave_token_versions_alone(app, client):
+    with app.app_context():
+        user = make_user('seller@example.com', UserRole.SELLER)
+        headers = auth_headers(user)
+        assert client.get('/api/messages', headers=headers).status_code == 200
+
+        user.role = UserRole.DRIVER
+        db.session.flush()
+        db.session.rollback()
+        assert client.get('/api/messages', headers=headers).status_code == 200
@@ -0,0 +1,43 @@
+from extensions import db
+from models.user import User, UserRole
+from tests.conftest import make_user, auth_headers, count_queries
+
+
+def _user_statements(statements):
+    return [s for s in statements if s.lstrip().upper().startswith('SELECT') and 'FROM user' in s]
+
+
+def test_warm_requests_resolve_the_user_without_queries(app, client):
+    with app.app_context():
+        headers = auth_headers(make_user('keeper@example.com', UserRole.STOREKEEPER))
+        db.session.remove()
+
+        with count_queries() as cold:
+            assert client.get('/api/auth/me', headers=headers).status_code == 200
+        with count_queries() as warm:
+            response = client.get('/api/auth/me', headers=headers)
+    # JWT loader and get_current_user share one lookup per request, then the cache
+    assert len(_user_statements(cold)) == 1
+    assert _user_statements(warm) == []
+    assert response.get_json()['data']['email'] == 'keeper@example.com'
+
+
+def test_updates_and_password_changes_invalidate_the_cache(app, client):
+    with app.app_context():
+        user = make_user('seller@example.com', UserRole.SELLER)
+        user_id = user.id
+        headers = auth_headers(user)
+    assert client.get('/api/auth/me', headers=headers).get_json()['data']['name'] == 'seller'
+
+    with app.app_context():
+        User.query.get(user_id).name = 'Renamed'
+        db.session.commit()
+    assert client.get('/api/auth/me', headers=headers).get_json()['data']['name'] == 'Renamed'
+
+    # The cached copy has no password hash; checking it loads the current one
+    response = client.post('/api/auth/change-password', headers=headers, json={
+        'current_password': 'Secret123', 'new_password': 'Changed123', 'confirm_password': 'Changed123'})
+    assert response.status_code == 200
+    assert len(app.extensions['user_cache']) == 0
+    response = client.post('/api/auth/login', json={'email': 'seller@example.com', 'password': 'Changed123'})
+    assert response.status_code == 200
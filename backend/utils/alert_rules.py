@@ -0,0 +1,147 @@
+"""
+Parser for the ``condition`` strings in ``Config.ALERT_RULES``.
+
+Conditions are compiled once, when the app starts, into ``WindowRule`` objects
+run by ``AlertWindowEngine``. The grammar is deliberately small::
+
+    condition := "any" EVENT
+               | CMP COUNT EVENT [from same FIELD] [by QUALIFIER] [within DURATION]
+               | CMP SIZE EVENT [from same FIELD] [by QUALIFIER]
+
+    CMP       := ">=" | ">"
+    COUNT     := integer                    e.g. ">=5 failed_login ... within 15m"
+    SIZE      := number KB|MB|GB|TB         compared with the event's size in the payload
+    EVENT     := an EventType value; words may be separated by spaces or underscores
+    FIELD     := ip | user | resource
+    DURATION  := number s|m|h|d
+
+Examples: ``>=5 failed_login from same IP within 15m``,
+``>1GB data export by non-admin``, ``any permission_change``.
+"""
+
+import re
+
+from models.it_event import EventType
+from utils.user_cache import load_user
+from utils.alert_windows import AlertWindowEngine, WindowRule
+
+GROUP_FIELDS = {'ip': 'ip', 'user': 'user_email', 'resource': 'resource'}
+DURATION_SECONDS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+SIZE_MB = {'kb': 1 / 1024, 'mb': 1, 'gb': 1024, 'tb': 1024 * 1024}
+# Payload key holding the size, in MB, for events that carry one
+SIZE_PAYLOAD_KEYS = {EventType.DATA_EXPORT: 'export_size_mb'}
+
+_CONDITION = re.compile(
+    r'^(?P<cmp>>=|>)\s*(?P<amount>\d+(?:\.\d+)?)\s*(?P<unit>kb|mb|gb|tb)?\s+'
+    r'(?P<event>[a-z_ ]+?)'
+    r'(?:\s+from\s+same\s+(?P<group>\w+))?'
+    r'(?:\s+by\s+(?P<qualifier>[\w-]+))?'
+    r'(?:\s+within\s+(?P<window>\d+)\s*(?P<window_unit>[smhd]))?$'
+)
+_ANY = re.compile(r'^any\s+(?P<event>[a-z_ ]+)$')
+
+
+def _user_role(event):
+    user = load_user(event.user_id)
+    return user.role.value if user and user.role else None
+
+
+def _is_non_admin(event):
+    role = _user_role(event)
+    return role is not None and role not in ('admin', 'it')
+
+
+# "by <qualifier>" filters; they run only after the cheaper checks have matched
+QUALIFIERS = {'non-admin': _is_non_admin}
+
+
+class AlertRuleError(ValueError):
+    """An ``ALERT_RULES`` condition that does not parse."""
+
+
+def _event_type(name, text):
+    value = '_'.join(text.split())
+    try:
+        return EventType(value)
+    except ValueError:
+        raise AlertRuleError(f"Alert rule '{name}': unknown event type '{text}'.")
+
+
+def _size_predicate(name, event_type, strict, threshold_mb):
+    key = SIZE_PAYLOAD_KEYS.get(event_type)
+    if key is None:
+        raise AlertRuleError(f"Alert rule '{name}': {event_type.value} events carry no size.")
+
+    def exceeds(event):
+        size = (event.payload or {}).get(key) or 0
+        return size > threshold_mb if strict else size >= threshold_mb
+    return exceeds
+
+
+def _all_of(predicates):
+    predicates = [p for p in predicates if p is not None]
+    if not predicates:
+        return None
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda event: all(p(event) for p in predicates)
+
+
+def parse_condition(name, condition):
+    """Compile one condition string into a ``WindowRule``; raises ``AlertRuleError``."""
+    text = ' '.join(condition.strip().lower().split())
+
+    match = _ANY.match(text)
+    if match:
+        return WindowRule(name, _event_type(name, match['event']))
+
+    match = _CONDITION.match(text)
+    if not match:
+        raise AlertRuleError(f"Alert rule '{name}': cannot parse condition '{condition}'.")
+
+    event_type = _event_type(name, match['event'])
+    strict = match['cmp'] == '>'
+
+    group_by = None
+    if match['group']:
+        group_by = GROUP_FIELDS.get(match['group'])
+        if group_by is None:
+            raise AlertRuleError(f"Alert rule '{name}': cannot group by '{match['group']}'.")
+
+    qualifier = None
+    if match['qualifier']:
+        qualifier = QUALIFIERS.get(match['qualifier'])
+        if qualifier is None:
+            raise AlertRuleError(f"Alert rule '{name}': unknown qualifier '{match['qualifier']}'.")
+
+    window_seconds = 0
+    if match['window']:
+        window_seconds = int(match['window']) * DURATION_SECONDS[match['window_unit']]
+
+    if match['unit']:
+        if window_seconds:
+            raise AlertRuleError(f"Alert rule '{name}': size conditions cannot have a window.")
+        size_mb = float(match['amount']) * SIZE_MB[match['unit']]
+        return WindowRule(name, event_type, group_by=group_by,
+                          predicate=_all_of([_size_predicate(name, event_type, strict, size_mb), qualifier]))
+
+    count = float(match['amount'])
+    if count != int(count):
+        raise AlertRuleError(f"Alert rule '{name}': event counts must be whole numbers.")
+    threshold = int(count) + 1 if strict else int(count)
+    if threshold > 1 and not window_seconds:
+        raise AlertRuleError(f"Alert rule '{name}': counting more than one event needs 'within'.")
+    return WindowRule(name, event_type, threshold=threshold, window_seconds=window_seconds,
+                      group_by=group_by, predicate=qualifier)
+
+
+def compile_alert_rules(alert_rules):
+    """Compile every ``ALERT_RULES`` entry; raises ``AlertRuleError`` on the first bad one."""
+    return [parse_condition(name, config['condition']) for name, config in alert_rules.items()]
+
+
+def init_alert_rules(app):
+    """Compile ``ALERT_RULES`` at startup and attach the rule engine to ``app``."""
+    engine = AlertWindowEngine(compile_alert_rules(app.config.get('ALERT_RULES', {})))
+    app.extensions['it_alert_engine'] = engine
+    return engine
@@ -0,0 +1,144 @@
+"""
+In-memory sliding-window counters for IT alert rules.
+
+Each (rule, group key) pair, e.g. ``failed_login_burst`` for one IP, owns a
+``SlidingWindowCounter``: a ring buffer of time buckets whose running total is
+the number of matching events in the last ``window`` seconds. Adding an event
+is O(1) amortized and never touches the database, so a credential-stuffing run
+or a 404 flood costs a few dictionary lookups per event instead of a COUNT(*).
+
+A rule fires when its count reaches the threshold, then stays quiet for that
+key until the window has passed, so a burst raises one alert, not one per
+qualifying event. State is per process (each gunicorn worker counts the
+events it logs).
+"""
+
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+
+BUCKETS_PER_WINDOW = 30
+MAX_RELATED_EVENTS = 50
+MAX_TRACKED_KEYS = 10000
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def event_seconds(event):
+    """Event time as seconds since the epoch (``ITEvent.timestamp`` is naive UTC)."""
+    timestamp = event.timestamp or datetime.utcnow()
+    return (timestamp - _EPOCH).total_seconds()
+
+
+class SlidingWindowCounter:
+    """Event count over the trailing ``window_seconds``, bucketed into a fixed ring."""
+
+    __slots__ = ('bucket_seconds', 'counts', 'head', 'total', 'recent_ids', 'quiet_until')
+
+    def __init__(self, window_seconds, buckets=BUCKETS_PER_WINDOW):
+        self.bucket_seconds = window_seconds / buckets
+        self.counts = [0] * buckets
+        self.head = None  # absolute index of the newest bucket
+        self.total = 0
+        self.recent_ids = deque(maxlen=MAX_RELATED_EVENTS)
+        self.quiet_until = 0.0
+
+    def _advance(self, index):
+        if self.head is None:
+            self.head = index
+            return
+        if index <= self.head:
+            return
+        size = len(self.counts)
+        # Expire every bucket that slid out of the window; bounded by the ring size
+        for step in range(1, min(index - self.head, size) + 1):
+            slot = (self.head + step) % size
+            self.total -= self.counts[slot]
+            self.counts[slot] = 0
+        self.head = index
+
+    def add(self, now, event_id=None, amount=1):
+        """Count ``amount`` events at ``now`` (seconds) and return the count in the window."""
+        index = int(now // self.bucket_seconds)
+        self._advance(index)
+        # Late events older than the window are ignored; late ones inside it count
+        if self.head - index < len(self.counts):
+            self.counts[index % len(self.counts)] += amount
+            self.total += amount
+            if event_id is not None:
+                self.recent_ids.append((now, event_id))
+        return self.total
+
+    def count(self, now):
+        self._advance(int(now // self.bucket_seconds))
+        return self.total
+
+
+class WindowRule:
+    """
+    Fire when at least ``threshold`` events of ``event_type`` share a group key
+    within ``window_seconds``. ``group_by`` names the event attribute to group on
+    (None counts all matching events together). ``predicate`` is an optional
+    extra per-event filter.
+    """
+
+    def __init__(self, name, event_type, threshold=1, window_seconds=0, group_by=None, predicate=None):
+        self.name = name
+        self.event_type = event_type
+        self.threshold = threshold
+        self.window_seconds = window_seconds
+        self.group_by = group_by
+        self.predicate = predicate
+
+    def key(self, event):
+        return getattr(event, self.group_by) if self.group_by else None
+
+
+class AlertWindowEngine:
+    """Feeds events through ``WindowRule`` counters and reports which rules fire."""
+
+    def __init__(self, rules, max_keys=MAX_TRACKED_KEYS):
+        self.rules = list(rules)
+        # Rules indexed by event type: an event only ever visits the rules for its own type
+        self.rules_by_type = {}
+        for rule in self.rules:
+            self.rules_by_type.setdefault(rule.event_type, []).append(rule)
+        self.max_keys = max_keys
+        self._counters = OrderedDict()
+        self._lock = threading.Lock()
+
+    def process(self, event):
+        """Return ``[(rule, related_event_ids)]`` for the rules this event fires."""
+        fired = []
+        for rule in self.rules_by_type.get(event.event_type, ()):
+            if rule.predicate is not None and not rule.predicate(event):
+                continue
+            if rule.window_seconds <= 0:
+                if rule.threshold <= 1:
+                    fired.append((rule, [event.id]))
+                continue
+            with self._lock:
+                ids = self._observe(rule, event)
+            if ids is not None:
+                fired.append((rule, ids))
+        return fired
+
+    def _observe(self, rule, event):
+        now = event_seconds(event)
+        key = (rule.name, rule.key(event))
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = SlidingWindowCounter(rule.window_seconds)
+            # Bound memory under floods from many distinct keys (e.g. IPs)
+            if len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+        else:
+            self._counters.move_to_end(key)
+
+        # A folded API error event stands for occurrence_count errors
+        count = counter.add(now, event.id, getattr(event, 'occurrence_count', None) or 1)
+        if count < rule.threshold or now < counter.quiet_until:
+            return None
+        counter.quiet_until = now + rule.window_seconds
+        since = now - rule.window_seconds
+        return [event_id for at, event_id in counter.recent_ids if at > since]
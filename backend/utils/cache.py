@@ -0,0 +1,98 @@
+"""
+Process-local caches invalidated by a version counter.
+
+Each gunicorn worker keeps its own copy. Writes made through the ORM in this
+worker bump the version as soon as they commit; the TTL bounds how long a
+worker can serve data that another worker changed.
+"""
+
+import threading
+import time
+from itertools import chain
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class VersionedCache:
+    """Small key/value cache whose entries are all dropped when the version is bumped."""
+
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self._version = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @property
+    def version(self):
+        return self._version
+
+    def invalidate(self):
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    def get(self, key):
+        """Return the cached value for ``key`` or None if missing/expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        version, expires_at, value = entry
+        if version != self._version or expires_at < time.monotonic():
+            return None
+        return value
+
+    def set(self, key, value, version=None):
+        """
+        Store ``value`` computed at ``version`` (defaults to the current one).
+        Values computed before a concurrent invalidation are discarded.
+        """
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            self._entries[key] = (self._version, time.monotonic() + self.ttl, value)
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            version = self._version
+            value = compute()
+            self.set(key, value, version=version)
+        return value
+
+
+def invalidate_on_commit(cache, *models):
+    """
+    Invalidate ``cache`` after any commit that inserted, updated or deleted
+    rows of ``models``, including bulk ``Query.update``/``Query.delete``.
+    """
+    flag = f'_invalidate_cache_{id(cache)}'
+
+    def _mark(session):
+        session.info[flag] = True
+
+    @event.listens_for(Session, 'after_flush')
+    def _after_flush(session, flush_context):
+        for obj in chain(session.new, session.dirty, session.deleted):
+            if isinstance(obj, models):
+                _mark(session)
+                return
+
+    @event.listens_for(Session, 'after_bulk_update')
+    def _after_bulk_update(update_context):
+        if issubclass(update_context.mapper.class_, models):
+            _mark(update_context.session)
+
+    @event.listens_for(Session, 'after_bulk_delete')
+    def _after_bulk_delete(delete_context):
+        if issubclass(delete_context.mapper.class_, models):
+            _mark(delete_context.session)
+
+    @event.listens_for(Session, 'after_commit')
+    def _after_commit(session):
+        if session.info.pop(flag, False):
+            cache.invalidate()
+
+    @event.listens_for(Session, 'after_soft_rollback')
+    def _after_rollback(session, previous_transaction):
+        session.info.pop(flag, None)
@@ -1,35 +1,59 @@
 from functools import wraps
-from flask_jwt_extended import jwt_required
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 from flask import jsonify
 from .helpers import get_current_user, make_response_data
+from .token_versions import get_token_versions, VERSION_CLAIM
+
+
+def _json_error(response_data, status_code):
+    # A bare Response passes through Flask-RESTful; a (Response, status) tuple does not
+    response = jsonify(response_data)
+    response.status_code = status_code
+    return response
+
 
 def role_required(*allowed_roles):
     def decorator(f):
         @wraps(f)
         @jwt_required()
         def decorated_function(*args, **kwargs):
-            current_user = get_current_user()
-            
-            # Check if user is authenticated
-            if not current_user:
-                response_data, status_code = make_response_data(
-                    success=False,
-                    message='Authentication required. Please log in.',
-                    errors=['Not authenticated'],
-                    status_code=401
-                )
-                return jsonify(response_data), status_code
-            
-            # Safely get role value (handles both Enum and string roles)
-            user_role = None
-            try:
-                if hasattr(current_user, 'role'):
-                    if hasattr(current_user.role, 'value'):
-                        user_role = current_user.role.value
-                    else:
-                        user_role = str(current_user.role)
-            except Exception:
+            claims = get_jwt()
+            if VERSION_CLAIM in claims:
+                # Decide from the verified claims; the version check catches role changes
+                # and deactivations since the token was issued (utils/token_versions.py)
+                if not get_token_versions().is_current(get_jwt_identity(), claims[VERSION_CLAIM]):
+                    response_data, status_code = make_response_data(
+                        success=False,
+                        message='Session expired. Please log in again.',
+                        errors=['Token revoked'],
+                        status_code=401
+                    )
+                    return _json_error(response_data, status_code)
+                user_role = claims.get('role')
+            else:
+                # Tokens issued before token versions: read the role from the user
+                current_user = get_current_user()
+
+                # Check if user is authenticated
+                if not current_user:
+                    response_data, status_code = make_response_data(
+                        success=False,
+                        message='Authentication required. Please log in.',
+                        errors=['Not authenticated'],
+                        status_code=401
+                    )
+                    return _json_error(response_data, status_code)
+
+                # Safely get role value (handles both Enum and string roles)
                 user_role = None
+                try:
+                    if hasattr(current_user, 'role'):
+                        if hasattr(current_user.role, 'value'):
+                            user_role = current_user.role.value
+                        else:
+                            user_role = str(current_user.role)
+                except Exception:
+                    user_role = None
             
             if user_role not in allowed_roles:
                 response_data, status_code = make_response_data(
@@ -38,7 +62,7 @@ def role_required(*allowed_roles):
                     errors=[f'Your role ({user_role}) does not have access to this resource. Required: {allowed_roles}'],
                     status_code=403
                 )
-                return jsonify(response_data), status_code
+                return _json_error(response_data, status_code)
             return f(*args, **kwargs)
         return decorated_function
     return decorator
@@ -0,0 +1,115 @@
+"""
+Folding of repeated API errors into one IT event per window.
+
+``log_api_error`` records each error here instead of queueing an event. Errors
+with the same route template (``/api/inventory/<int:inv_id>`` rather than the
+concrete path), status code and user share one entry that counts occurrences
+and tracks first/last seen. Once an entry is ``window`` seconds old the event
+writer turns it into a single ``ITEvent`` with ``occurrence_count`` set, so a
+polling loop stuck on a 404 writes one row a minute instead of one per hit.
+"""
+
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from models.it_event import EventType, Severity
+from models.user import User
+
+DEFAULT_WINDOW_SECONDS = 60
+MAX_PENDING_KEYS = 5000
+# Key used for new errors once MAX_PENDING_KEYS distinct ones are pending
+OVERFLOW_TEMPLATE = '*'
+
+
+class ApiErrorAggregator:
+    """Pending error counts keyed by (route template, status code, user id)."""
+
+    def __init__(self, window_seconds=DEFAULT_WINDOW_SECONDS, max_keys=MAX_PENDING_KEYS):
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def record(self, template, status_code, error_message, user_id=None, path=None, ip=None, device=None):
+        """Count one error occurrence; O(1), no database access."""
+        now = time.time()
+        key = (template, status_code, user_id)
+        with self._lock:
+            self.recorded += 1
+            entry = self._pending.get(key)
+            if entry is None and len(self._pending) >= self.max_keys:
+                key = (OVERFLOW_TEMPLATE, status_code, None)
+                entry = self._pending.get(key)
+            if entry is None:
+                self._pending[key] = {
+                    'first_seen': now, 'last_seen': now, 'count': 1, 'error_message': error_message,
+                    'path': path, 'ip': ip, 'device': device,
+                }
+            else:
+                entry['last_seen'] = now
+                entry['count'] += 1
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def collect(self, force=False):
+        """Remove entries whose window has closed (all of them with ``force``) and return event rows."""
+        cutoff = time.time() - self.window_seconds
+        with self._lock:
+            due = [key for key, entry in self._pending.items() if force or entry['first_seen'] <= cutoff]
+            entries = [(key, self._pending.pop(key)) for key in due]
+        if not entries:
+            return []
+
+        user_ids = {user_id for (_, _, user_id), _ in entries if user_id is not None}
+        emails = dict(User.query.with_entities(User.id, User.email).filter(User.id.in_(user_ids)).all()) \
+            if user_ids else {}
+        return [self._event_row(key, entry, emails) for key, entry in entries]
+
+    @staticmethod
+    def _event_row(key, entry, emails):
+        template, status_code, user_id = key
+        first_seen = datetime.utcfromtimestamp(entry['first_seen'])
+        last_seen = datetime.utcfromtimestamp(entry['last_seen'])
+        count = entry['count']
+        summary = f"API Error: {entry['error_message']}"
+        if count > 1:
+            summary += f" (x{count})"
+        return {
+            'id': f"evt_{first_seen.strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}",
+            'timestamp': first_seen,
+            'user_email': emails.get(user_id),
+            'user_id': user_id,
+            'event_type': EventType.API_ERROR,
+            'severity': Severity.WARNING,
+            'ip': entry['ip'],
+            'device': entry['device'],
+            'resource': entry['path'] if template == OVERFLOW_TEMPLATE else template,
+            'summary': summary,
+            'payload': {
+                'status_code': status_code,
+                'error_message': entry['error_message'],
+                'path_template': template,
+                'sample_path': entry['path'],
+            },
+            'server_logs': None,
+            'stack_trace': None,
+            'related_event_ids': None,
+            'occurrence_count': count,
+            'first_seen_at': first_seen,
+            'last_seen_at': last_seen,
+        }
+
+
+def init_api_error_aggregator(app, writer):
+    """Attach an ``ApiErrorAggregator`` to ``app`` and have ``writer`` flush it periodically."""
+    aggregator = ApiErrorAggregator(
+        window_seconds=app.config.get('IT_API_ERROR_WINDOW_SECONDS', DEFAULT_WINDOW_SECONDS)
+    )
+    app.extensions['it_api_error_aggregator'] = aggregator
+    writer.add_periodic(aggregator.collect)
+    return aggregator
@@ -0,0 +1,268 @@
+"""
+In-process pub/sub behind the ``/api/stream`` Server-Sent Events endpoint.
+
+New ``ITAlert`` and ``Message`` rows are published to the app's
+``StreamBroker`` when the session that inserted them commits; every open
+stream waits on the broker and receives the rows its user may see, so clients
+no longer poll ``/api/it/alerts`` or ``/api/messages``. Waiting uses
+``threading.Condition``, which the eventlet worker monkey-patches into a green
+primitive, so an idle stream costs a greenlet, not a thread or a query.
+
+Stream event ids are cursors of the form ``a<alert id>-m<message id>``. A
+client reconnecting with ``Last-Event-ID`` is first sent the rows it missed,
+read from the database a page at a time.
+
+``EventSource`` cannot send an Authorization header, so browsers authenticate
+with a stream token in the query string: a short-lived JWT
+(``STREAM_TOKEN_SECONDS``) with ``scope: stream`` that opens ``/api/stream`` and
+is refused everywhere else, so one leaked through an access log is of little use.
+
+Each gunicorn worker has its own broker. While a worker has subscribers, one
+background tail per worker picks up rows committed by the other workers every
+``STREAM_POLL_SECONDS`` (two indexed ``id >`` queries, however many clients are
+connected).
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+
+from flask import current_app
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, func, or_
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models.it_alert import ITAlert
+from models.message import Message
+from models.user import UserRole
+from utils.token_versions import token_claims
+
+STREAM_HISTORY = 500
+REPLAY_LIMIT = 500
+STREAM_SCOPE = 'stream'
+DEFAULT_STREAM_TOKEN_SECONDS = 60
+ALERT_ROLES = ('it', 'admin')
+_CURSOR = re.compile(r'^a(\d+)-m(\d+)$')
+_PENDING_KEY = 'stream_pending'
+
+
+class StreamEntry:
+    """One published row; its JSON payload is loaded once, by the first stream that needs it."""
+
+    __slots__ = ('seq', 'channel', 'row_id', 'recipient_id', 'recipient_role', '_payload', '_lock')
+
+    def __init__(self, seq, channel, row_id, recipient_id=None, recipient_role=None):
+        self.seq = seq
+        self.channel = channel
+        self.row_id = row_id
+        self.recipient_id = recipient_id
+        self.recipient_role = recipient_role
+        self._payload = None
+        self._lock = threading.Lock()
+
+    def visible_to(self, user_id, role):
+        if self.channel == 'alert':
+            return role in ALERT_ROLES
+        return self.recipient_id == user_id or (role is not None and self.recipient_role == role)
+
+    def payload(self):
+        """Row as ``to_dict()``; call inside an app context."""
+        with self._lock:
+            if self._payload is None:
+                model = ITAlert if self.channel == 'alert' else Message
+                row = model.query.get(self.row_id)
+                self._payload = row.to_dict() if row is not None else {'id': self.row_id, 'deleted': True}
+            return self._payload
+
+
+def parse_cursor(value):
+    """``(alert_id, message_id)`` from a stream event id; None when missing or malformed."""
+    match = _CURSOR.match((value or '').strip())
+    return (int(match[1]), int(match[2])) if match else None
+
+
+def format_cursor(alert_id, message_id):
+    return f"a{alert_id}-m{message_id}"
+
+
+def latest_cursor():
+    """Cursor at the newest stored alert and message."""
+    return (
+        db.session.query(func.coalesce(func.max(ITAlert.id), 0)).scalar(),
+        db.session.query(func.coalesce(func.max(Message.id), 0)).scalar(),
+    )
+
+
+def visible_messages(query, user_id, role):
+    """Restrict a ``Message`` query to what ``/api/messages`` would list for this user."""
+    conditions = [Message.recipient_id == user_id]
+    if role is not None:
+        try:
+            conditions.append(Message.recipient_role == UserRole(role))
+        except ValueError:
+            pass
+    return query.filter(or_(*conditions))
+
+
+def create_stream_token(user):
+    """Short-lived token that only opens ``/api/stream``; safe enough to put in a URL."""
+    seconds = current_app.config.get('STREAM_TOKEN_SECONDS', DEFAULT_STREAM_TOKEN_SECONDS)
+    claims = dict(token_claims(user), scope=STREAM_SCOPE)
+    return create_access_token(identity=str(user.id), additional_claims=claims,
+                               expires_delta=timedelta(seconds=seconds)), seconds
+
+
+def replay(cursor, user_id, role, limit=REPLAY_LIMIT):
+    """
+    One page of rows stored after ``cursor`` that the user may see, as
+    ``([(channel, id, payload)], complete)``, oldest first per channel. While
+    ``complete`` is False, call again from the cursor of the last row returned.
+    """
+    alert_id, message_id = cursor
+    rows = []
+    complete = True
+    if role in ALERT_ROLES:
+        alerts = ITAlert.query.filter(ITAlert.id > alert_id).order_by(ITAlert.id).limit(limit).all()
+        rows.extend(('alert', alert.id, alert.to_dict()) for alert in alerts)
+        complete = len(alerts) < limit
+    messages = visible_messages(Message.query.filter(Message.id > message_id), user_id, role)
+    messages = messages.order_by(Message.id).limit(limit).all()
+    rows.extend(('message', message.id, message.to_dict()) for message in messages)
+    return rows, complete and len(messages) < limit
+
+
+class StreamBroker:
+    """Bounded log of published rows that streams wait on."""
+
+    def __init__(self, app, history=STREAM_HISTORY, poll_seconds=2.0):
+        self.app = app
+        self.poll_seconds = poll_seconds
+        self._entries = deque(maxlen=history)
+        self._seq = 0
+        self._condition = threading.Condition()
+        self._subscribers = 0
+        self._published = {'alert': deque(maxlen=history), 'message': deque(maxlen=history)}
+        self._tail = None
+        self._tail_cursor = None
+
+    @property
+    def last_seq(self):
+        return self._seq
+
+    @property
+    def subscribers(self):
+        return self._subscribers
+
+    def publish(self, channel, row_id, recipient_id=None, recipient_role=None):
+        with self._condition:
+            if row_id in self._published[channel]:
+                return
+            self._published[channel].append(row_id)
+            self._seq += 1
+            self._entries.append(StreamEntry(self._seq, channel, row_id, recipient_id, recipient_role))
+            self._condition.notify_all()
+
+    def wait(self, after_seq, timeout):
+        """Entries published after ``after_seq``, waiting up to ``timeout`` seconds for the first one."""
+        with self._condition:
+            if self._seq <= after_seq:
+                self._condition.wait(timeout)
+            return [entry for entry in self._entries if entry.seq > after_seq]
+
+    def subscribe(self):
+        with self._condition:
+            self._subscribers += 1
+        self._ensure_tail()
+
+    def unsubscribe(self):
+        with self._condition:
+            self._subscribers -= 1
+
+    def _ensure_tail(self):
+        if not self.poll_seconds:
+            return
+        with self._condition:
+            if self._tail is None:
+                self._tail = threading.Thread(target=self._run_tail, name='stream-tail', daemon=True)
+                self._tail.start()
+
+    def _run_tail(self):
+        while True:
+            with self._condition:
+                if self._subscribers <= 0:
+                    self._tail = None
+                    self._tail_cursor = None
+                    return
+            try:
+                with self.app.app_context():
+                    self._poll()
+                    db.session.remove()
+            except Exception:
+                self.app.logger.exception("Stream tail failed")
+            time.sleep(self.poll_seconds)
+
+    def _poll(self):
+        """Publish rows committed by other processes since the last poll."""
+        if self._tail_cursor is None:
+            self._tail_cursor = latest_cursor()
+            return
+        alert_id, message_id = self._tail_cursor
+        alerts = db.session.query(ITAlert.id).filter(ITAlert.id > alert_id).order_by(ITAlert.id).all()
+        messages = db.session.query(Message.id, Message.recipient_id, Message.recipient_role).filter(
+            Message.id > message_id).order_by(Message.id).all()
+        for (row_id,) in alerts:
+            self.publish('alert', row_id)
+            alert_id = row_id
+        for row_id, recipient_id, recipient_role in messages:
+            self.publish('message', row_id, recipient_id, recipient_role.value if recipient_role else None)
+            message_id = row_id
+        self._tail_cursor = (alert_id, message_id)
+
+
+def get_stream_broker(app=None):
+    app = app or current_app._get_current_object()
+    broker = app.extensions.get('stream_broker')
+    if broker is None:
+        broker = init_stream_broker(app)
+    return broker
+
+
+def init_stream_broker(app):
+    """Attach a ``StreamBroker`` to ``app``."""
+    broker = StreamBroker(app, poll_seconds=app.config.get('STREAM_POLL_SECONDS', 2.0))
+    app.extensions['stream_broker'] = broker
+    return broker
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_new_rows(session, flush_context):
+    pending = session.info.setdefault(_PENDING_KEY, [])
+    for instance in session.new:
+        if isinstance(instance, ITAlert):
+            pending.append(('alert', instance.id, None, None))
+        elif isinstance(instance, Message):
+            role = instance.recipient_role
+            pending.append(('message', instance.id, instance.recipient_id,
+                            role.value if isinstance(role, UserRole) else role))
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_new_rows(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    try:
+        broker = get_stream_broker()
+    except RuntimeError:
+        # Committed outside an app context (scripts); nothing is streaming there
+        return
+    for channel, row_id, recipient_id, recipient_role in pending:
+        broker.publish(channel, row_id, recipient_id, recipient_role)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_new_rows(session):
+    session.info.pop(_PENDING_KEY, None)
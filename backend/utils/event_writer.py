@@ -0,0 +1,200 @@
+"""
+Asynchronous, batched writer for ``ITEvent`` rows.
+
+``log_event`` only builds the row and puts it on a bounded in-process queue;
+a background thread drains the queue, inserts each batch with one
+``executemany`` on its own engine connection and then evaluates alert rules.
+Request latency therefore no longer depends on event logging, and logging
+never commits the caller's session.
+
+When the queue is full the configured policy applies: ``drop`` (default)
+discards the new event, ``block`` waits up to ``IT_EVENT_QUEUE_BLOCK_SECONDS``
+before dropping. Queue depth, drops and flush counters are exposed through
+``EventWriter.metrics()``.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from extensions import db
+from models.it_event import ITEvent
+
+logger = logging.getLogger('it_monitor')
+
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 1.0
+QUEUE_POLICIES = ('drop', 'block')
+
+
+class EventWriter:
+    """Bounded queue of event rows flushed by one daemon thread per app."""
+
+    def __init__(self, app, maxsize=DEFAULT_QUEUE_SIZE, batch_size=DEFAULT_BATCH_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL, policy='drop', block_seconds=0.05):
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"IT_EVENT_QUEUE_POLICY must be one of {', '.join(QUEUE_POLICIES)}.")
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_seconds = block_seconds
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._periodic = []
+        # Updated from request threads and the flusher, so always under _counters_lock
+        self._counters_lock = threading.Lock()
+        self._counters = {'enqueued': 0, 'dropped': 0, 'written': 0, 'batches': 0, 'failed_batches': 0}
+        self._last_flush_at = None
+        self._last_flush_seconds = None
+
+    def submit(self, row):
+        """Queue one event row (a dict of ``ITEvent`` column values); returns False if it was dropped."""
+        self._ensure_started()
+        try:
+            if self.policy == 'block':
+                self._queue.put(row, timeout=self.block_seconds)
+            else:
+                self._queue.put_nowait(row)
+        except queue.Full:
+            self._count(dropped=1)
+            return False
+        self._count(enqueued=1)
+        return True
+
+    def add_periodic(self, collect):
+        """
+        Register ``collect(force)``, called by the flusher at least every
+        ``flush_interval`` inside an app context; the rows it returns are written
+        with the next batch. ``force`` is True on the final call at shutdown.
+        """
+        self._periodic.append(collect)
+        self._ensure_started()
+
+    def flush(self, timeout=5.0):
+        """Wait until every queued event has been written (used by tests and at shutdown)."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return not self._queue.unfinished_tasks
+
+    def stop(self, timeout=5.0):
+        if self._thread is None:
+            return
+        self.flush(timeout)
+        self._stopping.set()
+        try:
+            # Wake the flusher if it is waiting on an empty queue
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+
+    def metrics(self):
+        with self._counters_lock:
+            counters = dict(self._counters)
+        return {
+            'queue_depth': self._queue.qsize(),
+            'queue_max': self._queue.maxsize,
+            'policy': self.policy,
+            'batch_size': self.batch_size,
+            'running': self._thread is not None and self._thread.is_alive(),
+            'last_flush_at': self._last_flush_at,
+            'last_flush_seconds': self._last_flush_seconds,
+            **counters,
+        }
+
+    def _count(self, **increments):
+        with self._counters_lock:
+            for name, amount in increments.items():
+                self._counters[name] += amount
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name='it-event-writer', daemon=True)
+                self._thread.start()
+
+    def _next_batch(self):
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _discard_wakeups(self, batch):
+        rows = [row for row in batch if row is not None]
+        for _ in range(len(batch) - len(rows)):
+            self._queue.task_done()
+        return rows
+
+    def _run(self):
+        while True:
+            queued = self._discard_wakeups(self._next_batch())
+            final = self._stopping.is_set() and self._queue.empty()
+            try:
+                with self.app.app_context():
+                    batch = queued + self._collect_periodic(force=final)
+                    if batch:
+                        self._write(batch)
+            except Exception:
+                self._count(failed_batches=1)
+                logger.exception("Failed to write %d IT events", len(queued))
+            finally:
+                for _ in queued:
+                    self._queue.task_done()
+            if final:
+                break
+
+    def _collect_periodic(self, force=False):
+        rows = []
+        for collect in self._periodic:
+            try:
+                rows.extend(collect(force))
+            except Exception:
+                logger.exception("Periodic IT event source failed")
+        return rows
+
+    def _write(self, batch):
+        started = time.monotonic()
+        with db.engine.begin() as connection:
+            connection.execute(ITEvent.__table__.insert(), batch)
+        self._count(written=len(batch), batches=1)
+        self._last_flush_at = time.time()
+        self._last_flush_seconds = round(time.monotonic() - started, 4)
+
+        from utils.it_monitor import check_alert_rules
+        try:
+            for row in batch:
+                check_alert_rules(ITEvent(**row))
+        finally:
+            db.session.remove()
+
+
+def init_event_writer(app):
+    """Attach an ``EventWriter`` configured from ``IT_EVENT_*`` settings to ``app``."""
+    writer = EventWriter(
+        app,
+        maxsize=app.config.get('IT_EVENT_QUEUE_SIZE', DEFAULT_QUEUE_SIZE),
+        batch_size=app.config.get('IT_EVENT_BATCH_SIZE', DEFAULT_BATCH_SIZE),
+        flush_interval=app.config.get('IT_EVENT_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL),
+        policy=app.config.get('IT_EVENT_QUEUE_POLICY', 'drop'),
+        block_seconds=app.config.get('IT_EVENT_QUEUE_BLOCK_SECONDS', 0.05),
+    )
+    app.extensions['it_event_writer'] = writer
+    atexit.register(writer.stop)
+    return writer
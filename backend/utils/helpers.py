@@ -1,7 +1,11 @@
+import base64
+import json
+from datetime import date, datetime
 from flask import jsonify
 from flask_jwt_extended import get_jwt_identity
-from models.user import User
+from utils.user_cache import load_user
 from extensions import db
+from sqlalchemy import case, cast, tuple_
 import logging
 
 logger = logging.getLogger('helpers')
@@ -16,6 +20,108 @@ def make_response_data(data=None, success=True, message="", errors=None, status_
     }
     return response, status_code
 
+def safe_float(value, default=0.0):
+    """Convert a DB value (float, Decimal or numeric text) to float, falling back to ``default``."""
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+def encode_cursor(*values):
+    """Encode keyset pagination values (already JSON-serializable) as an opaque URL-safe token."""
+    raw = json.dumps(list(values), separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor, size):
+    """Decode a token from ``encode_cursor``; raises ValueError unless it holds ``size`` values."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor.")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor.")
+    return values
+
+def month_bucket(column):
+    """SQL expression formatting a date column as 'YYYY-MM' on both PostgreSQL and SQLite."""
+    if db.engine.dialect.name == 'postgresql':
+        return db.func.to_char(column, 'YYYY-MM')
+    return db.func.strftime('%Y-%m', column)
+
+# Text float() would read: optional sign, digits with an optional fraction, optional exponent
+NUMERIC_TEXT_PATTERN = r'^\s*[+-]?([0-9]+(\.[0-9]*)?|\.[0-9]+)([eE][+-]?[0-9]+)?\s*$'
+
+def numeric_text(column):
+    """
+    SQL float of a numeric text column, NULL where the text is not a number
+    (like ``safe_float``), so one bad value cannot fail a PostgreSQL cast.
+    """
+    return case(
+        (column.regexp_match(NUMERIC_TEXT_PATTERN), cast(db.func.trim(column), db.Float)),
+        else_=None
+    )
+
+def contains_pattern(text):
+    """ILIKE pattern matching ``text`` anywhere, with ``%`` and ``_`` taken literally (escape ``\\``)."""
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+COUNT_MODES = ('exact', 'approx', 'none')
+
+def count_rows(query, mode='exact'):
+    """
+    Total for a list endpoint. ``mode`` is ``exact`` (one COUNT), ``approx`` (the
+    PostgreSQL planner's row estimate, no scan; exact elsewhere) or ``none``.
+    Returns ``(total, is_estimate)``; total is None for ``none``.
+    """
+    if mode == 'none':
+        return None, False
+    if mode == 'approx' and db.engine.dialect.name == 'postgresql':
+        compiled = query.order_by(None).statement.compile(dialect=db.engine.dialect)
+        plan = db.session.connection().exec_driver_sql(
+            'EXPLAIN (FORMAT JSON) ' + compiled.string, compiled.params
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows']), True
+    return query.order_by(None).count(), False
+
+def keyset_page(query, order_columns, limit, cursor=None, offset=0):
+    """
+    Newest-first page of ``query`` ordered by ``order_columns`` (e.g. timestamp, id).
+    With a ``cursor`` from a previous page it seeks past that row through the index;
+    otherwise it skips ``offset`` rows. Returns ``(rows, next_cursor)``; raises
+    ValueError for a malformed cursor.
+    """
+    if cursor:
+        values = []
+        for column, value in zip(order_columns, decode_cursor(cursor, len(order_columns))):
+            python_type = column.type.python_type
+            if python_type is datetime:
+                values.append(datetime.fromisoformat(value))
+            elif python_type is date:
+                values.append(date.fromisoformat(value))
+            else:
+                values.append(python_type(value))
+        query = query.filter(tuple_(*order_columns) < tuple(values))
+    query = query.order_by(*[column.desc() for column in order_columns])
+    if offset and not cursor:
+        query = query.offset(offset)
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(*[
+            value.isoformat() if isinstance(value, date) else value
+            for value in (getattr(last, column.key) for column in order_columns)
+        ])
+    return rows, next_cursor
+
 def get_current_user():
     """Get the current authenticated user from JWT identity."""
     try:
@@ -25,16 +131,8 @@ def get_current_user():
         if user_id is None:
             return None
         
-        # Convert string ID back to int for SQLAlchemy query.get() which expects the PK type
-        try:
-            user_id = int(user_id)
-        except (TypeError, ValueError):
-            logger.warning(f"Could not convert user_id to int: {user_id}")
-            return None
-        
-        # Query the user from database
-        user = User.query.get(user_id)
-        return user
+        # Normalizes the identity; memoized per request and cached across requests (utils/user_cache.py)
+        return load_user(user_id)
         
     except Exception as e:
         logger.error(f"Error in get_current_user(): {str(e)}")
@@ -0,0 +1,220 @@
+"""
+Monthly partitions, retention and archives for ``it_event``.
+
+On PostgreSQL ``it_event`` is range-partitioned by ``timestamp`` into one
+table per month (``it_event_y2025m01`` ...) plus a default partition, so
+queries with a recent ``timestamp`` bound only scan recent partitions. On
+SQLite (local dev, tests) the table stays whole and each month is handled as a
+date-range shard of it.
+
+Retention exports every month older than ``IT_EVENT_RETENTION_MONTHS`` to a
+gzip-compressed JSONL file in ``IT_EVENT_ARCHIVE_DIR``, deletes the exported
+rows and drops the emptied partition. ``iter_archived_events`` reads the
+archives back for on-demand queries.
+"""
+
+import gzip
+import json
+import os
+import re
+from datetime import date, datetime
+
+from sqlalchemy import text, tuple_
+
+from extensions import db
+from models.it_event import ITEvent
+from utils.helpers import month_bucket
+
+ARCHIVE_PREFIX = 'it_event_'
+ARCHIVE_SUFFIX = '.jsonl.gz'
+_MONTH = re.compile(r'^\d{4}-\d{2}$')
+_PARTITION = re.compile(r'^it_event_y(\d{4})m(\d{2})$')
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def parse_month(value):
+    """Parse ``'YYYY-MM'``; raises ValueError."""
+    if not value or not _MONTH.match(value):
+        raise ValueError("Months use YYYY-MM format.")
+    return datetime.strptime(value, '%Y-%m').date()
+
+
+def partition_name(month):
+    return f"it_event_y{month.year:04d}m{month.month:02d}"
+
+
+def archive_path(archive_dir, month):
+    return os.path.join(archive_dir, f"{ARCHIVE_PREFIX}{month.strftime('%Y-%m')}{ARCHIVE_SUFFIX}")
+
+
+def _is_postgres():
+    return db.engine.dialect.name == 'postgresql'
+
+
+def is_partitioned():
+    """True when ``it_event`` is a partitioned table (PostgreSQL after the partitioning migration)."""
+    if not _is_postgres():
+        return False
+    return db.session.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('it_event')"
+    )).first() is not None
+
+
+def ensure_partitions(months_ahead=2, today=None):
+    """Create partitions for the current month and ``months_ahead`` following months; returns names created."""
+    if not is_partitioned():
+        return []
+    current = month_start(today or date.today())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        exists = db.session.execute(text("SELECT to_regclass(:name)"), {'name': name}).scalar()
+        if exists:
+            continue
+        db.session.execute(text(
+            f"CREATE TABLE {name} PARTITION OF it_event "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        ))
+        created.append(name)
+    db.session.commit()
+    return created
+
+
+def stored_months():
+    """First day of every month that still has events in the database, oldest first."""
+    if is_partitioned():
+        # Read the partition catalog instead of scanning the events
+        names = db.session.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'it_event'::regclass"
+        )).scalars().all()
+        months = {date(int(m[1]), int(m[2]), 1) for m in (_PARTITION.match(n) for n in names) if m}
+        months.update(parse_month(value) for value in db.session.execute(text(
+            "SELECT DISTINCT to_char(\"timestamp\", 'YYYY-MM') FROM it_event_default"
+        )).scalars())
+        return sorted(months)
+    bucket = month_bucket(ITEvent.timestamp)
+    rows = db.session.query(bucket).distinct().all()
+    return sorted(parse_month(row[0]) for row in rows if row[0])
+
+
+def _row_to_json(row):
+    record = {}
+    for column in ITEvent.__table__.columns:
+        value = getattr(row, column.name)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif hasattr(value, 'value'):
+            value = value.value
+        record[column.name] = value
+    return record
+
+
+def archive_month(month, archive_dir, batch_size=1000):
+    """
+    Export one month of events to its JSONL archive and remove them from the database.
+    Only the exported rows are deleted (by id, batch by batch), so events committed
+    while the export runs stay for the next run; the month's partition is dropped
+    only once it is empty. Re-archiving a month appends a new gzip member to the
+    existing file. Returns the number of events archived.
+    """
+    start, end = month, add_months(month, 1)
+    os.makedirs(archive_dir, exist_ok=True)
+    final_path = archive_path(archive_dir, month)
+    temp_path = final_path + '.tmp'
+
+    # Plain rows, not ORM objects, so the session does not fill up with the month
+    in_month = db.session.query(*ITEvent.__table__.columns).filter(
+        ITEvent.timestamp >= start, ITEvent.timestamp < end
+    )
+    exported = []
+    count = 0
+    last_key = None
+    with gzip.open(temp_path, 'wt', encoding='utf-8') as archive:
+        while True:
+            # Keyset batches: no cursor stays open across the deletes
+            query = in_month
+            if last_key is not None:
+                query = query.filter(tuple_(ITEvent.timestamp, ITEvent.id) > last_key)
+            rows = query.order_by(ITEvent.timestamp, ITEvent.id).limit(batch_size).all()
+            if not rows:
+                break
+            for row in rows:
+                archive.write(json.dumps(_row_to_json(row), separators=(',', ':')) + '\n')
+            exported.append([row.id for row in rows])
+            count += len(rows)
+            last_key = (rows[-1].timestamp, rows[-1].id)
+    if count == 0:
+        os.remove(temp_path)
+    elif os.path.exists(final_path):
+        # Concatenated gzip members read back as one stream
+        with open(final_path, 'ab') as target, open(temp_path, 'rb') as source:
+            target.write(source.read())
+        os.remove(temp_path)
+    else:
+        os.replace(temp_path, final_path)
+
+    # Committed together once the archive file is in place
+    for ids in exported:
+        ITEvent.query.filter(ITEvent.id.in_(ids)).delete(synchronize_session=False)
+    name = partition_name(month)
+    if is_partitioned() and db.session.execute(text("SELECT to_regclass(:name)"), {'name': name}).scalar():
+        if db.session.execute(text(f"SELECT 1 FROM {name} LIMIT 1")).first() is None:
+            db.session.execute(text(f"ALTER TABLE it_event DETACH PARTITION {name}"))
+            db.session.execute(text(f"DROP TABLE {name}"))
+    db.session.commit()
+    return count
+
+
+def apply_retention(retention_months, archive_dir, today=None):
+    """Archive and drop every month older than the last ``retention_months``; returns ``{month: count}``."""
+    cutoff = add_months(month_start(today or date.today()), -retention_months + 1)
+    archived = {}
+    for month in stored_months():
+        if month < cutoff:
+            archived[month.strftime('%Y-%m')] = archive_month(month, archive_dir)
+    return archived
+
+
+def archived_months(archive_dir):
+    if not os.path.isdir(archive_dir):
+        return []
+    months = []
+    for filename in os.listdir(archive_dir):
+        if filename.startswith(ARCHIVE_PREFIX) and filename.endswith(ARCHIVE_SUFFIX):
+            try:
+                months.append(parse_month(filename[len(ARCHIVE_PREFIX):-len(ARCHIVE_SUFFIX)]))
+            except ValueError:
+                continue
+    return sorted(months)
+
+
+def iter_archived_events(archive_dir, start_month, end_month, event_types=None, severities=None,
+                         user_email=None, start=None, end=None):
+    """Yield archived event dicts between two months (inclusive) that match the filters, oldest first."""
+    for month in archived_months(archive_dir):
+        if month < start_month or month > end_month:
+            continue
+        with gzip.open(archive_path(archive_dir, month), 'rt', encoding='utf-8') as archive:
+            for line in archive:
+                event = json.loads(line)
+                if event_types and event['event_type'] not in event_types:
+                    continue
+                if severities and event['severity'] not in severities:
+                    continue
+                if user_email and event['user_email'] != user_email:
+                    continue
+                timestamp = datetime.fromisoformat(event['timestamp'])
+                if (start and timestamp < start) or (end and timestamp > end):
+                    continue
+                event['timestamp'] = event['timestamp'] + 'Z'
+                yield event
@@ -0,0 +1,120 @@
+"""
+Full-text search over ``ITEvent.summary``, ``server_logs`` and ``stack_trace``.
+
+On PostgreSQL ``it_event`` carries a generated ``search_vector`` tsvector
+(summary weighted above server logs above stack traces) with a GIN index;
+``q`` is parsed with ``websearch_to_tsquery`` so quoted phrases, ``or`` and
+``-word`` work. On SQLite an external-content FTS5 table, ``it_event_fts``, is
+kept in sync by triggers; every word in ``q`` must match. Both are created by
+migration ``777fa4c09e44`` and, for fresh databases, by ``db.create_all()``.
+
+SQLite batch migrations that rebuild ``it_event`` drop the triggers; run
+``rebuild_search_index()`` afterwards.
+"""
+
+import html
+import re
+
+from sqlalchemy import DDL, event, false, func, literal_column, table, column, text
+
+from extensions import db
+from models.it_event import ITEvent
+
+SEARCH_CONFIG = 'english'
+# Highlight markers; snippets are HTML-escaped and the markers turned into <mark> tags
+_START, _STOP = '\x02', '\x03'
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+_PG_DDL = [
+    "ALTER TABLE it_event ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(summary, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(server_logs, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(stack_trace, '')), 'C')) STORED",
+    "CREATE INDEX ix_it_event_search_vector ON it_event USING GIN (search_vector)",
+]
+
+_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE it_event_fts USING fts5("
+    "summary, server_logs, stack_trace, content='it_event', tokenize='porter unicode61')",
+    "CREATE TRIGGER it_event_fts_ai AFTER INSERT ON it_event BEGIN "
+    "INSERT INTO it_event_fts(rowid, summary, server_logs, stack_trace) "
+    "VALUES (new.rowid, new.summary, new.server_logs, new.stack_trace); END",
+    "CREATE TRIGGER it_event_fts_ad AFTER DELETE ON it_event BEGIN "
+    "INSERT INTO it_event_fts(it_event_fts, rowid, summary, server_logs, stack_trace) "
+    "VALUES ('delete', old.rowid, old.summary, old.server_logs, old.stack_trace); END",
+    "CREATE TRIGGER it_event_fts_au AFTER UPDATE ON it_event BEGIN "
+    "INSERT INTO it_event_fts(it_event_fts, rowid, summary, server_logs, stack_trace) "
+    "VALUES ('delete', old.rowid, old.summary, old.server_logs, old.stack_trace); "
+    "INSERT INTO it_event_fts(rowid, summary, server_logs, stack_trace) "
+    "VALUES (new.rowid, new.summary, new.server_logs, new.stack_trace); END",
+]
+
+for _statement in _PG_DDL:
+    event.listen(ITEvent.__table__, 'after_create', DDL(_statement).execute_if(dialect='postgresql'))
+for _statement in _SQLITE_DDL:
+    event.listen(ITEvent.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+event.listen(ITEvent.__table__, 'before_drop',
+             DDL("DROP TABLE IF EXISTS it_event_fts").execute_if(dialect='sqlite'))
+
+_fts = table('it_event_fts', column('rowid'))
+
+
+def _fts5_query(q):
+    """Quote every word so FTS5 operators and punctuation in user input are taken literally."""
+    return ' '.join('"%s"' % word for word in _WORD.findall(q))
+
+
+def search_events(query, q):
+    """
+    Restrict an ``ITEvent`` query to events matching ``q``.
+    Returns ``(matched, ranked)``: ``matched`` for counting, ``ranked`` yielding
+    ``(event, rank, snippet)`` best match first (higher rank is better).
+    """
+    if db.engine.dialect.name == 'postgresql':
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        vector = literal_column('it_event.search_vector')
+        matched = query.filter(vector.op('@@')(tsquery))
+        rank = func.ts_rank_cd(vector, tsquery)
+        snippet = func.ts_headline(
+            SEARCH_CONFIG,
+            func.concat_ws(' ... ', ITEvent.summary, ITEvent.server_logs, ITEvent.stack_trace),
+            tsquery,
+            f'StartSel="{_START}", StopSel="{_STOP}", MaxFragments=2, MaxWords=20, MinWords=5',
+        )
+    else:
+        fts_query = _fts5_query(q)
+        if not fts_query:
+            matched = query.filter(false())
+            return matched, matched.add_columns(literal_column('0'), literal_column("''"))
+        matched = query.join(_fts, _fts.c.rowid == literal_column('it_event.rowid')).filter(
+            text('it_event_fts MATCH :search_query').bindparams(search_query=fts_query)
+        )
+        # bm25 is lower-is-better; column weights mirror the PostgreSQL A/B/C weights
+        rank = -func.bm25(literal_column('it_event_fts'), 10.0, 4.0, 1.0)
+        snippet = func.snippet(literal_column('it_event_fts'), -1, _START, _STOP, '...', 16)
+
+    rank = rank.label('search_rank')
+    ranked = matched.add_columns(rank, snippet.label('search_snippet')).order_by(
+        rank.desc(), ITEvent.timestamp.desc(), ITEvent.id.desc()
+    )
+    return matched, ranked
+
+
+def highlight(snippet):
+    """HTML-safe snippet with matches wrapped in ``<mark>``."""
+    if not snippet:
+        return None
+    return html.escape(snippet).replace(_START, '<mark>').replace(_STOP, '</mark>')
+
+
+def rebuild_search_index():
+    """Recreate the SQLite FTS table and triggers from ``it_event`` (no-op on PostgreSQL)."""
+    if db.engine.dialect.name != 'sqlite':
+        return
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql("DROP TABLE IF EXISTS it_event_fts")
+        for name in ('it_event_fts_ai', 'it_event_fts_ad', 'it_event_fts_au'):
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+        for statement in _SQLITE_DDL:
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql("INSERT INTO it_event_fts(it_event_fts) VALUES ('rebuild')")
@@ -8,14 +8,20 @@ from flask import request, current_app
 from models.it_event import ITEvent, EventType, Severity
 from models.it_alert import ITAlert, AlertSeverity
 from models.user import User
+from models.revoked_token import RevokedToken
 from extensions import db
+from utils.event_writer import init_event_writer
+from utils.alert_rules import init_alert_rules
+from utils.error_aggregator import init_api_error_aggregator
+from utils.token_revocation import revoke_user_tokens
 
 
 def log_event(event_type, severity=Severity.INFO, user_email=None, user_id=None,
               ip=None, device=None, resource=None, summary=None, payload=None,
               server_logs=None, stack_trace=None, related_event_ids=None):
     """
-    Log an IT event to the database.
+    Queue an IT event for the background writer (see ``utils.event_writer``).
+    Alert rules are evaluated by the writer once the event is stored.
     """
     if not ip:
         ip = request.remote_addr if request else None
@@ -24,95 +30,64 @@ def log_event(event_type, severity=Severity.INFO, user_email=None, user_id=None,
     if not resource:
         resource = request.path if request else None
 
-    event_id = f"evt_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}"
-
-    event = ITEvent(
-        id=event_id,
-        user_email=user_email,
-        user_id=user_id,
-        event_type=event_type,
-        severity=severity,
-        ip=ip,
-        device=device,
-        resource=resource,
-        summary=summary,
-        payload=payload,
-        server_logs=server_logs,
-        stack_trace=stack_trace,
-        related_event_ids=related_event_ids
-    )
-
-    db.session.add(event)
-    db.session.commit()
+    now = datetime.utcnow()
+    event_id = f"evt_{now.strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}"
+
+    row = {
+        'id': event_id,
+        'timestamp': now,
+        'user_email': user_email,
+        'user_id': user_id,
+        'event_type': event_type,
+        'severity': severity,
+        'ip': ip,
+        'device': device,
+        'resource': resource,
+        'summary': summary,
+        'payload': payload,
+        'server_logs': server_logs,
+        'stack_trace': stack_trace,
+        'related_event_ids': related_event_ids,
+        # Every row in a writer batch carries the same keys (one executemany)
+        'occurrence_count': 1,
+        'first_seen_at': None,
+        'last_seen_at': None
+    }
+    get_event_writer().submit(row)
+    return ITEvent(**row)
 
-    # Check for alerts based on rules
-    check_alert_rules(event)
 
-    return event
+def get_event_writer():
+    """The current app's event writer, created on first use if the app did not set one up."""
+    writer = current_app.extensions.get('it_event_writer')
+    if writer is None:
+        writer = init_event_writer(current_app._get_current_object())
+    return writer
 
 
 def check_alert_rules(new_event):
     """
     Check if the new event triggers any alert rules.
+    Counting happens in memory (see ``utils.alert_windows``), not in the database.
     """
     rules = current_app.config.get('ALERT_RULES', {})
 
-    for rule_name, rule_config in rules.items():
-        if should_trigger_alert(rule_name, rule_config, new_event):
-            create_alert_from_rule(rule_name, rule_config, new_event)
-
-
-def should_trigger_alert(rule_name, rule_config, event):
-    """
-    Determine if an alert should be triggered based on the rule.
-    """
-    condition = rule_config['condition']
-
-    if rule_name == 'failed_login_burst':
-        if event.event_type == EventType.FAILED_LOGIN:
-            # Check for >=5 failed logins from same IP within 15 minutes
-            fifteen_min_ago = datetime.utcnow() - timedelta(minutes=15)
-            count = ITEvent.query.filter(
-                ITEvent.event_type == EventType.FAILED_LOGIN,
-                ITEvent.ip == event.ip,
-                ITEvent.timestamp >= fifteen_min_ago
-            ).count()
-            return count >= 5
-
-    elif rule_name == 'mass_data_export':
-        if event.event_type == EventType.DATA_EXPORT:
-            # Check if export size >1GB and user is not admin
-            export_size = event.payload.get('export_size_mb', 0) if event.payload else 0
-            if export_size > 1024:  # 1GB = 1024MB
-                # Convert string ID back to int for SQLAlchemy query.get()
-                event_user_id = event.user_id
-                if event_user_id is not None:
-                    try:
-                        event_user_id = int(event_user_id)
-                    except (TypeError, ValueError):
-                        pass
-                user = User.query.get(event_user_id)
-                return user and user.role.value not in ['admin', 'it']
+    for rule, event_ids in get_alert_engine().process(new_event):
+        create_alert_from_rule(rule.name, rules[rule.name], new_event, event_ids, rule.window_seconds)
 
-    elif rule_name == 'api_error_burst':
-        if event.event_type == EventType.API_ERROR:
-            # Check for >=10 API errors within 5 minutes
-            five_min_ago = datetime.utcnow() - timedelta(minutes=5)
-            count = ITEvent.query.filter(
-                ITEvent.event_type == EventType.API_ERROR,
-                ITEvent.timestamp >= five_min_ago
-            ).count()
-            return count >= 10
 
-    elif rule_name == 'permission_change':
-        return event.event_type == EventType.PERMISSION_CHANGE
+def get_alert_engine():
+    """The current app's alert rule engine, compiled from ``ALERT_RULES`` if the app did not set one up."""
+    engine = current_app.extensions.get('it_alert_engine')
+    if engine is None:
+        engine = init_alert_rules(current_app._get_current_object())
+    return engine
 
-    return False
 
-
-def create_alert_from_rule(rule_name, rule_config, triggering_event):
+def create_alert_from_rule(rule_name, rule_config, triggering_event, event_ids=None, window_seconds=0):
     """
-    Create an alert based on a triggered rule.
+    Create an alert based on a triggered rule, then run its actions
+    (``ALERT_ACTIONS``) with the rule's window.
     """
     severity_map = {
         'info': AlertSeverity.LOW,
@@ -123,45 +98,65 @@ def create_alert_from_rule(rule_name, rule_config, triggering_event):
 
     severity = severity_map.get(rule_config['severity'], AlertSeverity.MEDIUM)
 
-    # Gather related events
-    related_events = get_related_events_for_rule(rule_name, triggering_event)
-
     alert = ITAlert(
-        event_ids=[e.id for e in related_events],
+        event_ids=event_ids or [triggering_event.id],
         title=get_alert_title(rule_name),
         description=get_alert_description(rule_name, triggering_event),
         severity=severity,
         suggested_actions=rule_config.get('actions', [])
     )
 
+    # Committing publishes the alert to /api/stream subscribers (utils.event_stream)
     db.session.add(alert)
     db.session.commit()
 
-    # TODO: Send real-time notification via WebSocket
-    # socketio.emit('new_alert', alert.to_dict())
+    for action in rule_config.get('actions', []):
+        handler = ALERT_ACTIONS.get(action)
+        if handler is not None:
+            handler(triggering_event, alert.event_ids, window_seconds)
 
 
-def get_related_events_for_rule(rule_name, triggering_event):
-    """
-    Get related events for the alert.
-    """
-    if rule_name == 'failed_login_burst':
-        fifteen_min_ago = datetime.utcnow() - timedelta(minutes=15)
-        return ITEvent.query.filter(
-            ITEvent.event_type == EventType.FAILED_LOGIN,
-            ITEvent.ip == triggering_event.ip,
-            ITEvent.timestamp >= fifteen_min_ago
-        ).all()
+# Shortest gap between two forced resets of one account
+FORCED_RESET_MIN_INTERVAL_SECONDS = 15 * 60
 
-    elif rule_name == 'api_error_burst':
-        five_min_ago = datetime.utcnow() - timedelta(minutes=5)
-        return ITEvent.query.filter(
-            ITEvent.event_type == EventType.API_ERROR,
-            ITEvent.timestamp >= five_min_ago
-        ).all()
 
-    else:
-        return [triggering_event]
+def force_password_reset(triggering_event, event_ids, window_seconds=0):
+    """
+    Revoke every token of the existing accounts targeted by the triggering events
+    and make them change password at next login (``is_first_login``).
+
+    The emails are whatever was typed at the login form, so one account is reset
+    at most once per alert window (``FORCED_RESET_MIN_INTERVAL_SECONDS`` at
+    least): later firings, e.g. the same emails from other IPs, skip accounts
+    already reset within it instead of logging them out again.
+    """
+    emails = {triggering_event.user_email} if triggering_event.user_email else set()
+    if event_ids:
+        emails.update(email for (email,) in db.session.query(ITEvent.user_email)
+                      .filter(ITEvent.id.in_(event_ids), ITEvent.user_email.isnot(None)).distinct())
+    if not emails:
+        return
+    users = User.query.filter(User.email.in_(emails)).all()
+    if not users:
+        return
+    since = datetime.utcnow() - timedelta(seconds=max(window_seconds, FORCED_RESET_MIN_INTERVAL_SECONDS))
+    recently_reset = {user_id for (user_id,) in db.session.query(RevokedToken.user_id).filter(
+        RevokedToken.user_id.in_([user.id for user in users]),
+        RevokedToken.jti.is_(None),
+        RevokedToken.reason == 'force_password_reset',
+        RevokedToken.revoked_at >= since
+    )}
+    for user in users:
+        if user.id in recently_reset:
+            continue
+        user.is_first_login = True
+        revoke_user_tokens(user, reason='force_password_reset')
+
+
+# Actions run when a rule fires; the rest are suggestions shown on the alert
+ALERT_ACTIONS = {
+    'force_password_reset': force_password_reset,
+}
 
 
 def get_alert_title(rule_name):
@@ -206,6 +201,19 @@ def log_login_success(user):
     )
 
 
+def log_logout(user):
+    """
+    Log logout.
+    """
+    log_event(
+        event_type=EventType.LOGOUT,
+        severity=Severity.INFO,
+        user_email=user.email,
+        user_id=user.id,
+        summary=f"User {user.email} logged out"
+    )
+
+
 def log_login_failure(email, reason="Invalid credentials"):
     """
     Log failed login attempt.
@@ -220,35 +228,44 @@ def log_login_failure(email, reason="Invalid credentials"):
 
 def log_api_error(resource, error_message, status_code=None):
     """
-    Log API error.
+    Log API error. Identical errors are folded by ``utils.error_aggregator``
+    and written as one event per window.
     """
     from flask_jwt_extended import get_jwt_identity
     user_id = None
-    user = None
     # Avoid JWT lookup for static files or images
     if not (str(resource).startswith('/static') or str(resource).endswith('.png') or str(resource).endswith('.jpg') or str(resource).endswith('.jpeg') or str(resource).endswith('.ico')):
         try:
             user_id = get_jwt_identity()
-            # Convert string ID back to int for SQLAlchemy query.get()
+            # Convert string ID back to int for the user_id column
             if user_id is not None:
                 try:
                     user_id = int(user_id)
                 except (TypeError, ValueError):
                     pass
-            user = User.query.get(user_id) if user_id else None
         except Exception:
             user_id = None
-            user = None
-    log_event(
-        event_type=EventType.API_ERROR,
-        severity=Severity.WARNING,
-        user_email=user.email if user else None,
+    # Group by the route template so /api/inventory/1 and /api/inventory/2 share one entry
+    rule = request.url_rule if request else None
+    get_api_error_aggregator().record(
+        rule.rule if rule is not None else resource,
+        status_code,
+        error_message,
         user_id=user_id,
-        summary=f"API Error: {error_message}",
-        payload={'status_code': status_code, 'error_message': error_message}
+        path=resource,
+        ip=request.remote_addr if request else None,
+        device=request.headers.get('User-Agent') if request else None,
     )
 
 
+def get_api_error_aggregator():
+    """The current app's API error aggregator, created on first use if the app did not set one up."""
+    aggregator = current_app.extensions.get('it_api_error_aggregator')
+    if aggregator is None:
+        aggregator = init_api_error_aggregator(current_app._get_current_object(), get_event_writer())
+    return aggregator
+
+
 def log_permission_change(changed_user_email, changed_by_email, old_perms, new_perms):
     """
     Log permission change.
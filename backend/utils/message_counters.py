@@ -0,0 +1,139 @@
+"""
+Unread message counters for the inbox badge.
+
+A message is listed for its ``recipient_id`` and for every user whose role is
+its ``recipient_role`` (``/api/messages``). ``message_counter`` keeps the number
+of unread messages per key:
+
+* ``user:<id>``: messages addressed to the user;
+* ``role:<role>``: messages addressed to the role;
+* ``user:<id>:role:<role>``: messages addressed to both, which the first two
+  count twice when the user has that role.
+
+A user's unread count is therefore ``user + role - both``, one primary key
+lookup of three rows however many messages there are.
+
+Counters change in the same transaction as the messages. Mapper events adjust
+them for ORM inserts, updates and deletes; bulk ``Query.update`` and
+``Query.delete`` on messages rebuild them from ``message``.
+"""
+
+from sqlalchemy import event, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+
+from extensions import db
+from models.message import Message
+from models.message_counter import MessageCounter
+
+
+def _role_value(role):
+    return getattr(role, 'value', role)
+
+
+def counter_keys(recipient_id, recipient_role):
+    """Counter keys a message to ``recipient_id`` and/or ``recipient_role`` counts towards."""
+    role = _role_value(recipient_role)
+    keys = []
+    if recipient_id is not None:
+        keys.append(f'user:{recipient_id}')
+    if role:
+        keys.append(f'role:{role}')
+    if recipient_id is not None and role:
+        keys.append(f'user:{recipient_id}:role:{role}')
+    return keys
+
+
+def _adjust(connection, deltas):
+    """Add ``{key: delta}`` to the counters, creating missing rows."""
+    table = MessageCounter.__table__
+    for key, delta in deltas.items():
+        if not delta:
+            continue
+        dialect = connection.dialect.name
+        if dialect in ('postgresql', 'sqlite'):
+            insert = (pg_insert if dialect == 'postgresql' else sqlite_insert)(table).values(key=key, unread=delta)
+            connection.execute(insert.on_conflict_do_update(
+                index_elements=[table.c.key],
+                set_={'unread': table.c.unread + insert.excluded.unread}
+            ))
+            continue
+        result = connection.execute(
+            table.update().where(table.c.key == key).values(unread=table.c.unread + delta))
+        if not result.rowcount:
+            connection.execute(table.insert().values(key=key, unread=delta))
+
+
+def _deltas(recipient_id, recipient_role, amount, deltas=None):
+    deltas = {} if deltas is None else deltas
+    for key in counter_keys(recipient_id, recipient_role):
+        deltas[key] = deltas.get(key, 0) + amount
+    return deltas
+
+
+def _previous(target, attribute):
+    history = get_history(target, attribute)
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(target, attribute)
+
+
+def rebuild_message_counters(connection):
+    """Recount every unread message into ``message_counter``."""
+    table = MessageCounter.__table__
+    rows = connection.execute(
+        db.select(Message.recipient_id, Message.recipient_role, func.count(Message.id))
+        .where(Message.is_read.isnot(True))
+        .group_by(Message.recipient_id, Message.recipient_role)
+    ).all()
+    deltas = {}
+    for recipient_id, recipient_role, count in rows:
+        _deltas(recipient_id, recipient_role, count, deltas)
+    connection.execute(table.delete())
+    if deltas:
+        connection.execute(table.insert(), [{'key': key, 'unread': count} for key, count in deltas.items()])
+
+
+def unread_count(user):
+    """Unread messages ``/api/messages`` would list for ``user``."""
+    user_key, role_key, both_key = f'user:{user.id}', None, None
+    role = _role_value(user.role)
+    keys = [user_key]
+    if role:
+        role_key, both_key = f'role:{role}', f'user:{user.id}:role:{role}'
+        keys.extend([role_key, both_key])
+    counts = dict(db.session.query(MessageCounter.key, MessageCounter.unread)
+                  .filter(MessageCounter.key.in_(keys)).all())
+    total = counts.get(user_key, 0) + counts.get(role_key, 0) - counts.get(both_key, 0)
+    return max(total, 0)
+
+
+@event.listens_for(Message, 'after_insert')
+def _count_new_message(mapper, connection, target):
+    if not target.is_read:
+        _adjust(connection, _deltas(target.recipient_id, target.recipient_role, 1))
+
+
+@event.listens_for(Message, 'after_update')
+def _recount_changed_message(mapper, connection, target):
+    deltas = {}
+    if not _previous(target, 'is_read'):
+        _deltas(_previous(target, 'recipient_id'), _previous(target, 'recipient_role'), -1, deltas)
+    if not target.is_read:
+        _deltas(target.recipient_id, target.recipient_role, 1, deltas)
+    _adjust(connection, deltas)
+
+
+@event.listens_for(Message, 'before_delete')
+def _uncount_deleted_message(mapper, connection, target):
+    if not target.is_read:
+        _adjust(connection, _deltas(target.recipient_id, target.recipient_role, -1))
+
+
+@event.listens_for(Session, 'after_bulk_update')
+@event.listens_for(Session, 'after_bulk_delete')
+def _rebuild_after_bulk_changes(context):
+    if context.mapper is not None and context.mapper.class_ is Message:
+        rebuild_message_counters(context.session.connection())
@@ -0,0 +1,85 @@
+"""
+Password hashing off the eventlet hub, with a fixed PBKDF2 cost.
+
+PBKDF2 is pure CPU. Run inline on an eventlet worker it stalls every green
+thread on that worker for the length of the hash. Under eventlet, hashing and
+verification therefore run in eventlet's native thread pool
+(``eventlet.tpool``; ``EVENTLET_THREADPOOL_SIZE`` threads). ``hashlib``
+releases the GIL, so the hub keeps serving other requests meanwhile. Without
+eventlet (tests, the dev server) they simply run inline.
+
+New hashes use ``pbkdf2:sha256`` with the iteration count in
+``PASSWORD_HASH_ITERATIONS``, a fixed value shared by every worker (a
+per-process benchmark would give each worker its own count, and logins would
+rehash users back and forth between them). It never goes below
+``MIN_ITERATIONS``, the current OWASP guidance for PBKDF2-SHA256: a verify
+costs about 2.3x Werkzeug's old 260,000 default, which the thread pool keeps
+off the hub. Tune the count offline with ``scripts/benchmark_login.py``, which
+measures logins per second at the shipped setting and suggests a value for
+the hardware it runs on.
+``needs_rehash`` flags weaker stored hashes, which login upgrades; scrypt
+hashes (Werkzeug 3's default) are left as they are.
+"""
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+HASH_ALGORITHM = 'sha256'
+# OWASP's current minimum for PBKDF2-HMAC-SHA256
+MIN_ITERATIONS = 600000
+# Stronger than the PBKDF2 we write; never downgraded
+KEPT_METHODS = ('scrypt',)
+
+
+def _eventlet_active():
+    try:
+        from eventlet import patcher
+    except ImportError:
+        return False
+    return patcher.is_monkey_patched('thread')
+
+
+def offload(fn, *args):
+    """Run CPU-bound ``fn`` in eventlet's native thread pool when the worker is green, else inline."""
+    if _eventlet_active():
+        from eventlet import tpool
+        return tpool.execute(fn, *args)
+    return fn(*args)
+
+
+def target_iterations():
+    """Iteration count for new hashes: ``PASSWORD_HASH_ITERATIONS``, at least ``MIN_ITERATIONS``."""
+    try:
+        from flask import current_app
+        config = current_app.config
+    except RuntimeError:
+        config = {}
+    return max(int(config.get('PASSWORD_HASH_ITERATIONS') or 0), MIN_ITERATIONS)
+
+
+def hash_password(password):
+    method = f'pbkdf2:{HASH_ALGORITHM}:{target_iterations()}'
+    return offload(generate_password_hash, password, method)
+
+
+def verify_password(password_hash, password):
+    if not password_hash:
+        return False
+    return offload(check_password_hash, password_hash, password)
+
+
+def needs_rehash(password_hash):
+    """
+    True when ``password_hash`` is not pbkdf2:sha256 with at least the target
+    iterations; scrypt hashes are never downgraded to PBKDF2.
+    """
+    if not password_hash:
+        return False
+    method = password_hash.split('$', 1)[0].split(':')
+    if method[0] in KEPT_METHODS:
+        return False
+    if len(method) != 3 or method[0] != 'pbkdf2' or method[1] != HASH_ALGORITHM:
+        return True
+    try:
+        return int(method[2]) < target_iterations()
+    except ValueError:
+        return True
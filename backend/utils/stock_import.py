@@ -0,0 +1,388 @@
+"""
+Streaming CSV/XLSX import of stock takes and stock movements.
+
+Rows are read one at a time (``csv`` reader or openpyxl read-only mode),
+validated, and written in chunks of ``IMPORT_BATCH_SIZE``, each in its own
+transaction. Memory is bounded by the chunk size rather than the file length.
+If the file turns unreadable part-way, committed chunks stay and the report
+(``complete``/``error``) says how far the import got.
+Balances follow the same ledger rules as ``utils.stock_ledger``: every quantity
+change is a ``StockMovement`` applied while the inventory rows are locked.
+"""
+
+import csv
+import io
+import logging
+from datetime import date as date_type, datetime
+
+import openpyxl
+
+from extensions import db
+from models.inventory import Inventory
+from models.inventory_snapshot import InventorySnapshot
+from models.stock_movement import StockMovement
+from utils.stock_ledger import ADJUST_TYPE, MOVEMENT_TYPES, signed_quantity
+
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 200
+IMPORT_KINDS = ('inventory', 'movements')
+UNREADABLE_ROW_MESSAGE = "Could not read this row."
+BATCH_FAILED_MESSAGE = "Not saved: the batch containing this row could not be written."
+
+logger = logging.getLogger('stock_import')
+
+REQUIRED_COLUMNS = {
+    'inventory': ('name', 'fruit_type', 'quantity'),
+    'movements': ('movement_type', 'quantity', 'date'),
+}
+
+
+class ImportFileError(ValueError):
+    """The upload cannot be read (unsupported type, bad header, undecodable content)."""
+
+
+class RowError(ValueError):
+    """A row that fails validation; the message is shown to the user."""
+
+
+def _normalize_header(value):
+    return str(value or '').strip().lower().replace(' ', '_')
+
+
+def iter_upload_rows(file_storage):
+    """Yield ``(row_number, {column: value})`` from an uploaded CSV or XLSX file, skipping blank rows."""
+    filename = (file_storage.filename or '').lower()
+    workbook = None
+    if filename.endswith('.csv'):
+        reader = csv.reader(io.TextIOWrapper(file_storage.stream, encoding='utf-8-sig', newline=''))
+    elif filename.endswith('.xlsx'):
+        try:
+            workbook = openpyxl.load_workbook(file_storage.stream, read_only=True, data_only=True)
+        except Exception:
+            raise ImportFileError("Could not read the XLSX file.")
+        reader = workbook.active.iter_rows(values_only=True)
+    else:
+        raise ImportFileError("Unsupported file type. Upload a .csv or .xlsx file.")
+
+    try:
+        header = [_normalize_header(value) for value in next(reader, None) or ()]
+        if not any(header):
+            raise ImportFileError("The file has no header row.")
+        for row_number, values in enumerate(reader, start=2):
+            if all(value is None or str(value).strip() == '' for value in values):
+                continue
+            yield row_number, dict(zip(header, values))
+    except (UnicodeDecodeError, csv.Error):
+        raise ImportFileError("Could not read the CSV file. Save it as UTF-8.")
+    finally:
+        if workbook is not None:
+            workbook.close()
+
+
+def _text(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _number(row, column, required=False):
+    value = row.get(column)
+    if value is None or str(value).strip() == '':
+        if required:
+            raise RowError(f"{column} is required.")
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace(',', '').strip())
+    except ValueError:
+        raise RowError(f"{column} must be a number.")
+
+
+def _date(row, column, required=False):
+    value = row.get(column)
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date_type):
+        return value
+    value = _text(value)
+    if value is None:
+        if required:
+            raise RowError(f"{column} is required.")
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise RowError(f"{column} must be a date in YYYY-MM-DD format.")
+
+
+def _name_key(name):
+    return name.strip().casefold()
+
+
+class StockImport:
+    """
+    One import run. ``kind`` is ``'inventory'`` (stock take: each row sets an
+    item's balance, creating the item if the name is new) or ``'movements'``
+    (each row is a stock movement against an item given by name or id).
+    """
+
+    def __init__(self, kind, added_by, dry_run=False, batch_size=IMPORT_BATCH_SIZE):
+        if kind not in IMPORT_KINDS:
+            raise ImportFileError(f"Unknown import type. Allowed: {', '.join(IMPORT_KINDS)}.")
+        self.kind = kind
+        self.added_by = added_by
+        self.dry_run = dry_run
+        self.batch_size = batch_size
+        self.today = date_type.today()
+        self.rows = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+        # Set when the file stops being readable after earlier chunks were saved
+        self.error = None
+        self._load_lookup()
+
+    def _load_lookup(self):
+        """Map item names to ids in one query; names shared by several items map to None (ambiguous)."""
+        self.ids_by_name = {}
+        self.known_ids = set()
+        for item_id, name in db.session.query(Inventory.id, Inventory.name):
+            key = _name_key(name)
+            self.ids_by_name[key] = None if key in self.ids_by_name else item_id
+            self.known_ids.add(item_id)
+
+    def _fail(self, row_number, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row_number, 'error': message})
+
+    def run(self, rows):
+        """
+        Consume ``(row_number, row)`` pairs and return the import report.
+
+        Raises ImportFileError when the file is unreadable before anything was
+        saved. If it becomes unreadable later, the chunks already committed
+        stay, the pending chunk is dropped, and the report says where it stopped.
+        """
+        missing_checked = False
+        chunk = []
+        last_row = 1
+        try:
+            for row_number, row in rows:
+                last_row = row_number
+                if not missing_checked:
+                    missing = [c for c in REQUIRED_COLUMNS[self.kind] if c not in row]
+                    if self.kind == 'movements' and 'inventory' not in row and 'inventory_id' not in row:
+                        missing.append('inventory')
+                    if missing:
+                        raise ImportFileError(f"Missing required columns: {', '.join(missing)}.")
+                    missing_checked = True
+
+                self.rows += 1
+                try:
+                    chunk.append((row_number, self._validate(row)))
+                except RowError as e:
+                    self._fail(row_number, str(e))
+                except (ValueError, TypeError, ArithmeticError):
+                    self._fail(row_number, UNREADABLE_ROW_MESSAGE)
+                if len(chunk) >= self.batch_size:
+                    self._write_chunk(chunk)
+                    chunk = []
+        except ImportFileError as e:
+            if self.dry_run or not self.imported:
+                raise
+            self.error = (
+                f"{e} Reading stopped after row {last_row}: {self.imported} rows saved before "
+                f"that were kept; the {len(chunk)} valid rows read since were not saved."
+            )
+            return self.report()
+        if chunk:
+            self._write_chunk(chunk)
+        return self.report()
+
+    def report(self):
+        return {
+            'kind': self.kind,
+            'dry_run': self.dry_run,
+            'rows': self.rows,
+            'imported': self.imported,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+            'complete': self.error is None,
+            'error': self.error,
+        }
+
+    # -- validation ---------------------------------------------------------
+
+    def _validate(self, row):
+        if self.kind == 'inventory':
+            return self._validate_inventory(row)
+        return self._validate_movement(row)
+
+    def _validate_inventory(self, row):
+        name = _text(row.get('name'))
+        fruit_type = _text(row.get('fruit_type'))
+        if not name:
+            raise RowError("name is required.")
+        if not fruit_type:
+            raise RowError("fruit_type is required.")
+        quantity = _number(row, 'quantity', required=True)
+        if quantity < 0:
+            raise RowError("quantity cannot be negative.")
+        key = _name_key(name)
+        if key in self.ids_by_name and self.ids_by_name[key] is None:
+            raise RowError(f"Several inventory items are named '{name}'.")
+        if key not in self.ids_by_name and self.dry_run:
+            # Later rows with the same name update the item this row would create
+            self.ids_by_name[key] = 0
+        return {
+            'key': key,
+            'name': name,
+            'fruit_type': fruit_type,
+            'quantity': quantity,
+            'unit': _text(row.get('unit')),
+            'location': _text(row.get('location')),
+            'expiry_date': _date(row, 'expiry_date'),
+            'date': _date(row, 'date') or self.today,
+        }
+
+    def _validate_movement(self, row):
+        inventory_id = self._resolve_inventory(row)
+        movement_type = _text(row.get('movement_type'))
+        movement_type = movement_type.lower() if movement_type else None
+        if movement_type not in MOVEMENT_TYPES:
+            raise RowError(f"Invalid movement_type. Allowed: {', '.join(MOVEMENT_TYPES)}.")
+        quantity = _number(row, 'quantity', required=True)
+        if movement_type != ADJUST_TYPE and quantity <= 0:
+            raise RowError("Quantity must be a positive number.")
+        return {
+            'inventory_id': inventory_id,
+            'movement_type': movement_type,
+            'quantity': quantity,
+            'date': _date(row, 'date', required=True),
+            'unit': _text(row.get('unit')),
+            'notes': _text(row.get('notes')),
+            'selling_price': _number(row, 'selling_price'),
+        }
+
+    def _resolve_inventory(self, row):
+        raw_id = _text(row.get('inventory_id'))
+        if raw_id:
+            try:
+                inventory_id = int(float(raw_id))
+            except ValueError:
+                raise RowError("inventory_id must be an integer.")
+            if inventory_id not in self.known_ids:
+                raise RowError(f"Inventory item {inventory_id} not found.")
+            return inventory_id
+        name = _text(row.get('inventory'))
+        if not name:
+            raise RowError("inventory (item name) or inventory_id is required.")
+        key = _name_key(name)
+        if key not in self.ids_by_name:
+            raise RowError(f"Inventory item '{name}' not found.")
+        if self.ids_by_name[key] is None:
+            raise RowError(f"Several inventory items are named '{name}'; use inventory_id.")
+        return self.ids_by_name[key]
+
+    # -- writing ------------------------------------------------------------
+
+    def _write_chunk(self, chunk):
+        if self.dry_run:
+            self.imported += len(chunk)
+            return
+        try:
+            if self.kind == 'inventory':
+                self._write_inventory(chunk)
+            else:
+                self._write_movements(chunk)
+            db.session.commit()
+        except Exception:
+            logger.exception("Stock import batch of %d rows failed", len(chunk))
+            db.session.rollback()
+            # The lookup map may now point at items whose insert was rolled back
+            self._load_lookup()
+            for row_number, _ in chunk:
+                self._fail(row_number, BATCH_FAILED_MESSAGE)
+            return
+        self.imported += len(chunk)
+
+    def _lock_items(self, inventory_ids):
+        """Lock the chunk's inventory rows in id order (consistent order avoids deadlocks)."""
+        if not inventory_ids:
+            return {}
+        items = Inventory.query.filter(Inventory.id.in_(inventory_ids)).order_by(
+            Inventory.id).with_for_update().populate_existing().all()
+        return {item.id: item for item in items}
+
+    def _write_inventory(self, chunk):
+        items = self._lock_items({self.ids_by_name[row['key']] for _, row in chunk
+                                  if self.ids_by_name.get(row['key'])})
+        new_items = {}
+        for _, row in chunk:
+            item_id = self.ids_by_name.get(row['key'])
+            item = items.get(item_id) if item_id else new_items.get(row['key'])
+            if item is None:
+                item = Inventory(name=row['name'], quantity=0.0, fruit_type=row['fruit_type'],
+                                 unit=row['unit'], added_by=self.added_by)
+                db.session.add(item)
+                new_items[row['key']] = item
+            item.fruit_type = row['fruit_type']
+            for field in ('unit', 'location', 'expiry_date'):
+                if row[field] is not None:
+                    setattr(item, field, row[field])
+            row['item'] = item
+        db.session.flush()
+
+        movements = []
+        for _, row in chunk:
+            item = row.pop('item')
+            delta = row['quantity'] - (item.quantity or 0.0)
+            if delta == 0:
+                continue
+            item.quantity = row['quantity']
+            movements.append({
+                'inventory_id': item.id,
+                'movement_type': ADJUST_TYPE,
+                'quantity': delta,
+                'unit': item.unit,
+                'remaining_stock': item.quantity,
+                'date': row['date'],
+                'notes': 'Stock-take import',
+                'added_by': self.added_by,
+            })
+        self._save_movements(movements)
+        for key, item in new_items.items():
+            self.ids_by_name[key] = item.id
+            self.known_ids.add(item.id)
+
+    def _write_movements(self, chunk):
+        items = self._lock_items({row['inventory_id'] for _, row in chunk})
+        movements = []
+        for _, row in chunk:
+            item = items[row['inventory_id']]
+            item.quantity = (item.quantity or 0.0) + signed_quantity(row['movement_type'], row['quantity'])
+            row.update(unit=row['unit'] or item.unit, remaining_stock=item.quantity, added_by=self.added_by)
+            movements.append(row)
+        self._save_movements(movements)
+
+    def _save_movements(self, movements):
+        """
+        Insert movement rows in one executemany and drop the snapshots they make
+        stale. Snapshots are only a read shortcut, so one delete from the chunk's
+        earliest date is used instead of one per item.
+        """
+        if not movements:
+            return
+        now = datetime.utcnow()
+        for movement in movements:
+            movement['created_at'] = now
+        db.session.execute(StockMovement.__table__.insert(), movements)
+        InventorySnapshot.query.filter(
+            InventorySnapshot.inventory_id.in_({m['inventory_id'] for m in movements}),
+            InventorySnapshot.as_of >= min(m['date'] for m in movements)
+        ).delete(synchronize_session=False)
+        db.session.flush()
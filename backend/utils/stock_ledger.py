@@ -0,0 +1,178 @@
+"""
+Server-maintained inventory balances.
+
+Every change to ``Inventory.quantity`` goes through a ``StockMovement`` recorded
+here while the inventory row is locked (``SELECT ... FOR UPDATE``), so concurrent
+storekeepers queue on the row instead of overwriting each other. Daily
+``InventorySnapshot`` rows let point-in-time balances be answered from the
+nearest snapshot plus a short delta scan instead of replaying all movements.
+"""
+
+import math
+from datetime import date as date_type
+
+from sqlalchemy import case
+
+from extensions import db
+from models.inventory import Inventory
+from models.inventory_snapshot import InventorySnapshot
+from models.stock_movement import StockMovement
+
+INBOUND_TYPES = ('in',)
+OUTBOUND_TYPES = ('out', 'sale', 'spoilage')
+# Signed correction (opening balances, stock-take edits)
+ADJUST_TYPE = 'adjust'
+MOVEMENT_TYPES = INBOUND_TYPES + OUTBOUND_TYPES + (ADJUST_TYPE,)
+
+
+class StockLedgerError(ValueError):
+    """A movement the ledger refuses; the message is fixed text safe to show the user."""
+
+
+def finite_number(value, label):
+    """``value`` as a finite float; raises ``StockLedgerError`` naming ``label`` otherwise."""
+    try:
+        if isinstance(value, bool):
+            raise TypeError
+        number = float(value)
+    except (TypeError, ValueError):
+        raise StockLedgerError(f"{label} must be a number.") from None
+    if not math.isfinite(number):
+        raise StockLedgerError(f"{label} must be a finite number.")
+    return number
+
+
+def signed_quantity(movement_type, quantity):
+    """Effect of a movement on the balance."""
+    if movement_type in OUTBOUND_TYPES:
+        return -quantity
+    return quantity
+
+
+def signed_quantity_expr():
+    """SQL counterpart of ``signed_quantity`` for aggregating movements."""
+    return case(
+        (StockMovement.movement_type.in_(OUTBOUND_TYPES), -StockMovement.quantity),
+        else_=StockMovement.quantity
+    )
+
+
+def lock_inventory(inventory_id):
+    """Load an inventory row with a row-level lock held until the transaction ends."""
+    return db.session.query(Inventory).filter(
+        Inventory.id == inventory_id
+    ).with_for_update().populate_existing().one_or_none()
+
+
+def record_movement(inventory_id, movement_type, quantity, move_date, added_by,
+                    unit=None, notes=None, selling_price=None):
+    """
+    Apply a movement to the locked inventory row and store it with the
+    server-computed ``remaining_stock``. Flushes but does not commit.
+    Raises ``StockLedgerError`` for unknown movement types or inventory items
+    and for quantities or prices that are not finite numbers.
+    """
+    if movement_type not in MOVEMENT_TYPES:
+        raise StockLedgerError(f"Invalid movement_type. Allowed: {', '.join(MOVEMENT_TYPES)}.")
+    quantity = finite_number(quantity, "Quantity")
+    if movement_type != ADJUST_TYPE and quantity <= 0:
+        raise StockLedgerError("Quantity must be a positive number.")
+    if selling_price is not None:
+        selling_price = finite_number(selling_price, "Selling price")
+
+    item = lock_inventory(inventory_id)
+    if item is None:
+        raise StockLedgerError(f"Inventory item {inventory_id} not found.")
+
+    item.quantity = (item.quantity or 0.0) + signed_quantity(movement_type, quantity)
+    movement = StockMovement(
+        inventory_id=item.id,
+        movement_type=movement_type,
+        quantity=quantity,
+        unit=unit or item.unit,
+        remaining_stock=item.quantity,
+        date=move_date,
+        notes=notes,
+        selling_price=selling_price,
+        added_by=added_by
+    )
+    db.session.add(movement)
+
+    # A back-dated movement changes every later point-in-time balance
+    InventorySnapshot.query.filter(
+        InventorySnapshot.inventory_id == item.id,
+        InventorySnapshot.as_of >= move_date
+    ).delete(synchronize_session=False)
+
+    db.session.flush()
+    return movement
+
+
+def set_balance(inventory_id, new_quantity, added_by, move_date=None, notes=None):
+    """Record an adjustment that brings the balance to ``new_quantity``; returns None if unchanged."""
+    item = lock_inventory(inventory_id)
+    if item is None:
+        raise StockLedgerError(f"Inventory item {inventory_id} not found.")
+    delta = finite_number(new_quantity, "Quantity") - (item.quantity or 0.0)
+    if delta == 0:
+        return None
+    return record_movement(item.id, ADJUST_TYPE, delta, move_date or date_type.today(), added_by,
+                           notes=notes or 'Balance adjustment')
+
+
+def record_opening_balances(added_by, move_date=None):
+    """Add an adjustment per inventory item equal to its current quantity (after clearing history)."""
+    move_date = move_date or date_type.today()
+    for item in Inventory.query.filter(Inventory.quantity != 0).all():
+        db.session.add(StockMovement(
+            inventory_id=item.id,
+            movement_type=ADJUST_TYPE,
+            quantity=item.quantity,
+            unit=item.unit,
+            remaining_stock=item.quantity,
+            date=move_date,
+            notes='Opening balance',
+            added_by=added_by
+        ))
+    db.session.flush()
+
+
+def balance_at(inventory_id, at_date):
+    """
+    Balance after all movements dated on or before ``at_date``.
+    Returns ``(balance, snapshot)`` where ``snapshot`` is the one used as base (or None).
+    """
+    snapshot = InventorySnapshot.query.filter(
+        InventorySnapshot.inventory_id == inventory_id,
+        InventorySnapshot.as_of <= at_date
+    ).order_by(InventorySnapshot.as_of.desc()).first()
+
+    delta = db.session.query(db.func.coalesce(db.func.sum(signed_quantity_expr()), 0.0)).filter(
+        StockMovement.inventory_id == inventory_id,
+        StockMovement.date <= at_date
+    )
+    if snapshot is not None:
+        delta = delta.filter(StockMovement.date > snapshot.as_of)
+
+    base = snapshot.balance if snapshot is not None else 0.0
+    return base + float(delta.scalar() or 0.0), snapshot
+
+
+def take_snapshots(as_of=None):
+    """Snapshot every inventory item's balance as of ``as_of`` (default today); commits per item."""
+    as_of = as_of or date_type.today()
+    inventory_ids = [row[0] for row in db.session.query(Inventory.id).all()]
+    taken = 0
+    for inventory_id in inventory_ids:
+        if lock_inventory(inventory_id) is None:
+            db.session.rollback()
+            continue
+        balance, _ = balance_at(inventory_id, as_of)
+        snapshot = InventorySnapshot.query.filter_by(inventory_id=inventory_id, as_of=as_of).first()
+        if snapshot is None:
+            db.session.add(InventorySnapshot(inventory_id=inventory_id, as_of=as_of, balance=balance))
+        else:
+            snapshot.balance = balance
+        db.session.commit()
+        taken += 1
+    return taken
@@ -0,0 +1,228 @@
+"""
+Token revocation list for logout and forced password resets.
+
+Revocations are stored in the ``revoked_token`` table (``models.revoked_token``)
+and mirrored in memory by ``RevocationList``:
+
+* single tokens by ``jti``, in a Bloom filter backed by an exact
+  ``{jti: expires at}`` map. Almost every token is not revoked, and the filter
+  answers that in a few hash probes; the map rules out false positives;
+* whole users, as ``{user id: lowest valid token version}``. Tokens whose
+  ``tv`` claim (``utils.token_versions``) is below it are revoked, which covers
+  every token issued before a forced password reset without knowing their jtis.
+
+``is_revoked`` is the ``token_in_blocklist_loader`` and needs no query. Every
+``TOKEN_REVOCATION_REFRESH_SECONDS`` one request per worker reads the rows
+revoked since the last refresh, so a revocation made by another gunicorn worker
+takes effect within that interval; revocations made by this worker apply at
+once. Entries are dropped once the tokens they revoke would have expired.
+"""
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import or_
+from sqlalchemy.exc import SQLAlchemyError
+
+from extensions import db
+from models.revoked_token import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_SECONDS = 5
+DEFAULT_CAPACITY = 1024
+FALSE_POSITIVE_RATE = 0.001
+# Re-read rows revoked this long before the last refresh, for transactions
+# that committed after it
+REFRESH_OVERLAP = timedelta(seconds=60)
+# flask_jwt_extended's default refresh token lifetime
+DEFAULT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings; no false negatives."""
+
+    def __init__(self, capacity, error_rate=FALSE_POSITIVE_RATE):
+        self.capacity = capacity
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        step = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * step) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+def _expiry_seconds(expires_at):
+    return expires_at.timestamp() if expires_at is not None else math.inf
+
+
+class RevocationList:
+    """In-memory mirror of ``revoked_token``, refreshed from the database every ``refresh_seconds``."""
+
+    def __init__(self, refresh_seconds=DEFAULT_REFRESH_SECONDS, capacity=DEFAULT_CAPACITY):
+        self.refresh_seconds = refresh_seconds
+        self._jtis = {}
+        self._bloom = BloomFilter(capacity)
+        self._user_versions = {}
+        self._refreshed_at = None
+        self._since = None
+        # Guards the jti map, the Bloom filter and the user versions; a rebuild
+        # copies the map and swaps the filter in under it, so no add is lost
+        self._lock = threading.Lock()
+        # Lets one request per worker refresh while the rest carry on
+        self._refresh_lock = threading.Lock()
+
+    def is_revoked(self, payload):
+        """True when the decoded JWT ``payload`` has been revoked."""
+        self._maybe_refresh()
+        jti = payload.get('jti')
+        if jti and jti in self._bloom and jti in self._jtis:
+            return True
+        entry = self._user_versions.get(str(payload.get('sub')))
+        return entry is not None and (payload.get('tv') or 0) < entry[0]
+
+    def add(self, jti=None, user_id=None, token_version=None, expires_at=None):
+        """Mirror one ``revoked_token`` row."""
+        with self._lock:
+            self._add(jti, user_id, token_version, expires_at)
+
+    def _add(self, jti, user_id, token_version, expires_at):
+        expires = _expiry_seconds(expires_at)
+        if jti:
+            if jti not in self._jtis:
+                if len(self._jtis) >= self._bloom.capacity:
+                    self._rebuild(self._bloom.capacity * 2)
+                self._bloom.add(jti)
+            self._jtis[jti] = expires
+        elif user_id is not None and token_version is not None:
+            key = str(user_id)
+            current = self._user_versions.get(key)
+            if current is None or token_version >= current[0]:
+                self._user_versions[key] = (token_version, expires)
+
+    def _rebuild(self, capacity):
+        # Bloom filters cannot forget; build a new one and swap it in
+        bloom = BloomFilter(max(capacity, DEFAULT_CAPACITY))
+        for jti in list(self._jtis):
+            bloom.add(jti)
+        self._bloom = bloom
+
+    def _prune(self, now):
+        expired = [jti for jti, expires in list(self._jtis.items()) if expires <= now]
+        for jti in expired:
+            self._jtis.pop(jti, None)
+        for key, (_, expires) in list(self._user_versions.items()):
+            if expires <= now:
+                self._user_versions.pop(key, None)
+        if expired:
+            self._rebuild(self._bloom.capacity)
+
+    def _maybe_refresh(self):
+        if self._refreshed_at is not None and time.monotonic() - self._refreshed_at < self.refresh_seconds:
+            return
+        # One request per worker refreshes; the rest keep using the current entries
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self.refresh()
+        finally:
+            self._refresh_lock.release()
+
+    def refresh(self):
+        """Load rows revoked since the last refresh (all live rows the first time) and drop expired entries."""
+        now = datetime.utcnow()
+        query = RevokedToken.query.filter(or_(RevokedToken.expires_at.is_(None), RevokedToken.expires_at > now))
+        if self._since is not None:
+            query = query.filter(RevokedToken.revoked_at >= self._since - REFRESH_OVERLAP)
+        try:
+            rows = query.with_entities(
+                RevokedToken.jti, RevokedToken.user_id, RevokedToken.token_version, RevokedToken.expires_at
+            ).all()
+        except SQLAlchemyError:
+            db.session.rollback()
+            logger.exception("Could not refresh the token revocation list")
+            self._refreshed_at = time.monotonic()
+            return
+        with self._lock:
+            for row in rows:
+                self._add(row.jti, row.user_id, row.token_version, row.expires_at)
+            self._prune(now.timestamp())
+        self._since = now
+        self._refreshed_at = time.monotonic()
+
+
+def _payload_expiry(payload):
+    exp = payload.get('exp')
+    return datetime.utcfromtimestamp(exp) if exp else None
+
+
+def _purge_expired():
+    RevokedToken.query.filter(RevokedToken.expires_at <= datetime.utcnow()).delete(synchronize_session=False)
+
+
+def revoke_token(payload, reason='logout'):
+    """Revoke the token decoded into ``payload`` until it expires."""
+    jti = payload.get('jti')
+    if not jti:
+        return
+    sub = payload.get('sub')
+    expires_at = _payload_expiry(payload)
+    if RevokedToken.query.filter_by(jti=jti).first() is None:
+        db.session.add(RevokedToken(
+            jti=jti,
+            user_id=int(sub) if str(sub).isdigit() else None,
+            reason=reason,
+            expires_at=expires_at
+        ))
+    _purge_expired()
+    db.session.commit()
+    get_revocation_list().add(jti=jti, expires_at=expires_at)
+
+
+def revoke_user_tokens(user, reason='password_reset'):
+    """
+    Revoke every token issued to ``user`` so far by bumping their token version.
+    Tokens live at most as long as a refresh token, and so does the row.
+    """
+    user.token_version = (user.token_version or 0) + 1
+    lifetime = current_app.config.get('JWT_REFRESH_TOKEN_EXPIRES', DEFAULT_REFRESH_TOKEN_EXPIRES)
+    expires_at = datetime.utcnow() + lifetime if isinstance(lifetime, timedelta) else None
+    db.session.add(RevokedToken(
+        user_id=user.id,
+        token_version=user.token_version,
+        reason=reason,
+        expires_at=expires_at
+    ))
+    _purge_expired()
+    db.session.commit()
+    get_revocation_list().add(user_id=user.id, token_version=user.token_version, expires_at=expires_at)
+
+
+def get_revocation_list(app=None):
+    app = app or current_app._get_current_object()
+    revocations = app.extensions.get('token_revocation')
+    if revocations is None:
+        revocations = init_revocation_list(app)
+    return revocations
+
+
+def init_revocation_list(app):
+    """Attach a ``RevocationList`` configured from ``TOKEN_REVOCATION_REFRESH_SECONDS`` to ``app``."""
+    revocations = RevocationList(app.config.get('TOKEN_REVOCATION_REFRESH_SECONDS', DEFAULT_REFRESH_SECONDS))
+    app.extensions['token_revocation'] = revocations
+    return revocations
@@ -0,0 +1,137 @@
+"""
+Token versions: role checks from verified JWT claims without loading the user.
+
+Access and refresh tokens carry the user's ``role`` and ``token_version``
+(claim ``tv``). Changing a user's role or deactivating them bumps
+``User.token_version``, which invalidates every token issued before the
+change. ``role_required`` therefore only needs to confirm that ``tv`` is still
+current, which it does against ``TokenVersionMap``, an in-memory
+``{user id: (version, active, checked at)}`` map.
+
+Entries are updated when a transaction that changed a user commits in this
+process (a rollback leaves them untouched). An entry
+is re-read from the database once it is older than
+``TOKEN_VERSION_REFRESH_SECONDS``, so a change made by another worker takes
+effect within that interval. Otherwise checks need no query.
+"""
+
+import threading
+import time
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import get_history
+
+from models.user import User
+from utils.user_cache import remember_user
+
+DEFAULT_REFRESH_SECONDS = 5
+VERSION_CLAIM = 'tv'
+# Changes to these columns invalidate the user's existing tokens
+VERSIONED_COLUMNS = ('role', 'is_active')
+
+
+def token_claims(user):
+    """Claims to embed in a new access or refresh token for ``user``."""
+    role = getattr(user.role, 'value', None) if user.role is not None else None
+    return {'role': role, VERSION_CLAIM: user.token_version or 0}
+
+
+class TokenVersionMap:
+    """Current token version and active flag per user id."""
+
+    def __init__(self, refresh_seconds=DEFAULT_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def set(self, user_id, version, active):
+        with self._lock:
+            # NULL is_active (rows older than the column) counts as active
+            self._entries[user_id] = (version or 0, active is not False, time.monotonic())
+
+    def discard(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def current(self, user_id):
+        """``(version, active)``, re-read when the entry is missing or stale; None for unknown users."""
+        entry = self._entries.get(user_id)
+        if entry is None or time.monotonic() - entry[2] >= self.refresh_seconds:
+            # Load the whole user so the request's get_current_user() reuses it
+            user = User.query.filter_by(id=user_id).first()
+            if user is None:
+                self.discard(user_id)
+                return None
+            remember_user(user)
+            self.set(user_id, user.token_version, user.is_active)
+            entry = self._entries[user_id]
+        return entry[0], entry[1]
+
+    def is_current(self, user_id, version):
+        """True when a token with ``version`` for ``user_id`` is still valid."""
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return False
+        state = self.current(user_id)
+        return state is not None and state[1] and state[0] == version
+
+
+def get_token_versions(app=None):
+    app = app or current_app._get_current_object()
+    versions = app.extensions.get('token_versions')
+    if versions is None:
+        versions = init_token_versions(app)
+    return versions
+
+
+def init_token_versions(app):
+    """Attach a ``TokenVersionMap`` configured from ``TOKEN_VERSION_REFRESH_SECONDS`` to ``app``."""
+    versions = TokenVersionMap(app.config.get('TOKEN_VERSION_REFRESH_SECONDS', DEFAULT_REFRESH_SECONDS))
+    app.extensions['token_versions'] = versions
+    return versions
+
+
+@event.listens_for(User, 'before_update')
+def _bump_token_version(mapper, connection, target):
+    if any(get_history(target, column).has_changes() for column in VERSIONED_COLUMNS):
+        target.token_version = (target.token_version or 0) + 1
+
+
+def _pending(session):
+    """Version changes flushed in ``session``'s transaction, applied once it commits."""
+    return session.info.setdefault('_token_versions_pending', {})
+
+
+@event.listens_for(User, 'after_update')
+def _record_token_version(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        _pending(session)[target.id] = (target.token_version, target.is_active)
+
+
+@event.listens_for(User, 'after_delete')
+def _forget_token_version(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        _pending(session)[target.id] = None
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_token_versions(session):
+    pending = session.info.pop('_token_versions_pending', None)
+    if not pending or not has_app_context():
+        return
+    versions = get_token_versions()
+    for user_id, state in pending.items():
+        if state is None:
+            versions.discard(user_id)
+        else:
+            versions.set(user_id, *state)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _drop_token_versions(session, previous_transaction):
+    session.info.pop('_token_versions_pending', None)
@@ -0,0 +1,170 @@
+"""
+One place to resolve a JWT identity to a ``User``.
+
+``load_user`` memoizes per request on ``flask.g`` and, across requests, keeps
+the user's column values in a small TTL LRU (``USER_CACHE_TTL_SECONDS``,
+``USER_CACHE_SIZE``). A cache hit is merged into the current session without a
+query, so the JWT user loader, ``role_required``, ``get_current_user`` and the
+resources that look the user up again all share one instance and, usually,
+zero queries. ``password_hash`` is never cached; it loads on first access.
+
+Entries are dropped when a user is updated, deleted or changes password in
+this process. Other workers see the change once their entry expires.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.session import make_transient_to_detached
+
+from extensions import db
+from models.user import User
+
+DEFAULT_TTL_SECONDS = 30
+DEFAULT_SIZE = 1024
+# Columns kept out of the shared cache
+UNCACHED_COLUMNS = ('password_hash',)
+
+
+class UserCache:
+    """Thread-safe TTL LRU of ``User`` column values keyed by id."""
+
+    def __init__(self, ttl_seconds=DEFAULT_TTL_SECONDS, maxsize=DEFAULT_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user_id, values):
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, values)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id=None):
+        """Drop one user, or everyone when ``user_id`` is None."""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _snapshot(user):
+    return {
+        attr.key: getattr(user, attr.key)
+        for attr in User.__mapper__.column_attrs
+        if attr.key not in UNCACHED_COLUMNS
+    }
+
+
+def _restore(values):
+    """Attach a cached user to the current session without a query."""
+    user = User.__mapper__.class_manager.new_instance()
+    for key, value in values.items():
+        set_committed_value(user, key, value)
+    make_transient_to_detached(user)
+    user = db.session.merge(user, load=False)
+    if any(key not in user.__dict__ for key in UNCACHED_COLUMNS):
+        db.session.expire(user, [key for key in UNCACHED_COLUMNS if key not in user.__dict__])
+    return user
+
+
+def get_user_cache(app=None):
+    app = app or current_app._get_current_object()
+    cache = app.extensions.get('user_cache')
+    if cache is None:
+        cache = init_user_cache(app)
+    return cache
+
+
+def init_user_cache(app):
+    """Attach a ``UserCache`` configured from ``USER_CACHE_*`` settings to ``app``."""
+    cache = UserCache(
+        ttl_seconds=app.config.get('USER_CACHE_TTL_SECONDS', DEFAULT_TTL_SECONDS),
+        maxsize=app.config.get('USER_CACHE_SIZE', DEFAULT_SIZE),
+    )
+    app.extensions['user_cache'] = cache
+    return cache
+
+
+def load_user(user_id):
+    """
+    The ``User`` for a JWT identity (str or int), or None. Memoized for the
+    request; backed by the shared cache.
+    """
+    if user_id is None:
+        return None
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+
+    memo = g.setdefault('_users_by_id', {})
+    user = memo.get(user_id)
+    if user is not None and user in db.session:
+        return user
+
+    cache = get_user_cache()
+    values = cache.get(user_id)
+    if values is not None:
+        user = _restore(values)
+    else:
+        user = User.query.get(user_id)
+        if user is not None:
+            cache.put(user_id, _snapshot(user))
+    if user is not None:
+        memo[user_id] = user
+    return user
+
+
+def remember_user(user):
+    """Share a freshly loaded ``user`` with the rest of the request and the cache."""
+    g.setdefault('_users_by_id', {})[user.id] = user
+    get_user_cache().put(user.id, _snapshot(user))
+
+
+def invalidate_user(user_id=None):
+    """Forget a cached user (or all users) in this process."""
+    if has_app_context():
+        get_user_cache().invalidate(user_id)
+        g.pop('_users_by_id', None)
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _invalidate_changed_user(mapper, connection, target):
+    invalidate_user(target.id)
+
+
+@event.listens_for(Session, 'after_bulk_update')
+@event.listens_for(Session, 'after_bulk_delete')
+def _invalidate_bulk_changes(context):
+    if context.mapper is not None and context.mapper.class_ is User:
+        invalidate_user()
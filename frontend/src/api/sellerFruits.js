@@ -1,13 +1,15 @@
 import api from './api';
 
-// Fetch all seller fruits
-export const fetchSellerFruits = async (token = null) => {
+// Fetch one page of seller fruits, newest first.
+// filters: date or start_date/end_date (YYYY-MM-DD), stock_name, customer_name, per_page.
+// No total is requested; pass the returned nextCursor back as `cursor` for the next page.
+export const fetchSellerFruits = async (filters = {}, cursor = null, token = null) => {
   try {
-  console.log('fetchSellerFruits: Making API call to /api/seller-fruits');
-  const config = token ? { headers: { Authorization: `Bearer ${token}` } } : {};
-  const response = await api.get('/api/seller-fruits', config);
-    console.log('fetchSellerFruits: Response received:', response);
-    return response.data;
+    const headers = token ? { Authorization: `Bearer ${token}` } : undefined;
+    const params = { per_page: 100, total: 'none', ...filters };
+    if (cursor) params.cursor = cursor;
+    const response = await api.get('/api/seller-fruits', { headers, params });
+    return { items: response.data?.items || [], nextCursor: response.data?.meta?.next_cursor || null };
   } catch (error) {
     console.error('fetchSellerFruits: API call failed:', error);
     throw error;
@@ -0,0 +1,55 @@
+import api from './api';
+
+// Live updates from /api/stream (Server-Sent Events).
+// EventSource cannot send headers, so each connection uses a short-lived stream
+// token from /api/stream/token. When the connection drops (or the token expires)
+// a new token is fetched and the stream resumes after the last event received.
+const RECONNECT_DELAY_MS = 5000;
+
+export const subscribeToStream = ({ onMessage, onAlert } = {}) => {
+  let source = null;
+  let lastEventId = null;
+  let retryTimer = null;
+  let closed = false;
+
+  const handle = (callback) => (event) => {
+    lastEventId = event.lastEventId || lastEventId;
+    if (!callback) return;
+    try {
+      callback(JSON.parse(event.data));
+    } catch (error) {
+      console.error('subscribeToStream: bad event payload:', error);
+    }
+  };
+
+  const connect = async () => {
+    if (closed) return;
+    try {
+      const response = await api.post('/api/stream/token');
+      const token = response.data?.data?.token;
+      if (!token || closed) return;
+      const params = new URLSearchParams({ jwt: token });
+      if (lastEventId) params.set('last_event_id', lastEventId);
+      source = new EventSource(`${api.defaults.baseURL}/api/stream?${params.toString()}`);
+      source.addEventListener('message', handle(onMessage));
+      source.addEventListener('alert', handle(onAlert));
+      source.onerror = () => {
+        // The browser's own retry would reuse the expired token, so reconnect with a fresh one
+        source.close();
+        source = null;
+        if (!closed) retryTimer = setTimeout(connect, RECONNECT_DELAY_MS);
+      };
+    } catch (error) {
+      console.error('subscribeToStream: could not open the stream:', error);
+      if (!closed) retryTimer = setTimeout(connect, RECONNECT_DELAY_MS);
+    }
+  };
+
+  connect();
+
+  return () => {
+    closed = true;
+    clearTimeout(retryTimer);
+    if (source) source.close();
+  };
+};
@@ -1,21 +1,18 @@
 import React, { useState, useEffect } from 'react';
-import { useAuth } from '../contexts/AuthContext';
-
-//import { fetchCeoMessages, updateMessageAsRead } from 'http://127.0.0.1:5000/api';
-import { fetchCeoMessages, updateMessageAsRead } from './apiHelpers';
+import api from '../api/api';
+import { subscribeToStream } from '../api/stream';
 
 const CeoMessagesDisplay = () => {
-  const { user } = useAuth();
   const [messages, setMessages] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
 
-  // Fetch messages from backend
+  // Load the latest messages once, then follow new ones over the live stream (no polling)
   useEffect(() => {
     const loadMessages = async () => {
       try {
-        const response = await fetchCeoMessages();
-        setMessages(response.data);
+        const response = await api.get('/api/messages');
+        setMessages(response.data?.data?.messages || []);
       } catch (err) {
         console.error('Failed to fetch messages:', err);
         setError('Failed to load messages');
@@ -25,23 +22,21 @@ const CeoMessagesDisplay = () => {
     };
     loadMessages();
 
-    // Optional: Set up polling or real-time updates
-    const interval = setInterval(loadMessages, 30000); // Refresh every 30 seconds
-    return () => clearInterval(interval);
+    return subscribeToStream({
+      onMessage: (message) => setMessages((current) => (
+        current.some((msg) => msg.id === message.id) ? current : [message, ...current]
+      ))
+    });
   }, []);
 
-  // Filter messages for current user
-  const userMessages = messages.filter(msg => 
-    msg.recipient === 'all' || msg.recipient === user?.role
-  );
-
-  const unreadMessages = userMessages.filter(msg => !msg.isRead);
+  // The server only returns messages addressed to this user or their role
+  const unreadMessages = messages.filter(msg => !msg.is_read);
 
   const handleMarkAsRead = async (messageId) => {
     try {
-      await updateMessageAsRead(messageId);
+      await api.put(`/api/messages/${messageId}`);
       setMessages(messages.map(msg => 
-        msg.id === messageId ? { ...msg, isRead: true } : msg
+        msg.id === messageId ? { ...msg, is_read: true } : msg
       ));
     } catch (err) {
       console.error('Failed to mark message as read:', err);
@@ -68,7 +63,7 @@ const CeoMessagesDisplay = () => {
     );
   }
 
-  if (userMessages.length === 0) {
+  if (messages.length === 0) {
     return null;
   }
 
@@ -80,20 +75,20 @@ const CeoMessagesDisplay = () => {
       </h5>
       
       <div className="max-height-200 overflow-auto">
-        {userMessages.slice(0, 5).map((message) => (
+        {messages.slice(0, 5).map((message) => (
           <div
             key={message.id}
-            className={`alert ${message.isRead ? 'alert-secondary' : 'alert-info'} py-2 mb-2`}
+            className={`alert ${message.is_read ? 'alert-secondary' : 'alert-info'} py-2 mb-2`}
           >
             <div className="d-flex justify-content-between align-items-start">
               <div className="flex-grow-1">
                 <small className="text-muted">
-                  {new Date(message.createdAt).toLocaleDateString()} - 
-                  To: {message.recipient === 'all' ? 'Everyone' : message.recipient}
+                  {new Date(message.created_at).toLocaleDateString()} - 
+                  To: {message.recipient_name}
                 </small>
-                <p className="mb-0 mt-1">{message.content}</p>
+                <p className="mb-0 mt-1">{message.message}</p>
               </div>
-              {!message.isRead && (
+              {!message.is_read && (
                 <button
                   onClick={() => handleMarkAsRead(message.id)}
                   className="btn btn-sm btn-outline-primary ms-2"
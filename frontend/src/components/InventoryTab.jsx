@@ -22,6 +22,14 @@ import {
 const InventoryTab = () => {
   const [inventory, setInventory] = useState([]);
   const [stockMovements, setStockMovements] = useState([]);
+  const [movementsCursor, setMovementsCursor] = useState(null);
+  const [movementFilters, setMovementFilters] = useState({
+    inventory_id: '',
+    movement_type: '',
+    start_date: '',
+    end_date: ''
+  });
+  const [loadingMoreMovements, setLoadingMoreMovements] = useState(false);
   const [gradients, setGradients] = useState([]);
   const [loading, setLoading] = useState({
     inventory: true,
@@ -41,35 +49,71 @@ const InventoryTab = () => {
   });
   const [adding, setAdding] = useState(false);
 
-  // Fetch all inventory data
+  // Fetch inventory and gradients
   useEffect(() => {
     const loadData = async () => {
       try {
         const token = localStorage.getItem('access_token');
-        const [inventoryRes, movementsRes, gradientsRes] = await Promise.all([
+        const [inventoryRes, gradientsRes] = await Promise.all([
           fetchInventory(token),
-          fetchStockMovements(token),
           fetchGradients(token)
         ]);
         
         setInventory(inventoryRes.data);
-        // Ensure stockMovements is always an array
-        setStockMovements(Array.isArray(movementsRes.data) ? movementsRes.data : []);
         setGradients(gradientsRes.data);
       } catch (err) {
         console.error('Failed to load inventory data:', err);
         setError('Failed to load inventory data. Please try again.');
       } finally {
-        setLoading({
-          inventory: false,
-          movements: false,
-          gradients: false
-        });
+        setLoading((prev) => ({ ...prev, inventory: false, gradients: false }));
       }
     };
     loadData();
   }, []);
 
+  // Only send the filters that are set; empty strings would be rejected by the API
+  const activeMovementFilters = () =>
+    Object.fromEntries(Object.entries(movementFilters).filter(([, value]) => value !== ''));
+
+  // First page of stock movements; reloaded whenever the filters change
+  useEffect(() => {
+    const loadMovements = async () => {
+      setLoading((prev) => ({ ...prev, movements: true }));
+      try {
+        const movementsRes = await fetchStockMovements(activeMovementFilters());
+        setStockMovements(movementsRes.data);
+        setMovementsCursor(movementsRes.nextCursor);
+      } catch (err) {
+        console.error('Failed to load stock movements:', err);
+        setError('Failed to load stock movements. Please try again.');
+      } finally {
+        setLoading((prev) => ({ ...prev, movements: false }));
+      }
+    };
+    loadMovements();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [movementFilters]);
+
+  const handleLoadMoreMovements = async () => {
+    if (!movementsCursor) return;
+    setLoadingMoreMovements(true);
+    try {
+      const movementsRes = await fetchStockMovements(activeMovementFilters(), movementsCursor);
+      setStockMovements((prev) => [...prev, ...movementsRes.data]);
+      setMovementsCursor(movementsRes.nextCursor);
+    } catch (err) {
+      console.error('Failed to load more stock movements:', err);
+      setError('Failed to load more stock movements. Please try again.');
+    } finally {
+      setLoadingMoreMovements(false);
+    }
+  };
+
+  const handleMovementFilterChange = (e) => {
+    const { name, value } = e.target;
+    setMovementFilters((prev) => ({ ...prev, [name]: value }));
+  };
+
   // Calculate current stock
   // Removed unused getCurrentStock function
 
@@ -89,6 +133,7 @@ const InventoryTab = () => {
         case 'movements':
           await clearStockMovementsAPI();
           setStockMovements([]);
+          setMovementsCursor(null);
           break;
         case 'gradients':
           await clearGradientsAPI();
@@ -171,7 +216,7 @@ const InventoryTab = () => {
                 {loading.movements ? (
                   <span className="spinner-border spinner-border-sm" role="status"></span>
                 ) : (
-                  totalStockMovements
+                  `${totalStockMovements}${movementsCursor ? '+' : ''}`
                 )}
               </h3>
             </div>
@@ -263,6 +308,53 @@ const InventoryTab = () => {
               </button>
             </div>
             <div className="card-body">
+              <div className="row g-2 mb-2">
+                <div className="col-md-3">
+                  <select
+                    className="form-select form-select-sm"
+                    name="inventory_id"
+                    value={movementFilters.inventory_id}
+                    onChange={handleMovementFilterChange}
+                  >
+                    <option value="">All items</option>
+                    {(Array.isArray(inventory) ? inventory : []).map((item) => (
+                      <option key={item.id} value={item.id}>{item.name}</option>
+                    ))}
+                  </select>
+                </div>
+                <div className="col-md-3">
+                  <select
+                    className="form-select form-select-sm"
+                    name="movement_type"
+                    value={movementFilters.movement_type}
+                    onChange={handleMovementFilterChange}
+                  >
+                    <option value="">All movements</option>
+                    <option value="in">In</option>
+                    <option value="out">Out</option>
+                    <option value="sale">Sale</option>
+                    <option value="spoilage">Spoilage</option>
+                  </select>
+                </div>
+                <div className="col-md-3">
+                  <input
+                    type="date"
+                    className="form-control form-control-sm"
+                    name="start_date"
+                    value={movementFilters.start_date}
+                    onChange={handleMovementFilterChange}
+                  />
+                </div>
+                <div className="col-md-3">
+                  <input
+                    type="date"
+                    className="form-control form-control-sm"
+                    name="end_date"
+                    value={movementFilters.end_date}
+                    onChange={handleMovementFilterChange}
+                  />
+                </div>
+              </div>
               <div className="table-responsive max-height-200">
                 <table className="table table-striped table-hover">
                   <thead className="table-dark">
@@ -283,25 +375,23 @@ const InventoryTab = () => {
                         </td>
                       </tr>
                     ) : stockMovements.length > 0 ? (
-                      [...stockMovements]
-                        .slice(-10)
-                        .reverse()
-                        .map((movement) => (
-                          <tr key={movement.id}>
-                            <td>
-                              <i className="bi bi-apple me-1 text-success"></i>
-                              {movement.fruitType}
-                            </td>
-                            <td>
-                              <span className={`badge ${movement.movementType && movement.movementType.toLowerCase() === 'in' ? 'bg-success' : 'bg-danger'}`}>
-                                {typeof movement.movementType === 'string' ? movement.movementType.toUpperCase() : ''}
-                              </span>
-                            </td>
-                            <td>{movement.quantity}</td>
-                            <td>{movement.unit}</td>
-                            <td>{new Date(movement.date).toLocaleDateString()}</td>
-                          </tr>
-                        ))
+                      // Already newest first from the API
+                      stockMovements.map((movement) => (
+                        <tr key={movement.id}>
+                          <td>
+                            <i className="bi bi-apple me-1 text-success"></i>
+                            {movement.inventory_item_name}
+                          </td>
+                          <td>
+                            <span className={`badge ${movement.movement_type && movement.movement_type.toLowerCase() === 'in' ? 'bg-success' : 'bg-danger'}`}>
+                              {typeof movement.movement_type === 'string' ? movement.movement_type.toUpperCase() : ''}
+                            </span>
+                          </td>
+                          <td>{movement.quantity}</td>
+                          <td>{movement.unit}</td>
+                          <td>{new Date(movement.date).toLocaleDateString()}</td>
+                        </tr>
+                      ))
                     ) : (
                       <tr>
                         <td colSpan="5" className="text-center text-muted">No stock movements recorded</td>
@@ -310,6 +400,15 @@ const InventoryTab = () => {
                   </tbody>
                 </table>
               </div>
+              {movementsCursor && !loading.movements && (
+                <button
+                  className="btn btn-outline-secondary btn-sm mt-2"
+                  onClick={handleLoadMoreMovements}
+                  disabled={loadingMoreMovements}
+                >
+                  {loadingMoreMovements ? 'Loading...' : 'Load more'}
+                </button>
+              )}
             </div>
           </div>
         </div>
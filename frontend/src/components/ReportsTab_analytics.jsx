@@ -40,7 +40,7 @@ import {
   fetchSales,
   fetchOtherExpenses,
   fetchUsers,
-  fetchSalaries,
+  fetchMonthlyPayroll,
   fetchCarExpenses
 } from './apiHelpers';
 import { fetchStockTracking, fetchStockTrackingAggregated } from '../api/stockTracking';
@@ -59,6 +59,14 @@ ChartJS.register(
   ArcElement
 );
 
+// First day (YYYY-MM-DD) of the selected reporting period
+const PERIOD_DAYS = { '7days': 7, '30days': 30, '90days': 90, '1year': 365 };
+const periodStartDate = (period) => {
+  const start = new Date();
+  start.setDate(start.getDate() - (PERIOD_DAYS[period] || 30));
+  return start.toISOString().slice(0, 10);
+};
+
 const ReportsTabAnalytics = () => {
   const [data, setData] = useState({
     inventory: [],
@@ -69,7 +77,7 @@ const ReportsTabAnalytics = () => {
     users: [],
     stockTracking: [],
     sellerFruits: [],
-    salaries: [],
+    payrollMonthly: [],
     carExpenses: [],
     stockExpenses: [],
     fruitProfitability: []
@@ -78,6 +86,8 @@ const ReportsTabAnalytics = () => {
   const [error, setError] = useState(null);
   const [selectedPeriod, setSelectedPeriod] = useState('30days');
   const [selectedMetric, setSelectedMetric] = useState('revenue');
+  const [sellerFruitsCursor, setSellerFruitsCursor] = useState(null);
+  const [loadingMoreSellerFruits, setLoadingMoreSellerFruits] = useState(false);
 
   useEffect(() => {
     const loadData = async () => {
@@ -89,6 +99,8 @@ const ReportsTabAnalytics = () => {
         return;
       }
 
+      setLoading(true);
+      const startDate = periodStartDate(selectedPeriod);
       try {
           const [
             inventoryRes,
@@ -99,26 +111,26 @@ const ReportsTabAnalytics = () => {
             usersRes,
             stockTrackingRes,
             sellerFruitsRes,
-            salariesRes,
+            payrollRes,
             carExpensesRes,
             aggregatedRes
           ] = await Promise.all([
             fetchInventory(token),
-            fetchStockMovements(token),
+            fetchStockMovements({ start_date: startDate }),
             fetchPurchases(null, token),
             fetchSales(null, token),
             fetchOtherExpenses(token),
             fetchUsers(token),
             fetchStockTracking(token),
-            fetchSellerFruits(token),
-            fetchSalaries(token),
+            fetchSellerFruits({ start_date: startDate, per_page: 200 }, null, token),
+            fetchMonthlyPayroll(),
             fetchCarExpenses(token),
             fetchStockTrackingAggregated(token)
           ]);
 
         setData({
           inventory: Array.isArray(inventoryRes.data?.data) ? inventoryRes.data.data : inventoryRes.data || [],
-          stockMovements: Array.isArray(movementsRes.data?.data) ? movementsRes.data.data : movementsRes.data || [],
+          stockMovements: movementsRes.data,
           stockTracking: Array.isArray(stockTrackingRes.data?.data) ? stockTrackingRes.data.data :
                         Array.isArray(stockTrackingRes.data) ? stockTrackingRes.data : [],
           purchases: Array.isArray(purchasesRes.data?.data?.items) ? purchasesRes.data.data.items :
@@ -128,12 +140,13 @@ const ReportsTabAnalytics = () => {
           sales: Array.isArray(salesRes) ? salesRes : [],
           otherExpenses: Array.isArray(expensesRes.data?.data) ? expensesRes.data.data : expensesRes.data || [],
           users: Array.isArray(usersRes.data?.data) ? usersRes.data.data : usersRes.data || [],
-          sellerFruits: Array.isArray(sellerFruitsRes) ? sellerFruitsRes : [],
-          salaries: Array.isArray(salariesRes.data?.data) ? salariesRes.data.data : salariesRes.data || [],
+          sellerFruits: sellerFruitsRes.items,
+          payrollMonthly: Array.isArray(payrollRes.data?.data) ? payrollRes.data.data : [],
           carExpenses: Array.isArray(carExpensesRes.data?.data) ? carExpensesRes.data.data : carExpensesRes.data || [],
           stockExpenses: Array.isArray(aggregatedRes.data?.data?.stock_expenses) ? aggregatedRes.data.data.stock_expenses : [],
           fruitProfitability: Array.isArray(aggregatedRes.data?.data?.fruit_profitability) ? aggregatedRes.data.data.fruit_profitability : []
         });
+        setSellerFruitsCursor(sellerFruitsRes.nextCursor);
 
         const purchaseData = Array.isArray(purchasesRes.data?.data?.items) ? purchasesRes.data.data.items : 
                     Array.isArray(purchasesRes.data?.data) ? purchasesRes.data.data :
@@ -175,7 +188,25 @@ const ReportsTabAnalytics = () => {
       }
     };
     loadData();
-  }, []);
+  }, [selectedPeriod]);
+
+  // Seller sales beyond the first page of the period are fetched only on request
+  const handleLoadMoreSellerFruits = async () => {
+    if (!sellerFruitsCursor) return;
+    setLoadingMoreSellerFruits(true);
+    try {
+      const token = localStorage.getItem('access_token');
+      const page = await fetchSellerFruits(
+        { start_date: periodStartDate(selectedPeriod), per_page: 200 }, sellerFruitsCursor, token
+      );
+      setData((prev) => ({ ...prev, sellerFruits: [...prev.sellerFruits, ...page.items] }));
+      setSellerFruitsCursor(page.nextCursor);
+    } catch (err) {
+      console.error('Failed to load more seller sales:', err);
+    } finally {
+      setLoadingMoreSellerFruits(false);
+    }
+  };
 
   const formatCurrency = (amount) => {
     return new Intl.NumberFormat('en-KE', {
@@ -430,10 +461,10 @@ const ReportsTabAnalytics = () => {
       });
     }
 
-    // Process salaries
-    if (Array.isArray(data.salaries)) {
-      data.salaries.forEach(salary => {
-        const month = getMonthKey(salary.date);
+    // Process salaries: already totalled per month by /api/salaries/monthly
+    if (Array.isArray(data.payrollMonthly)) {
+      data.payrollMonthly.forEach(payroll => {
+        const month = payroll.month;
         if (!month) return;
 
         if (!monthlyData[month]) {
@@ -446,7 +477,7 @@ const ReportsTabAnalytics = () => {
             carExpensesTotal: 0
           };
         }
-        monthlyData[month].salariesTotal += parseFloat(salary.amount || 0);
+        monthlyData[month].salariesTotal += parseFloat(payroll.total || 0);
       });
     }
 
@@ -565,6 +596,19 @@ const ReportsTabAnalytics = () => {
         </div>
       </div>
 
+      {sellerFruitsCursor && (
+        <div className="alert alert-info d-flex justify-content-between align-items-center">
+          <span>Showing the first {data.sellerFruits.length} seller sales for this period.</span>
+          <button
+            className="btn btn-outline-primary btn-sm"
+            onClick={handleLoadMoreSellerFruits}
+            disabled={loadingMoreSellerFruits}
+          >
+            {loadingMoreSellerFruits ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
+
       {/* Key Metrics Cards */}
       <div className="row mb-4">
         <div className="col-md-3">
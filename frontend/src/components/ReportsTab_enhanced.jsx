@@ -41,7 +41,7 @@ const ReportsTab = () => {
           usersRes
         ] = await Promise.all([
           fetchInventory(token),
-          fetchStockMovements(token),
+          fetchStockMovements(),
           fetchPurchases(),
           fetchSales(),
           fetchOtherExpenses(),
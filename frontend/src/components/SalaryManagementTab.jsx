@@ -8,36 +8,57 @@ const SalaryManagementTab = ({ data }) => {
   const [users, setUsers] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
+  // Newest page of the history; older pages are loaded on request
+  const reloadSalaries = async () => {
+    const salariesRes = await fetchSalaries();
+    setSalaries(salariesRes.data);
+    setNextCursor(salariesRes.nextCursor);
+  };
+
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const salariesRes = await fetchSalaries(nextCursor);
+      setSalaries((prev) => [...prev, ...salariesRes.data]);
+      setNextCursor(salariesRes.nextCursor);
+    } catch (err) {
+      console.error('Failed to load more salaries:', err);
+      setError('Failed to load more salary records. Please try again.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
-  // Fetch all data on component mount
+  // Rows passed in (the dashboard's latest payments) show straight away; the first
+  // page is still fetched for its cursor, and users for the salary form
   useEffect(() => {
-    // If data is passed as prop, use it, otherwise fetch all salaries from DB
     if (Array.isArray(data)) {
       setSalaries(data);
       setLoading(false);
-    } else {
-      const loadData = async () => {
-        try {
-          const token = localStorage.getItem('access_token');
-          const [salariesRes, usersRes] = await Promise.all([
-            fetchSalaries(token),
-            fetchUsers(token)
-          ]);
-          console.log('Loaded users:', usersRes.data);
-          console.log('Loaded salaries:', salariesRes.data);
-          const usersData = usersRes.data?.data || [];
-          setSalaries(salariesRes.data?.data || []);
-          setUsers(usersData);
-        } catch (err) {
-          console.error('Failed to load data:', err);
-          setError('Failed to load data. Please try again.');
-        } finally {
-          setLoading(false);
-        }
-      };
-      loadData();
     }
+    const loadData = async () => {
+      try {
+        const token = localStorage.getItem('access_token');
+        const [salariesRes, usersRes] = await Promise.all([
+          fetchSalaries(),
+          fetchUsers(token)
+        ]);
+        const usersData = usersRes.data?.data || [];
+        setSalaries(salariesRes.data);
+        setNextCursor(salariesRes.nextCursor);
+        setUsers(usersData);
+      } catch (err) {
+        console.error('Failed to load data:', err);
+        setError('Failed to load data. Please try again.');
+      } finally {
+        setLoading(false);
+      }
+    };
+    loadData();
   }, [data]);
 
   const formatCurrency = (amount) => {
@@ -100,11 +121,10 @@ const SalaryManagementTab = ({ data }) => {
               </thead>
               <tbody>
                 {salaries.length > 0 ? (
-                  salaries.sort((a, b) => new Date(b.date) - new Date(a.date)).map(salary => {
-                    const user = users.find(u => u.id === salary.user_id);
+                  salaries.map(salary => {
                     return (
                       <tr key={salary.id}>
-                        <td>{user ? user.name : 'Unknown'}</td>
+                        <td>{salary.user_name || 'Unknown'}</td>
                         <td>{formatCurrency(salary.amount)}</td>
                         <td>{new Date(salary.date).toLocaleDateString()}</td>
                         <td>{salary.description || '-'}</td>
@@ -116,10 +136,9 @@ const SalaryManagementTab = ({ data }) => {
                         <td>
                           <button className={`btn btn-sm ${salary.is_paid ? 'btn-warning' : 'btn-success'} me-2`}
                             onClick={async () => {
-                              await toggleSalaryStatus(salary.id);
-                              // Refresh salaries
-                              const salariesRes = await fetchSalaries();
-                              setSalaries(salariesRes.data?.data || []);
+                              const toggled = await toggleSalaryStatus(salary.id);
+                              const updated = toggled.data?.data;
+                              setSalaries((prev) => prev.map((s) => (s.id === salary.id ? { ...s, ...updated } : s)));
                             }}>
                             {salary.is_paid ? 'Mark Pending' : 'Mark Paid'}
                           </button>
@@ -127,9 +146,7 @@ const SalaryManagementTab = ({ data }) => {
                             className="btn btn-sm btn-danger"
                             onClick={async () => {
                               await deleteSalary(salary.id);
-                              const token = localStorage.getItem('access_token');
-                              const salariesRes = await fetchSalaries(token);
-                              setSalaries(salariesRes.data?.data || []);
+                              setSalaries((prev) => prev.filter((s) => s.id !== salary.id));
                             }}
                           >
                             Delete
@@ -148,6 +165,13 @@ const SalaryManagementTab = ({ data }) => {
               </tbody>
             </table>
           </div>
+          {nextCursor && (
+            <div className="text-center">
+              <button className="btn btn-outline-secondary btn-sm" onClick={handleLoadMore} disabled={loadingMore}>
+                {loadingMore ? 'Loading...' : 'Load more'}
+              </button>
+            </div>
+          )}
         </div>
       </div>
       <SalaryFormModal
@@ -156,9 +180,7 @@ const SalaryManagementTab = ({ data }) => {
         onSave={async (salaryData) => {
           await createSalary(salaryData);
           setShowSalaryModal(false);
-          // Refresh salaries
-          const salariesRes = await fetchSalaries();
-          setSalaries(salariesRes.data?.data || []);
+          await reloadSalaries();
         }}
         users={users}
       />
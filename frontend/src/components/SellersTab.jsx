@@ -1,11 +1,18 @@
 import React, { useState, useEffect } from 'react';
 import { fetchSellerFruits } from '../api/sellerFruits';
 
+// Local date as YYYY-MM-DD
+const todayString = () => new Date().toLocaleDateString('en-CA');
+
 const SellersTab = () => {
   const [sellerFruits, setSellerFruits] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [selectedDate, setSelectedDate] = useState(todayString());
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const searchTerm = '';
 
+  // One day at a time: the API serves it from the (created_by, date, id) index
   useEffect(() => {
     const loadData = async () => {
       try {
@@ -13,25 +20,38 @@ const SellersTab = () => {
         const token = localStorage.getItem('access_token');
         if (!token) {
           setSellerFruits([]);
+          setNextCursor(null);
           setLoading(false);
           return;
         }
-        const fruitsRes = await fetchSellerFruits(token);
-        // Handle response from /api/seller-fruits: array of fruits
-        if (Array.isArray(fruitsRes)) {
-          setSellerFruits(fruitsRes);
-        } else {
-          setSellerFruits([]);
-        }
+        const page = await fetchSellerFruits({ date: selectedDate }, null, token);
+        setSellerFruits(page.items);
+        setNextCursor(page.nextCursor);
       } catch (error) {
         console.error('Failed to fetch seller fruits:', error);
         setSellerFruits([]);
+        setNextCursor(null);
       } finally {
         setLoading(false);
       }
     };
     loadData();
-  }, []);
+  }, [selectedDate]);
+
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const token = localStorage.getItem('access_token');
+      const page = await fetchSellerFruits({ date: selectedDate }, nextCursor, token);
+      setSellerFruits((prev) => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Failed to fetch more seller fruits:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   const formatDate = (dateString) => {
     if (!dateString) return 'N/A';
@@ -78,6 +98,16 @@ const SellersTab = () => {
   return (
     <div className="card card-custom">
       <div className="card-body p-0">
+        <div className="d-flex align-items-center gap-2 px-3 pt-3">
+          <label htmlFor="sellers-date" className="mb-0">Date</label>
+          <input
+            id="sellers-date"
+            type="date"
+            className="form-control form-control-sm w-auto"
+            value={selectedDate}
+            onChange={(e) => setSelectedDate(e.target.value || todayString())}
+          />
+        </div>
         {sortedDates.length > 0 ? (
           sortedDates.map((date, index) => {
             const dayFruits = groupedSellerFruits[date];
@@ -149,6 +179,13 @@ const SellersTab = () => {
               : 'No matching records found'}
           </div>
         )}
+        {nextCursor && (
+          <div className="text-center pb-3">
+            <button className="btn btn-outline-secondary btn-sm" onClick={handleLoadMore} disabled={loadingMore}>
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
@@ -22,11 +22,16 @@ export const fetchInventory = async (token = null) => {
   }
 };
 
-// Fetch stock movements
-export const fetchStockMovements = async (token = null) => {
+// Fetch one page of stock movements, newest first.
+// filters: inventory_id, movement_type, start_date, end_date (YYYY-MM-DD), limit.
+// Pass the returned nextCursor back as `cursor` to load the next page; it is null on the last page.
+export const fetchStockMovements = async (filters = {}, cursor = null) => {
   try {
-    const response = await api.get('/api/stock-movements');
-    return response;
+    const params = { limit: 50, ...filters };
+    if (cursor) params.cursor = cursor;
+    const response = await api.get('/api/stock-movements', { params });
+    const page = response.data?.data || {};
+    return { ...response, data: page.items || [], nextCursor: page.meta?.next_cursor || null };
   } catch (error) {
     console.error('Error fetching stock movements:', error);
     throw error;
@@ -337,17 +342,32 @@ export const deleteOtherExpense = async (expenseId) => {
   }
 };
 
-// Fetch salaries
-export const fetchSalaries = async () => {
+// Fetch one page of salary history, newest first, without a row count.
+// Pass the returned nextCursor back as `cursor` to load the next page; it is null on the last page.
+export const fetchSalaries = async (cursor = null) => {
   try {
-    const response = await api.get('/api/salaries');
-    return response;
+    const params = { per_page: 50, total: 'none' };
+    if (cursor) params.cursor = cursor;
+    const response = await api.get('/api/salaries', { params });
+    const page = response.data?.data || {};
+    return { ...response, data: page.items || [], nextCursor: page.meta?.next_cursor || null };
   } catch (error) {
     console.error('Error fetching salaries:', error);
     throw error;
   }
 };
 
+// Fetch payroll totals per month ('YYYY-MM'): total, paid, unpaid, payments, employees
+export const fetchMonthlyPayroll = async () => {
+  try {
+    const response = await api.get('/api/salaries/monthly');
+    return response;
+  } catch (error) {
+    console.error('Error fetching monthly payroll:', error);
+    throw error;
+  }
+};
+
 // Delete salary
 export const deleteSalary = async (salaryId) => {
   try {
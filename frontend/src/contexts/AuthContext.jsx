@@ -76,9 +76,21 @@ const verifyAuth = async () => {
   
 
 
-  const logout = () => {
+  const logout = async () => {
+    // Read the tokens before clearing storage so the revoke request carries them;
+    // the local session ends either way
+    const token = localStorage.getItem('access_token');
+    const refreshToken = localStorage.getItem('refresh_token');
+    if (token) {
+      await api.post(
+        '/api/auth/logout',
+        refreshToken ? { refresh_token: refreshToken } : {},
+        { headers: { Authorization: `Bearer ${token}` } }
+      ).catch(() => {});
+    }
     setUser(null);
     localStorage.removeItem('access_token');
+    localStorage.removeItem('refresh_token');
     toast.success('Logged out successfully');
   };
 